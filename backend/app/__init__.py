@@ -19,42 +19,77 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    from app.utils.db_pool import configure_engine_options, setup_pool_metrics
+    configure_engine_options(app)
     db.init_app(app)
+    setup_pool_metrics(app, db)
     jwt.init_app(app)
     
+    from app.middleware.rate_limiter import RATE_LIMIT_HEADERS
     CORS(app, 
          origins=app.config.get('CORS_ORIGINS', ['http://localhost:4200']),
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-         allow_headers=['Content-Type', 'Authorization'],
+         allow_headers=['Content-Type', 'Authorization', 'If-None-Match'],
+         expose_headers=['ETag', *RATE_LIMIT_HEADERS],
          supports_credentials=True)
     
     from app.middleware.security_headers import setup_security_headers
     setup_security_headers(app)
     
+    if app.config.get('COMPRESS_ENABLED', True):
+        from app.middleware.compression import setup_compression
+        setup_compression(app)
+    
     if app.config.get('RATELIMIT_ENABLED', False):
         from app.middleware.rate_limiter import setup_rate_limiter
         setup_rate_limiter(app)
     
+    from app.utils.cache import setup_task_cache, get_task_list_cache
+    setup_task_cache(app)
+    
+    from app.utils.principal import setup_user_cache
+    setup_user_cache(app)
+    
+    from app.utils.hashing_pool import setup_hashing_pool
+    setup_hashing_pool(app)
+    
+    from app.utils.token_blocklist import setup_token_blocklist
+    setup_token_blocklist(app)
+    
+    from app.utils.health import setup_readiness_probe
+    setup_readiness_probe(app)
+    
     from app.middleware.error_handler import register_error_handlers
     register_error_handlers(app)
     
     from app.routes.auth import auth_bp
     from app.routes.tasks import tasks_bp
+    from app.routes.health import health_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
+    app.register_blueprint(health_bp)
     
     # Endpoint de health check para monitorização
     @app.route('/health')
     def health_check():
         """Verifica se a aplicação e BD estão operacionais"""
+        compression = app.extensions.get('compression_metrics')
+        rate_limit_storage = app.extensions.get('rate_limit_storage')
+        pool_metrics = app.extensions.get('db_pool_metrics')
         try:
             # Testa conexão à base de dados
             db.session.execute(db.text('SELECT 1'))
             return {
                 'status': 'healthy',
                 'database': 'connected',
-                'message': 'API operacional'
+                'message': 'API operacional',
+                'database_pool': pool_metrics.stats(db.engine.pool) if pool_metrics else None,
+                'cache': get_task_list_cache().stats(),
+                'compression': compression.stats() if compression else None,
+                'hashing': app.extensions['hashing_pool'].stats(),
+                'revocation': app.extensions['token_blocklist'].stats(),
+                'rate_limit': rate_limit_storage.stats() if rate_limit_storage else None
             }, 200
         except Exception as e:
             return {
@@ -63,8 +98,13 @@ def create_app(config_class=Config):
                 'error': str(e)
             }, 503
     
-    with app.app_context():
-        db.create_all()
+    # Em produção o esquema é gerido pelo Alembic (scripts/init_db.py);
+    # create_all só é usado em desenvolvimento quando ativado explicitamente
+    if app.config.get('DB_AUTO_CREATE', False):
+        from app.utils.migrations import stamp_database
+        with app.app_context():
+            db.create_all()
+            stamp_database()
     
     return app
 
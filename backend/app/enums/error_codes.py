@@ -14,9 +14,11 @@ class ErrorCode(str, Enum):
     RESOURCE_NOT_FOUND = "RESOURCE_NOT_FOUND"
     RESOURCE_ALREADY_EXISTS = "RESOURCE_ALREADY_EXISTS"
     UNAUTHORIZED_ACCESS = "UNAUTHORIZED_ACCESS"
+    SYNC_TOKEN_EXPIRED = "SYNC_TOKEN_EXPIRED"
     
     INTERNAL_SERVER_ERROR = "INTERNAL_SERVER_ERROR"
     DATABASE_ERROR = "DATABASE_ERROR"
+    SERVICE_UNAVAILABLE = "SERVICE_UNAVAILABLE"
     
     RATE_LIMIT_EXCEEDED = "RATE_LIMIT_EXCEEDED"
 
@@ -5,7 +5,10 @@ from app.exceptions.custom_exceptions import (
     AuthorizationException,
     ResourceNotFoundException,
     ResourceAlreadyExistsException,
-    DatabaseException
+    SyncTokenExpiredException,
+    DatabaseException,
+    ServiceUnavailableException,
+    RateLimitExceededException
 )
 
 __all__ = [
@@ -15,6 +18,9 @@ __all__ = [
     'AuthorizationException',
     'ResourceNotFoundException',
     'ResourceAlreadyExistsException',
-    'DatabaseException'
+    'SyncTokenExpiredException',
+    'DatabaseException',
+    'ServiceUnavailableException',
+    'RateLimitExceededException'
 ]
 
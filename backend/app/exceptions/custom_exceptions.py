@@ -76,6 +76,16 @@ class ResourceAlreadyExistsException(AppException):
             details=details
         )
 
+class SyncTokenExpiredException(AppException):
+    """Exceção para tokens de sincronização anteriores à retenção de eliminações"""
+    def __init__(self, message: str = "Token de sincronização expirado, é necessária sincronização completa", details: dict = None):
+        super().__init__(
+            message=message,
+            error_code=ErrorCode.SYNC_TOKEN_EXPIRED,
+            status_code=HTTPStatus.GONE,
+            details=details
+        )
+
 class DatabaseException(AppException):
     """Exceção para erros de base de dados"""
     def __init__(self, message: str = "Erro na base de dados", details: dict = None):
@@ -86,3 +96,24 @@ class DatabaseException(AppException):
             details=details
         )
 
+class ServiceUnavailableException(AppException):
+    """Exceção para sobrecarga temporária (responde 503 com Retry-After)"""
+    def __init__(self, message: str = "Serviço temporariamente indisponível", retry_after: int = 1, details: dict = None):
+        self.retry_after = retry_after
+        super().__init__(
+            message=message,
+            error_code=ErrorCode.SERVICE_UNAVAILABLE,
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            details=details
+        )
+
+class RateLimitExceededException(AppException):
+    """Exceção para limite de pedidos excedido (responde 429 com Retry-After)"""
+    def __init__(self, message: str = "Demasiados pedidos, tente novamente mais tarde", retry_after: int = 1, details: dict = None):
+        self.retry_after = retry_after
+        super().__init__(
+            message=message,
+            error_code=ErrorCode.RATE_LIMIT_EXCEEDED,
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            details=details
+        )
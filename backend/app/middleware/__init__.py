@@ -1,5 +1,6 @@
 from app.middleware.error_handler import register_error_handlers
 from app.middleware.security_headers import setup_security_headers
+from app.middleware.compression import setup_compression
 
-__all__ = ['register_error_handlers', 'setup_security_headers']
+__all__ = ['register_error_handlers', 'setup_security_headers', 'setup_compression']
 
@@ -0,0 +1,178 @@
+"""Middleware de compressão das respostas (gzip e, se instalado, brotli)
+
+Comprime respostas de texto/JSON acima de COMPRESS_MIN_SIZE bytes segundo o
+Accept-Encoding do cliente. Respostas em streaming (export) são comprimidas
+bloco a bloco, sem as acumular em memória.
+"""
+import gzip
+import threading
+import zlib
+from typing import Dict, Iterable, Iterator, Optional
+
+from flask import current_app, request
+
+from app.utils.http_cache import encoded_etag, ENCODED_ETAG_ENCODINGS
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/html',
+    'text/plain'
+)
+
+class CompressionMetrics:
+    """Contadores de bytes antes/depois da compressão (por processo)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            'responses': 0, 'bytes_in': 0, 'bytes_out': 0
+        }
+        self._encodings: Dict[str, int] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int) -> None:
+        """Regista uma resposta comprimida"""
+        with self._lock:
+            self._counters['responses'] += 1
+            self._counters['bytes_in'] += bytes_in
+            self._counters['bytes_out'] += bytes_out
+            self._encodings[encoding] = self._encodings.get(encoding, 0) + 1
+
+    def stats(self) -> Dict[str, object]:
+        """Totais, bytes poupados e respostas por codificação"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['encodings'] = dict(self._encodings)
+        stats['bytes_saved'] = stats['bytes_in'] - stats['bytes_out']
+        stats['ratio'] = round(stats['bytes_out'] / stats['bytes_in'], 4) if stats['bytes_in'] else None
+        return stats
+
+def available_encodings() -> tuple:
+    """Codificações suportadas, por ordem de preferência do servidor"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def _compress(data: bytes, encoding: str, config) -> bytes:
+    """Comprime um corpo completo"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESS_BR_QUALITY'])
+    return gzip.compress(data, compresslevel=config['COMPRESS_LEVEL'], mtime=0)
+
+def _stream_compressor(encoding: str, config):
+    """Devolve (comprimir bloco, terminar) para uma resposta em streaming"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BR_QUALITY'])
+        return compressor.process, compressor.finish, compressor.flush
+
+    compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush, lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+
+def _compress_stream(
+    chunks: Iterable[bytes],
+    source: Iterable,
+    encoding: str,
+    config,
+    metrics: CompressionMetrics
+) -> Iterator[bytes]:
+    """
+    Comprime um corpo em streaming
+
+    Cada bloco é enviado assim que é produzido (flush por bloco), pelo que
+    o cliente recebe dados antes do fim do export.
+    """
+    compress, finish, flush = _stream_compressor(encoding, config)
+    bytes_in = bytes_out = 0
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            bytes_in += len(chunk)
+            data = compress(chunk) + flush()
+            if data:
+                bytes_out += len(data)
+                yield data
+        tail = finish()
+        if tail:
+            bytes_out += len(tail)
+            yield tail
+        metrics.record(encoding, bytes_in, bytes_out)
+    finally:
+        if hasattr(source, 'close'):
+            source.close()
+
+def _negotiate(response) -> Optional[str]:
+    """Escolhe a codificação para a resposta (None se não for comprimida)"""
+    config = current_app.config
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return None
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return None
+    if response.mimetype not in config.get('COMPRESS_MIMETYPES', DEFAULT_MIMETYPES):
+        return None
+
+    response.vary.add('Accept-Encoding')
+    return request.accept_encodings.best_match(available_encodings())
+
+def _restore_not_modified_etag(response) -> None:
+    """
+    Num 304, devolve a ETag da variante comprimida que o cliente tem
+
+    A resposta 200 comprimida leva a ETag com sufixo da codificação; o 304
+    deve repetir esse mesmo valor.
+    """
+    etag, _ = response.get_etag()
+    if not etag:
+        return
+    for encoding in ENCODED_ETAG_ENCODINGS:
+        if encoded_etag(etag, encoding) in request.if_none_match:
+            response.set_etag(encoded_etag(etag, encoding))
+            return
+
+def setup_compression(app):
+    """Configura a compressão das respostas na aplicação"""
+    metrics = CompressionMetrics()
+    app.extensions['compression_metrics'] = metrics
+
+    @app.after_request
+    def compress_response(response):
+        """Comprime a resposta se o cliente aceitar e compensar"""
+        if response.status_code == 304:
+            _restore_not_modified_etag(response)
+            return response
+
+        encoding = _negotiate(response)
+        if encoding is None:
+            return response
+
+        config = app.config
+        if response.is_streamed:
+            source = response.response
+            response.response = _compress_stream(
+                response.iter_encoded(), source, encoding, config, metrics
+            )
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config['COMPRESS_MIN_SIZE']:
+                return response
+            compressed = _compress(data, encoding, config)
+            response.set_data(compressed)
+            metrics.record(encoding, len(data), len(compressed))
+
+        response.headers['Content-Encoding'] = encoding
+        # ETag forte: cada codificação é uma representação diferente
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(encoded_etag(etag, encoding))
+        return response
+
+    return metrics
+
+def get_compression_metrics() -> Optional[CompressionMetrics]:
+    """Devolve as métricas de compressão da aplicação atual (None se desativada)"""
+    return current_app.extensions.get('compression_metrics')
@@ -4,6 +4,18 @@ from app.exceptions.custom_exceptions import AppException
 from app.enums.error_codes import ErrorCode
 from app.enums.http_status import HTTPStatus
 from pydantic import ValidationError
+from werkzeug.exceptions import HTTPException
+
+def format_validation_errors(e: ValidationError) -> list:
+    """Converte os erros do Pydantic numa lista serializável"""
+    return [
+        {
+            'loc': list(error.get('loc', [])),
+            'msg': str(error.get('msg', '')),
+            'type': str(error.get('type', ''))
+        }
+        for error in e.errors()
+    ]
 
 def register_error_handlers(app):
     """Regista handlers de exceções na aplicação Flask"""
@@ -11,18 +23,16 @@ def register_error_handlers(app):
     @app.errorhandler(AppException)
     def handle_app_exception(e: AppException):
         """Handler para exceções customizadas da aplicação"""
-        return jsonify(e.to_dict()), e.status_code.value
+        response = jsonify(e.to_dict())
+        retry_after = getattr(e, 'retry_after', None)
+        if retry_after is not None:
+            response.headers['Retry-After'] = str(retry_after)
+        return response, e.status_code.value
     
     @app.errorhandler(ValidationError)
     def handle_validation_error(e: ValidationError):
         """Handler para erros de validação do Pydantic"""
-        errors = []
-        for error in e.errors():
-            errors.append({
-                'loc': list(error.get('loc', [])),
-                'msg': str(error.get('msg', '')),
-                'type': str(error.get('type', ''))
-            })
+        errors = format_validation_errors(e)
         
         return jsonify({
             'message': 'Dados inválidos',
@@ -55,6 +65,10 @@ def register_error_handlers(app):
         import traceback
         import os
         
+        # Erros HTTP (ex: 405, 429 do rate limiting) mantêm o seu código
+        if isinstance(e, HTTPException):
+            return e
+        
         # Log do erro completo no console
         app.logger.error(f"Exceção não tratada: {str(e)}")
         app.logger.error(traceback.format_exc())
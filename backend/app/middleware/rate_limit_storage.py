@@ -0,0 +1,295 @@
+"""Armazenamento do rate limiting partilhado pelos workers de um servidor
+
+Com storage_uri="memory://" cada worker do Gunicorn conta os pedidos à
+parte e o limite efetivo é multiplicado pelo número de workers. Este
+backend guarda os contadores num ficheiro SQLite em modo WAL, partilhado
+por todos os processos da máquina, sem depender de Redis.
+
+Cada verificação é uma transação BEGIN IMMEDIATE (leitura + incremento
+atómicos entre processos). Suporta as estratégias fixed-window e
+sliding-window-counter do pacote limits e o GCRA dos limites por rota
+(um único valor por chave: o instante teórico de chegada, TAT).
+
+URI (mesma convenção do SQLAlchemy):
+    sqlite:///ratelimit.db           caminho relativo
+    sqlite:////tmp/ratelimit.db      caminho absoluto
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS rate_limit_counters ('
+    ' key TEXT PRIMARY KEY,'
+    ' value INTEGER NOT NULL,'
+    ' expires_at REAL NOT NULL'
+    ') WITHOUT ROWID'
+)
+_GCRA_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS rate_limit_gcra ('
+    ' key TEXT PRIMARY KEY,'
+    ' tat REAL NOT NULL'
+    ') WITHOUT ROWID'
+)
+# Remove contadores expirados a cada N incrementos (por processo)
+_PURGE_EVERY = 1000
+
+class GCRAResult(NamedTuple):
+    """Resultado de uma verificação GCRA"""
+    allowed: bool
+    remaining: int
+    # Segundos até o limite estar de novo completo
+    reset_after: float
+    # Segundos até o próximo pedido ser aceite (0 se este foi aceite)
+    retry_after: float
+
+def gcra_step(
+    tat: Optional[float],
+    now: float,
+    limit: int,
+    period: float,
+    cost: int = 1
+) -> Tuple[GCRAResult, Optional[float]]:
+    """
+    Um passo do GCRA (generic cell rate algorithm)
+
+    Permite `limit` pedidos seguidos (rajada) e depois um a cada
+    period/limit segundos. Só guarda o TAT, sem listas de instantes.
+
+    Args:
+        tat: TAT guardado para a chave (None se não existir)
+        now: Instante atual
+        limit: Pedidos permitidos por período
+        period: Período em segundos
+        cost: Custo deste pedido
+
+    Returns:
+        Tuple[GCRAResult, Optional[float]]: Resultado e novo TAT (None se recusado)
+    """
+    emission_interval = period / limit
+    tat = max(tat or now, now)
+    new_tat = tat + emission_interval * cost
+    allow_at = new_tat - period
+    if allow_at > now:
+        return GCRAResult(False, 0, tat - now, allow_at - now), None
+    # Margem para erros de vírgula flutuante
+    remaining = int((now - allow_at) / emission_interval + 1e-9)
+    return GCRAResult(True, remaining, new_tat - now, 0.0), new_tat
+
+class MemoryGCRAStore:
+    """TATs do GCRA em memória (por worker; usado com memory://)"""
+
+    def __init__(self):
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def gcra(self, key: str, limit: int, period: float, cost: int = 1) -> GCRAResult:
+        now = time.time()
+        with self._lock:
+            result, new_tat = gcra_step(self._tats.get(key), now, limit, period, cost)
+            if new_tat is not None:
+                self._tats[key] = new_tat
+                self._writes += 1
+                if self._writes % _PURGE_EVERY == 0:
+                    self._tats = {k: v for k, v in self._tats.items() if v > now}
+        return result
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport):
+    """Contadores de rate limiting num ficheiro SQLite (WAL) partilhado"""
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, busy_timeout: float = 5.0, **options):
+        path = uri.split('://', 1)[1][1:] if '://' in uri else ''
+        if not path or path == ':memory:':
+            raise ValueError('O rate limiting em SQLite precisa de um ficheiro partilhado (sqlite:///caminho.db)')
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._checks = 0
+        self._check_seconds = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        """Ligação por thread, recriada após fork (cada worker tem as suas)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            # Em WAL, NORMAL só sincroniza no checkpoint: sem fsync por pedido
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(_SCHEMA)
+            connection.execute(_GCRA_SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transação com o lock de escrita obtido à cabeça (atómica entre processos)"""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    @staticmethod
+    def _read(connection: sqlite3.Connection, key: str, now: float) -> int:
+        row = connection.execute(
+            'SELECT value FROM rate_limit_counters WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _increment(connection: sqlite3.Connection, key: str, amount: int, expires_at: float, now: float) -> None:
+        """Soma ao contador (ou recomeça-o, se tiver expirado)"""
+        connection.execute(
+            'INSERT INTO rate_limit_counters (key, value, expires_at) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET '
+            ' value = CASE WHEN expires_at <= ? THEN excluded.value ELSE value + excluded.value END,'
+            ' expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END',
+            (key, amount, expires_at, now, now)
+        )
+
+    def _after_write(self, connection: sqlite3.Connection, now: float) -> None:
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % _PURGE_EVERY == 0
+        if purge:
+            connection.execute('DELETE FROM rate_limit_counters WHERE expires_at <= ?', (now,))
+            # TAT no passado equivale a chave sem histórico
+            connection.execute('DELETE FROM rate_limit_gcra WHERE tat <= ?', (now,))
+
+    def _record(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._checks += 1
+            self._check_seconds += elapsed
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        started = time.perf_counter()
+        now = time.time()
+        with self._transaction() as connection:
+            self._increment(connection, key, amount, now + expiry, now)
+            value = self._read(connection, key, now)
+            self._after_write(connection, now)
+        self._record(started)
+        return value
+
+    def get(self, key: str) -> int:
+        return self._read(self._connection(), key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._connection().execute(
+            'SELECT expires_at FROM rate_limit_counters WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        connection = self._connection()
+        connection.execute('DELETE FROM rate_limit_gcra')
+        return connection.execute('DELETE FROM rate_limit_counters').rowcount
+
+    def clear(self, key: str) -> None:
+        self._connection().execute('DELETE FROM rate_limit_counters WHERE key = ?', (key,))
+
+    # Sliding window counter: contador da janela atual + da anterior, ponderado
+
+    @staticmethod
+    def _window_keys(key: str, expiry: int, now: float) -> Tuple[str, str, int]:
+        window = int(now // expiry)
+        return f'{key}/{window - 1}', f'{key}/{window}', window
+
+    @staticmethod
+    def _window_info(previous: int, current: int, expiry: int, now: float) -> Tuple[int, float, int, float]:
+        elapsed = (now / expiry) % 1
+        previous_ttl = (1 - elapsed) * expiry if previous else 0.0
+        current_ttl = (1 - elapsed) * expiry + expiry
+        return previous, previous_ttl, current, current_ttl
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        started = time.perf_counter()
+        now = time.time()
+        previous_key, current_key, window = self._window_keys(key, expiry, now)
+        with self._transaction() as connection:
+            previous = self._read(connection, previous_key, now)
+            current = self._read(connection, current_key, now)
+            _, previous_ttl, _, _ = self._window_info(previous, current, expiry, now)
+            allowed = math.floor(previous * previous_ttl / expiry + current) + amount <= limit
+            if allowed:
+                # Mantém-se até ao fim da janela seguinte, onde conta como "anterior"
+                self._increment(connection, current_key, amount, (window + 2) * expiry, now)
+                self._after_write(connection, now)
+        self._record(started)
+        return allowed
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key, _ = self._window_keys(key, expiry, now)
+        connection = self._connection()
+        return self._window_info(
+            self._read(connection, previous_key, now),
+            self._read(connection, current_key, now),
+            expiry,
+            now
+        )
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key, _ = self._window_keys(key, expiry, time.time())
+        self._connection().execute(
+            'DELETE FROM rate_limit_counters WHERE key IN (?, ?)', (previous_key, current_key)
+        )
+
+    def gcra(self, key: str, limit: int, period: float, cost: int = 1) -> GCRAResult:
+        """Verificação GCRA atómica entre processos (ver gcra_step)"""
+        started = time.perf_counter()
+        now = time.time()
+        with self._transaction() as connection:
+            row = connection.execute('SELECT tat FROM rate_limit_gcra WHERE key = ?', (key,)).fetchone()
+            result, new_tat = gcra_step(row[0] if row else None, now, limit, period, cost)
+            if new_tat is not None:
+                connection.execute(
+                    'INSERT INTO rate_limit_gcra (key, tat) VALUES (?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET tat = excluded.tat',
+                    (key, new_tat)
+                )
+                self._after_write(connection, now)
+        self._record(started)
+        return result
+
+    def stats(self) -> Dict[str, object]:
+        """Verificações feitas por este processo e custo médio de cada uma"""
+        with self._lock:
+            checks, seconds = self._checks, self._check_seconds
+        return {
+            'backend': 'sqlite',
+            'checks': checks,
+            'avg_check_us': round(seconds / checks * 1e6, 1) if checks else None
+        }
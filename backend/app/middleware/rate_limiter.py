@@ -1,38 +1,148 @@
-"""Rate Limiting middleware (opcional)"""
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
-from flask import request
+"""Rate Limiting middleware (opcional)
+
+O flask_limiter e o limits só são importados quando o rate limiting está
+ativo (setup_rate_limiter), para não pesarem no arranque quando não está.
+"""
+import math
+from functools import lru_cache, wraps
+from typing import TYPE_CHECKING, Callable, Tuple, Union
+
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+
+from app.exceptions.custom_exceptions import RateLimitExceededException
+
+if TYPE_CHECKING:
+    from limits import RateLimitItem
+    from app.middleware.rate_limit_storage import GCRAResult
+
+ROUTE_RATE_LIMITER_EXTENSION = 'route_rate_limiter'
+# Sondas de liveness/readiness: nunca limitadas (um 429 marcaria o serviço como em baixo)
+RATE_LIMIT_EXEMPT_ENDPOINTS = frozenset({'health.livez', 'health.readyz'})
+RATE_LIMIT_HEADERS = ('RateLimit-Limit', 'RateLimit-Remaining', 'RateLimit-Reset', 'RateLimit-Policy', 'Retry-After')
+
+@lru_cache(maxsize=64)
+def _parse_limit(limit: str) -> 'RateLimitItem':
+    from limits import parse
+
+    return parse(limit)
+
+class RouteRateLimiter:
+    """Limites por rota (e por utilizador) com GCRA: um TAT por chave"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def hit(self, limit: str, key: str, cost: int = 1) -> Tuple['RateLimitItem', 'GCRAResult']:
+        """
+        Regista um pedido na chave indicada
+
+        Args:
+            limit: Limite no formato "10 per minute"
+            key: Chave (rota + utilizador ou IP)
+            cost: Custo do pedido
+
+        Returns:
+            Tuple[RateLimitItem, GCRAResult]: Limite aplicado e resultado
+        """
+        item = _parse_limit(limit)
+        return item, self.store.gcra(f'gcra/{key}', item.amount, item.get_expiry(), cost)
 
 def setup_rate_limiter(app):
-    """Configura rate limiting na aplicação"""
+    """
+    Configura rate limiting na aplicação
+
+    Por omissão os contadores ficam num ficheiro SQLite partilhado pelos
+    workers (RATELIMIT_STORAGE_URI), para o limite não ser multiplicado
+    pelo número de workers. Os limites por rota (@rate_limit) usam o mesmo
+    ficheiro.
+    """
+    from flask_limiter import Limiter
+    from flask_limiter.util import get_remote_address
+    # Regista o esquema sqlite:// no pacote limits
+    from app.middleware.rate_limit_storage import MemoryGCRAStore, SQLiteStorage
+
     limiter = Limiter(
         app=app,
         key_func=get_remote_address,
-        default_limits=["100 per hour"],
-        storage_uri="memory://"
+        default_limits=[app.config.get('RATELIMIT_DEFAULT', '100 per hour')],
+        storage_uri=app.config.get('RATELIMIT_STORAGE_URI', 'memory://'),
+        strategy=app.config.get('RATELIMIT_STRATEGY', 'sliding-window-counter')
     )
-    
+
+    @limiter.request_filter
+    def is_probe():
+        """Sondas de liveness/readiness ficam fora do limite global"""
+        return request.endpoint in RATE_LIMIT_EXEMPT_ENDPOINTS
+
+    if limiter.enabled:
+        if isinstance(limiter.storage, SQLiteStorage):
+            app.extensions['rate_limit_storage'] = limiter.storage
+            store = limiter.storage
+        else:
+            store = MemoryGCRAStore()
+        app.extensions[ROUTE_RATE_LIMITER_EXTENSION] = RouteRateLimiter(store)
+
     @app.after_request
     def add_rate_limit_headers(response):
         """Adiciona headers de rate limiting nas respostas"""
+        state = g.get('rate_limit')
+        if state is not None:
+            item, result = state
+            response.headers['RateLimit-Limit'] = str(item.amount)
+            response.headers['RateLimit-Remaining'] = str(result.remaining)
+            response.headers['RateLimit-Reset'] = str(math.ceil(result.reset_after))
+            response.headers['RateLimit-Policy'] = f'{item.amount};w={item.get_expiry()}'
         return response
-    
+
     return limiter
 
-def rate_limit(limit: str):
+def _client_key(per: str) -> str:
+    """Utilizador do token (se a rota já o validou) ou IP do cliente"""
+    from flask_limiter.util import get_remote_address
+
+    if per == 'user':
+        try:
+            identity = get_jwt_identity()
+        except RuntimeError:
+            # Rota sem @require_auth (ou decorator colocado acima dele)
+            identity = None
+        if identity is not None:
+            return f'user:{identity}'
+    return f'ip:{get_remote_address()}'
+
+def rate_limit(limit: Union[str, Callable[[], str]], per: str = 'user', cost: int = 1):
     """
     Decorator para aplicar rate limiting
-    
+
+    Limite próprio da rota, por utilizador autenticado (ou por IP), com
+    GCRA. Responde 429 com Retry-After quando excedido e acrescenta os
+    headers RateLimit-* às respostas. Sem rate limiting ativo (ou fora de um
+    pedido) não faz nada.
+
+    Para limitar por utilizador, colocar abaixo de @require_auth.
+
     Args:
-        limit: String no formato "100 per hour"
+        limit: String no formato "100 per hour" (ou função que a devolve,
+            para ler da configuração)
+        per: 'user' (utilizador do token, ou IP se não houver) ou 'ip'
+        cost: Custo de cada pedido
     """
-    from functools import wraps
-    from flask import current_app
-    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
+            limiter = current_app.extensions.get(ROUTE_RATE_LIMITER_EXTENSION) if has_request_context() else None
+            if limiter is None:
+                return f(*args, **kwargs)
+
+            value = limit() if callable(limit) else limit
+            item, result = limiter.hit(value, f'{f.__module__}.{f.__name__}:{_client_key(per)}', cost)
+            g.rate_limit = (item, result)
+            if not result.allowed:
+                raise RateLimitExceededException(
+                    retry_after=max(1, math.ceil(result.retry_after)),
+                    details={"limit": value}
+                )
             return f(*args, **kwargs)
         return decorated_function
     return decorator
-
@@ -1,5 +1,9 @@
 from app.models.user import User
 from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+from app.models.task_stats import TaskStats, TaskDailyStats
+from app.models.revoked_token import RevokedToken
+from app.models import task_search  # noqa: F401 - regista o DDL da pesquisa full-text
 
-__all__ = ['User', 'Task']
+__all__ = ['User', 'Task', 'TaskTombstone', 'TaskStats', 'TaskDailyStats', 'RevokedToken']
 
@@ -0,0 +1,18 @@
+from app import db
+from datetime import datetime
+
+class RevokedToken(db.Model):
+    """Token JWT revogado (logout ou refresh token já rodado)"""
+    __tablename__ = 'revoked_tokens'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    token_type = db.Column(db.String(10), nullable=False)
+    # Depois de expirado o token é rejeitado pelo JWT e a linha pode ser apagada
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    
+    def __repr__(self):
+        return f'<RevokedToken {self.jti}>'
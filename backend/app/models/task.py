@@ -4,6 +4,18 @@ from datetime import datetime
 class Task(db.Model):
     """Modelo de tarefa"""
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Serve a listagem ordenada e a paginação por cursor (user_id, created_at, id)
+        db.Index('ix_tasks_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_tasks_user_id_updated_at_id', 'user_id', 'updated_at', 'id'),
+        # Índice parcial: a vista "tarefas em aberto" só lê as linhas que devolve
+        db.Index(
+            'ix_tasks_user_id_open',
+            'user_id', 'created_at', 'id',
+            postgresql_where=db.text('completed = false'),
+            sqlite_where=db.text('completed = 0')
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -12,7 +24,7 @@ class Task(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
     def __repr__(self):
         return f'<Task {self.title}>'
@@ -0,0 +1,72 @@
+"""Estruturas de pesquisa full-text das tarefas (dependentes do dialeto)
+
+PostgreSQL: coluna gerada tsvector com índice GIN.
+SQLite: tabela virtual FTS5 de conteúdo externo mantida por triggers.
+
+São criadas junto com a tabela tasks (create_all) e pela migração 0004.
+"""
+from sqlalchemy import DDL, event
+
+from app.models.task import Task
+
+SEARCH_VECTOR_COLUMN = 'search_vector'
+SQLITE_FTS_TABLE = 'tasks_fts'
+
+POSTGRESQL_SEARCH_DDL = [
+    "ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+]
+
+for statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(Task.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Task.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+event.listen(
+    Task.__table__,
+    'before_drop',
+    DDL('DROP TABLE IF EXISTS tasks_fts').execute_if(dialect='sqlite')
+)
+
+def is_search_object(name: str, type_: str) -> bool:
+    """
+    Indica se um objeto da base de dados pertence à pesquisa full-text
+
+    Estes objetos não estão no metadata dos modelos e devem ser ignorados
+    pelo autogenerate do Alembic.
+
+    Args:
+        name: Nome do objeto
+        type_: Tipo do objeto ("table", "column", "index", ...)
+
+    Returns:
+        bool: True se o objeto for gerido por este módulo
+    """
+    if type_ == 'table':
+        return name == SQLITE_FTS_TABLE or name.startswith(f'{SQLITE_FTS_TABLE}_')
+    if type_ == 'column':
+        return name == SEARCH_VECTOR_COLUMN
+    if type_ == 'index':
+        return name == 'ix_tasks_search_vector'
+    return False
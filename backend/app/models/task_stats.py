@@ -0,0 +1,24 @@
+from app import db
+
+class TaskStats(db.Model):
+    """Contadores agregados das tarefas de um utilizador"""
+    __tablename__ = 'task_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True, autoincrement=False)
+    total = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    completed = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    def __repr__(self):
+        return f'<TaskStats {self.user_id}>'
+
+class TaskDailyStats(db.Model):
+    """Contadores das tarefas de um utilizador por dia de criação"""
+    __tablename__ = 'task_daily_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True, autoincrement=False)
+    day = db.Column(db.Date, primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    completed = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    def __repr__(self):
+        return f'<TaskDailyStats {self.user_id} {self.day}>'
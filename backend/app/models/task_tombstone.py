@@ -0,0 +1,18 @@
+from app import db
+from datetime import datetime
+
+class TaskTombstone(db.Model):
+    """Registo de uma tarefa eliminada, usado pela sincronização incremental"""
+    __tablename__ = 'task_tombstones'
+    __table_args__ = (
+        db.Index('ix_task_tombstones_user_id_deleted_at_id', 'user_id', 'deleted_at', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    
+    def __repr__(self):
+        return f'<TaskTombstone {self.task_id}>'
@@ -10,8 +10,14 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     hashed_password = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Incrementado a cada escrita nas tarefas do utilizador (ETag / cache)
+    tasks_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     tasks = db.relationship('Task', backref='user', lazy=True, cascade='all, delete-orphan')
+    task_tombstones = db.relationship('TaskTombstone', lazy=True, cascade='all, delete-orphan')
+    task_stats = db.relationship('TaskStats', lazy=True, uselist=False, cascade='all, delete-orphan')
+    task_daily_stats = db.relationship('TaskDailyStats', lazy=True, cascade='all, delete-orphan')
+    revoked_tokens = db.relationship('RevokedToken', lazy=True, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<User {self.username}>'
@@ -1,13 +1,16 @@
-from flask import Blueprint, request, jsonify
-from app.schemas.user import UserCreate, UserLogin
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt
+from app.schemas.user import UserCreate, UserLogin, LogoutRequest
 from app.services.auth_service import AuthService
 from app.middleware.security_headers import validate_json_content_type
+from app.middleware.rate_limiter import rate_limit
 from app.enums.http_status import HTTPStatus
 from pydantic import ValidationError
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limit(lambda: current_app.config['RATELIMIT_REGISTER'], per='ip')
 @validate_json_content_type
 def register():
     """Rota pública para registo de novo utilizador"""
@@ -28,6 +31,7 @@ def register():
         raise
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit(lambda: current_app.config['RATELIMIT_LOGIN'], per='ip')
 @validate_json_content_type
 def login():
     """Rota pública para início de sessão"""
@@ -47,3 +51,25 @@ def login():
     except Exception as e:
         raise
 
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    """Rota para obter um novo par de tokens com o refresh token (rotação)"""
+    result = AuthService.refresh_tokens(get_jwt())
+    
+    return jsonify({
+        'message': 'Token renovado com sucesso',
+        **result
+    }), HTTPStatus.OK.value
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required()
+def logout():
+    """Rota para terminar a sessão (revoga o access token e o refresh token)"""
+    logout_data = LogoutRequest(**(request.get_json(silent=True) or {}))
+    
+    AuthService.logout(get_jwt(), logout_data.refresh_token)
+    
+    return jsonify({
+        'message': 'Sessão terminada com sucesso'
+    }), HTTPStatus.OK.value
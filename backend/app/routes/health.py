@@ -0,0 +1,34 @@
+from flask import Blueprint, current_app, jsonify
+from app import db
+from app.utils.health import READINESS_PROBE_EXTENSION, pool_saturation
+from app.enums.http_status import HTTPStatus
+
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/livez', methods=['GET'])
+def livez():
+    """Liveness: o processo responde (sem I/O)"""
+    return jsonify({'status': 'alive'}), HTTPStatus.OK.value
+
+@health_bp.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: BD acessível, migrações aplicadas e pool com ligações livres"""
+    pool = pool_saturation(db.engine.pool)
+    saturated = pool is not None and pool['saturated']
+    # Com o pool esgotado a verificação ficaria à espera de uma ligação
+    result, age = current_app.extensions[READINESS_PROBE_EXTENSION].check(refresh=not saturated)
+    
+    database = result['database'] if result else {'status': 'unknown'}
+    migrations = result['migrations'] if result else None
+    ready = (
+        database['status'] == 'connected'
+        and migrations is not None and migrations['up_to_date']
+        and not saturated
+    )
+    return jsonify({
+        'status': 'ready' if ready else 'not_ready',
+        'database': database,
+        'migrations': migrations,
+        'pool': pool,
+        'cache_age_s': round(age, 2) if age is not None else None
+    }), HTTPStatus.OK.value if ready else HTTPStatus.SERVICE_UNAVAILABLE.value
@@ -1,8 +1,22 @@
-from flask import Blueprint, request, jsonify
-from app.schemas.task import TaskCreate, TaskUpdate
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskFieldsQuery, TaskListQuery, TaskExportQuery,
+    TaskSearchQuery, TaskChangesQuery, TaskStatsQuery, TaskBatchRequest
+)
 from app.services.task_service import TaskService
+from app.services.search_service import SearchService
+from app.services.stats_service import StatsService
 from app.utils.decorators import require_auth
+from app.utils.cache import get_task_list_cache
+from app.utils.export import EXPORT_MIMETYPES, EXPORT_WRITERS
+from app.utils.serializers import encode_task_list, supports_fast_json, task_row_to_dict
+from app.utils.bulk_import import ImportReport, iter_ndjson
+from app.utils.http_cache import (
+    build_etag, request_etag_parts, not_modified_response, with_etag
+)
+from app.exceptions.custom_exceptions import ValidationException
 from app.middleware.security_headers import validate_json_content_type
+from app.middleware.rate_limiter import rate_limit
 from app.enums.http_status import HTTPStatus
 from pydantic import ValidationError
 
@@ -13,13 +27,125 @@ tasks_bp = Blueprint('tasks', __name__)
 def list_tasks(current_user):
     """Rota privada para listar tarefas do utilizador atual"""
     try:
-        tasks = TaskService.get_user_tasks(current_user)
+        query = TaskListQuery(**request.args.to_dict())
+        
+        # A ETag depende só da versão do utilizador: um 304 não lê nenhuma tarefa
+        version = TaskService.get_tasks_version(current_user)
+        etag = build_etag(current_user.id, version, *request_etag_parts())
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+        
+        # A ETag já identifica utilizador, versão e parâmetros: serve de chave
+        cache = get_task_list_cache()
+        cached = cache.get(str(current_user.id), etag)
+        if cached is not None:
+            return with_etag(Response(cached, mimetype='application/json'), etag), HTTPStatus.OK.value
+        
+        paged = 'limit' in request.args or 'cursor' in request.args
+        if paged:
+            rows, next_cursor = TaskService.get_user_task_rows_page(current_user, query)
+        else:
+            rows = TaskService.get_user_task_rows(current_user, query)
+        
+        if supports_fast_json(current_app):
+            extra = {'next_cursor': next_cursor} if paged else {}
+            body = encode_task_list(
+                rows, 'Tarefas listadas com sucesso', fields=query.selected_fields, **extra
+            )
+            response = Response(body, mimetype='application/json')
+        else:
+            payload = {
+                'message': 'Tarefas listadas com sucesso',
+                'tasks': [task_row_to_dict(row, query.selected_fields) for row in rows],
+                'total': len(rows)
+            }
+            if paged:
+                payload['next_cursor'] = next_cursor
+            response = jsonify(payload)
+        
+        cache.set(str(current_user.id), etag, response.get_data())
+        return with_etag(response, etag), HTTPStatus.OK.value
+    except Exception as e:
+        raise
+
+@tasks_bp.route('/search', methods=['GET'])
+@require_auth
+def search_tasks(current_user):
+    """Rota privada para pesquisa full-text nas tarefas do utilizador atual"""
+    try:
+        query = TaskSearchQuery(**request.args.to_dict())
+        results, next_cursor = SearchService.search_tasks(current_user, query)
+        
+        return jsonify({
+            'message': 'Pesquisa realizada com sucesso',
+            'tasks': [
+                {**task.to_dict(), 'rank': rank, 'snippet': snippet}
+                for task, rank, snippet in results
+            ],
+            'total': len(results),
+            'next_cursor': next_cursor
+        }), HTTPStatus.OK.value
+    except ValidationError as e:
+        raise
+    except Exception as e:
+        raise
+
+@tasks_bp.route('/stats', methods=['GET'])
+@require_auth
+def task_stats(current_user):
+    """Rota privada para estatísticas das tarefas do utilizador atual"""
+    try:
+        query = TaskStatsQuery(**request.args.to_dict())
+        stats = StatsService.get_stats(current_user, query.days)
         
         return jsonify({
-            'message': 'Tarefas listadas com sucesso',
-            'tasks': [task.to_dict() for task in tasks],
-            'total': len(tasks)
+            'message': 'Estatísticas obtidas com sucesso',
+            'stats': stats
         }), HTTPStatus.OK.value
+    except ValidationError as e:
+        raise
+    except Exception as e:
+        raise
+
+@tasks_bp.route('/changes', methods=['GET'])
+@require_auth
+def task_changes(current_user):
+    """Rota privada para sincronização incremental (alterações desde um token)"""
+    try:
+        query = TaskChangesQuery(**request.args.to_dict())
+        changes = TaskService.get_changes(current_user, query.since, query.limit)
+        
+        return jsonify({
+            'message': 'Alterações obtidas com sucesso',
+            'changed': [task.to_dict() for task in changes['changed']],
+            'deleted': changes['deleted'],
+            'next_token': changes['next_token'],
+            'has_more': changes['has_more']
+        }), HTTPStatus.OK.value
+    except ValidationError as e:
+        raise
+    except Exception as e:
+        raise
+
+@tasks_bp.route('/export', methods=['GET'])
+@require_auth
+@rate_limit(lambda: current_app.config['RATELIMIT_BULK'])
+def export_tasks(current_user):
+    """Rota privada para exportar as tarefas do utilizador atual em streaming"""
+    try:
+        query = TaskExportQuery(**request.args.to_dict())
+        rows = TaskService.iter_user_task_rows(current_user, query)
+        body = EXPORT_WRITERS[query.format](rows, fields=query.selected_fields)
+        
+        return Response(
+            stream_with_context(body),
+            status=HTTPStatus.OK.value,
+            mimetype=EXPORT_MIMETYPES[query.format],
+            headers={'Content-Disposition': f'attachment; filename=tasks.{query.format}'}
+        )
+    except ValidationError as e:
+        raise
     except Exception as e:
         raise
 
@@ -44,17 +170,93 @@ def create_task(current_user):
     except Exception as e:
         raise
 
+@tasks_bp.route('/import', methods=['POST'])
+@require_auth
+@rate_limit(lambda: current_app.config['RATELIMIT_BULK'])
+def import_tasks(current_user):
+    """
+    Rota privada para importar tarefas em massa (array JSON ou NDJSON)
+
+    Os itens válidos são importados mesmo que outros falhem: a resposta é 201
+    com received, imported, failed e errors (índice e erros de cada item
+    inválido, até MAX_REPORTED_ERRORS). Só quando nenhum item é importado e
+    algum falhou a resposta é 400, com o mesmo corpo. Content-Type ou corpo
+    JSON que não seja um array dão 400 com o envelope de erro habitual
+    (ValidationException).
+    """
+    try:
+        if request.mimetype == 'application/x-ndjson':
+            raw_items = iter_ndjson(request.stream)
+        elif request.is_json:
+            raw_items = request.get_json()
+            if not isinstance(raw_items, list):
+                raise ValidationException(
+                    message="O corpo deve ser um array JSON de tarefas",
+                    details={"type": type(raw_items).__name__}
+                )
+        else:
+            raise ValidationException(
+                message="Content-Type deve ser application/json ou application/x-ndjson",
+                details={"content_type": request.mimetype}
+            )
+        
+        report = ImportReport()
+        imported = TaskService.import_tasks(report.validate(raw_items), current_user)
+        
+        return jsonify({
+            'message': 'Importação concluída',
+            'received': report.received,
+            'imported': imported,
+            'failed': report.failed,
+            'errors': report.errors
+        }), HTTPStatus.BAD_REQUEST.value if report.failed and not imported else HTTPStatus.CREATED.value
+    except ValidationError as e:
+        raise
+    except Exception as e:
+        raise
+
+@tasks_bp.route('/batch', methods=['POST'])
+@require_auth
+@validate_json_content_type
+def batch_tasks(current_user):
+    """Rota privada para aplicar um lote de criações, atualizações e eliminações"""
+    try:
+        data = request.get_json()
+        batch = TaskBatchRequest(**data)
+        
+        result = TaskService.apply_batch(batch, current_user)
+        
+        return jsonify({
+            'message': 'Lote aplicado com sucesso',
+            'created': [task_row_to_dict(row) for row in result['created']],
+            'updated': [task_row_to_dict(row) for row in result['updated']],
+            'deleted': result['deleted']
+        }), HTTPStatus.OK.value
+        
+    except ValidationError as e:
+        raise
+    except Exception as e:
+        raise
+
 @tasks_bp.route('/<int:task_id>', methods=['GET'])
 @require_auth
 def get_task(current_user, task_id):
     """Rota privada para obter uma tarefa específica"""
     try:
-        task = TaskService.get_task_by_id(task_id, current_user)
+        fields = TaskFieldsQuery(**request.args.to_dict()).selected_fields
+        # Posse verificada antes do If-None-Match: tarefa alheia nunca dá 304
+        row = TaskService.get_task_row(task_id, current_user, fields)
         
-        return jsonify({
+        version = TaskService.get_tasks_version(current_user)
+        etag = build_etag(current_user.id, version, *request_etag_parts())
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+        
+        return with_etag(jsonify({
             'message': 'Tarefa encontrada',
-            'task': task.to_dict()
-        }), HTTPStatus.OK.value
+            'task': task_row_to_dict(row, fields)
+        }), etag), HTTPStatus.OK.value
     except Exception as e:
         raise
 
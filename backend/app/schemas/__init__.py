@@ -1,8 +1,14 @@
-from app.schemas.user import UserCreate, UserLogin, UserResponse
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.user import UserCreate, UserLogin, LogoutRequest, UserResponse
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskFieldsQuery, TaskFilterQuery, TaskListQuery,
+    TaskExportQuery, TaskSearchQuery, TaskChangesQuery, TaskStatsQuery,
+    TaskResponse, TaskBatchRequest
+)
 
 __all__ = [
-    'UserCreate', 'UserLogin', 'UserResponse',
-    'TaskCreate', 'TaskUpdate', 'TaskResponse'
+    'UserCreate', 'UserLogin', 'LogoutRequest', 'UserResponse',
+    'TaskCreate', 'TaskUpdate', 'TaskFieldsQuery', 'TaskFilterQuery', 'TaskListQuery',
+    'TaskExportQuery', 'TaskSearchQuery', 'TaskChangesQuery', 'TaskStatsQuery',
+    'TaskResponse', 'TaskBatchRequest'
 ]
 
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict
+
+class Schema(BaseModel):
+    """
+    Base dos schemas da API
+
+    O validador de cada schema só é construído no primeiro uso e não na
+    importação: o arranque (e o /health) não paga os schemas que ainda não
+    foram usados, nem a importação do email-validator.
+    """
+    model_config = ConfigDict(defer_build=True)
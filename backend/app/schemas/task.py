@@ -1,13 +1,16 @@
-from pydantic import BaseModel, Field, model_validator
-from typing import Optional
+from pydantic import Field, field_validator, model_validator
+from typing import Annotated, List, Literal, Optional, Tuple, Union
+from datetime import datetime
+from app.utils.serializers import TASK_FIELDS
+from app.schemas.base import Schema
 
-class TaskCreate(BaseModel):
+class TaskCreate(Schema):
     """Schema para criação de tarefa"""
     title: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = None
     completed: bool = False
 
-class TaskUpdate(BaseModel):
+class TaskUpdate(Schema):
     """Schema para atualização de tarefa"""
     title: Optional[str] = Field(default=None, min_length=1, max_length=200)
     description: Optional[str] = None
@@ -21,7 +24,95 @@ class TaskUpdate(BaseModel):
             raise ValueError('title não pode ser None')
         return data
 
-class TaskResponse(BaseModel):
+class TaskBatchCreate(Schema):
+    """Operação de criação num lote"""
+    op: Literal['create']
+    data: TaskCreate
+
+class TaskBatchUpdate(Schema):
+    """Operação de atualização num lote"""
+    op: Literal['update']
+    id: int
+    data: TaskUpdate
+
+class TaskBatchDelete(Schema):
+    """Operação de eliminação num lote"""
+    op: Literal['delete']
+    id: int
+
+TaskBatchOperation = Annotated[
+    Union[TaskBatchCreate, TaskBatchUpdate, TaskBatchDelete],
+    Field(discriminator='op')
+]
+
+class TaskBatchRequest(Schema):
+    """Schema para um lote de operações aplicado numa única transação"""
+    operations: List[TaskBatchOperation] = Field(..., min_length=1, max_length=500)
+
+class TaskFieldsQuery(Schema):
+    """Schema da seleção de campos da resposta (?fields=id,title,completed)"""
+    fields: Optional[str] = Field(default=None, max_length=200)
+    
+    @field_validator('fields')
+    @classmethod
+    def validate_fields(cls, value):
+        """Valida que todos os campos pedidos existem"""
+        if value is None:
+            return value
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in TASK_FIELDS]
+        if not names or unknown:
+            raise ValueError(f"campos inválidos: {', '.join(unknown) or value}; disponíveis: {', '.join(TASK_FIELDS)}")
+        return value
+    
+    @property
+    def selected_fields(self) -> Tuple[str, ...]:
+        """Campos pedidos pela ordem de TASK_FIELDS (todos se fields não for indicado)"""
+        if self.fields is None:
+            return TASK_FIELDS
+        names = {name.strip() for name in self.fields.split(',')}
+        return tuple(field for field in TASK_FIELDS if field in names)
+
+class TaskFilterQuery(TaskFieldsQuery):
+    """Schema dos filtros e ordenação comuns à listagem e à exportação"""
+    completed: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    sort: Literal['created_at', 'updated_at', 'title'] = 'created_at'
+    order: Literal['asc', 'desc'] = 'desc'
+    
+    @property
+    def sort_key(self) -> str:
+        """Identificador da ordenação, guardado no cursor"""
+        return f'{self.sort}:{self.order}'
+
+class TaskListQuery(TaskFilterQuery):
+    """Schema dos parâmetros de listagem (filtros, ordenação e paginação)"""
+    limit: int = Field(default=50, ge=1, le=200)
+    cursor: Optional[str] = Field(default=None, min_length=1, max_length=512)
+
+class TaskExportQuery(TaskFilterQuery):
+    """Schema dos parâmetros de exportação de tarefas"""
+    format: Literal['ndjson', 'csv'] = 'ndjson'
+
+class TaskChangesQuery(Schema):
+    """Schema dos parâmetros da sincronização incremental"""
+    since: Optional[str] = Field(default=None, min_length=1, max_length=512)
+    limit: int = Field(default=200, ge=1, le=1000)
+
+class TaskStatsQuery(Schema):
+    """Schema dos parâmetros das estatísticas"""
+    days: int = Field(default=30, ge=1, le=366)
+
+class TaskSearchQuery(Schema):
+    """Schema dos parâmetros da pesquisa full-text de tarefas"""
+    q: str = Field(..., min_length=1, max_length=200)
+    limit: int = Field(default=20, ge=1, le=100)
+    cursor: Optional[str] = Field(default=None, min_length=1, max_length=512)
+
+class TaskResponse(Schema):
     """Schema de resposta da tarefa"""
     id: int
     title: str
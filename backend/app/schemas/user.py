@@ -1,17 +1,23 @@
-from pydantic import BaseModel, EmailStr, Field
+from typing import Optional
+from pydantic import EmailStr, Field
+from app.schemas.base import Schema
 
-class UserCreate(BaseModel):
+class UserCreate(Schema):
     """Schema para criação de utilizador"""
     username: str = Field(..., min_length=3, max_length=80)
     email: EmailStr
     password: str = Field(..., min_length=6)
 
-class UserLogin(BaseModel):
+class UserLogin(Schema):
     """Schema para início de sessão"""
     username: str
     password: str
 
-class UserResponse(BaseModel):
+class LogoutRequest(Schema):
+    """Schema para terminar sessão (refresh token da sessão, opcional)"""
+    refresh_token: Optional[str] = None
+
+class UserResponse(Schema):
     """Schema de resposta do utilizador"""
     id: int
     username: str
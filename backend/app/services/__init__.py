@@ -1,5 +1,7 @@
 from app.services.auth_service import AuthService
 from app.services.task_service import TaskService
+from app.services.search_service import SearchService
+from app.services.stats_service import StatsService
 
-__all__ = ['AuthService', 'TaskService']
+__all__ = ['AuthService', 'TaskService', 'SearchService', 'StatsService']
 
@@ -2,13 +2,23 @@
 from app import db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin
-from app.utils.security import verify_password, get_password_hash
+from app.utils.hashing_pool import hash_password, check_password_and_update
+from datetime import datetime
+from typing import Optional
+from app.models.revoked_token import RevokedToken
+from app.utils.principal import get_cached_user
+from app.utils.token_blocklist import get_token_blocklist
 from app.exceptions.custom_exceptions import (
     AuthenticationException,
+    ValidationException,
     ResourceAlreadyExistsException,
     DatabaseException
 )
-from flask_jwt_extended import create_access_token
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
+from jwt.exceptions import PyJWTError
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
 
 class AuthService:
     """Classe de serviço para operações de autenticação"""
@@ -26,6 +36,7 @@ class AuthService:
             
         Raises:
             ResourceAlreadyExistsException: Se utilizador ou email já existir
+            ServiceUnavailableException: Se o pool de hashing estiver sobrecarregado
             DatabaseException: Se houver erro ao guardar na base de dados
         """
         existing_user = User.query.filter_by(username=user_data.username).first()
@@ -42,11 +53,14 @@ class AuthService:
                 details={"email": user_data.email}
             )
         
+        # Fora do try: a sobrecarga do pool não é um erro de base de dados
+        hashed_password = hash_password(user_data.password)
+        
         try:
             new_user = User(
                 username=user_data.username,
                 email=user_data.email,
-                hashed_password=get_password_hash(user_data.password)
+                hashed_password=hashed_password
             )
             db.session.add(new_user)
             db.session.commit()
@@ -72,23 +86,176 @@ class AuthService:
             
         Raises:
             AuthenticationException: Se credenciais forem inválidas
+            ServiceUnavailableException: Se o pool de hashing estiver sobrecarregado
         """
         user = User.query.filter_by(username=login_data.username).first()
         
-        if not user or not verify_password(login_data.password, user.hashed_password):
+        valid, new_hash = (False, None)
+        if user:
+            valid, new_hash = check_password_and_update(login_data.password, user.hashed_password)
+        if not valid:
             raise AuthenticationException(
                 message="Credenciais inválidas",
                 details={"username": login_data.username}
             )
         
-        access_token = create_access_token(identity=user.id)
+        if new_hash:
+            AuthService._rehash_password(user, new_hash)
         
         return {
-            'access_token': access_token,
-            'token_type': 'bearer',
+            **AuthService._issue_tokens(user.id, user.username),
             'user': user.to_dict()
         }
     
+    @staticmethod
+    def _issue_tokens(user_id: int, username: str) -> dict:
+        """Cria um par access token + refresh token"""
+        # O username segue nas claims para as rotas não precisarem de ler o utilizador
+        claims = {'username': username}
+        return {
+            'access_token': create_access_token(identity=user_id, additional_claims=claims),
+            'refresh_token': create_refresh_token(identity=user_id, additional_claims=claims),
+            'token_type': 'bearer'
+        }
+    
+    @staticmethod
+    def _revoke_token(payload: dict) -> bool:
+        """
+        Revoga um token (tabela revoked_tokens + lista em memória)
+        
+        Args:
+            payload: Claims do token descodificado
+            
+        Returns:
+            bool: False se o token já estava revogado
+            
+        Raises:
+            DatabaseException: Se houver erro ao guardar na base de dados
+        """
+        try:
+            db.session.add(RevokedToken(
+                jti=payload['jti'],
+                token_type=payload['type'],
+                user_id=int(payload['sub']),
+                expires_at=datetime.utcfromtimestamp(payload['exp'])
+            ))
+            db.session.commit()
+        except IntegrityError:
+            # jti único: outro pedido já revogou (ou rodou) este token
+            db.session.rollback()
+            get_token_blocklist().add(payload['jti'])
+            return False
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseException(
+                message="Erro ao revogar token",
+                details={"error": str(e)}
+            )
+        
+        get_token_blocklist().add(payload['jti'])
+        return True
+    
+    @staticmethod
+    def refresh_tokens(payload: dict) -> dict:
+        """
+        Roda o refresh token: revoga o atual e emite um novo par
+        
+        Cada refresh token só pode ser usado uma vez; a revogação é atómica
+        (jti único), pelo que dois pedidos com o mesmo token não obtêm ambos
+        um par novo.
+        
+        Args:
+            payload: Claims do refresh token do pedido
+            
+        Returns:
+            dict: Novos access token e refresh token
+            
+        Raises:
+            AuthenticationException: Se o token já tiver sido usado ou a conta não existir
+        """
+        user = get_cached_user(int(payload['sub']))
+        if user is None:
+            raise AuthenticationException(
+                message="Utilizador não encontrado",
+                details={"user_id": payload['sub']}
+            )
+        
+        if not AuthService._revoke_token(payload):
+            raise AuthenticationException(
+                message="Refresh token já utilizado",
+                details={"user_id": user.id}
+            )
+        
+        return AuthService._issue_tokens(user.id, user.username)
+    
+    @staticmethod
+    def logout(payload: dict, refresh_token: Optional[str] = None) -> None:
+        """
+        Termina a sessão revogando o access token (e o refresh token, se indicado)
+        
+        Args:
+            payload: Claims do access token do pedido
+            refresh_token: Refresh token da mesma sessão (opcional)
+            
+        Raises:
+            ValidationException: Se o refresh token for inválido ou de outro utilizador
+        """
+        refresh_payload = None
+        if refresh_token:
+            try:
+                refresh_payload = decode_token(refresh_token, allow_expired=True)
+            except PyJWTError:
+                raise ValidationException(message="Refresh token inválido")
+            if refresh_payload.get('type') != 'refresh' or refresh_payload.get('sub') != payload['sub']:
+                raise ValidationException(message="Refresh token inválido")
+        
+        AuthService._revoke_token(payload)
+        # Um refresh token expirado já não pode ser usado: não é preciso guardá-lo
+        if refresh_payload and refresh_payload['exp'] > datetime.utcnow().timestamp():
+            AuthService._revoke_token(refresh_payload)
+    
+    @staticmethod
+    def purge_revoked_tokens() -> int:
+        """
+        Remove da lista de revogados os tokens já expirados
+        
+        Um token expirado é rejeitado pelo JWT, pelo que deixa de ser
+        preciso guardá-lo.
+        
+        Returns:
+            int: Número de registos removidos
+            
+        Raises:
+            DatabaseException: Se houver erro ao remover os registos
+        """
+        try:
+            result = db.session.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+            )
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseException(
+                message="Erro ao remover tokens revogados expirados",
+                details={"error": str(e)}
+            )
+    
+    @staticmethod
+    def _rehash_password(user: User, new_hash: str) -> None:
+        """
+        Guarda o hash refeito com o custo atual (BCRYPT_ROUNDS)
+        
+        Uma falha aqui não impede o login: o hash antigo continua válido e
+        será refeito no próximo login.
+        """
+        try:
+            user.hashed_password = new_hash
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.warning(f"Erro ao atualizar o hash do utilizador {user.id}: {str(e)}")
+    
     @staticmethod
     def get_user_by_id(user_id: int) -> User:
         """
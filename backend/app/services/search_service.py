@@ -0,0 +1,171 @@
+"""Serviço de pesquisa full-text de tarefas - Service Layer Pattern"""
+import html
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+
+from app import db
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskSearchQuery
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.exceptions.custom_exceptions import ValidationException, DatabaseException
+
+SEARCH_SORT_KEY = 'rank:desc'
+# Delimitadores dos termos encontrados no excerto devolvido pela BD (caracteres
+# de uso privado): o texto é escapado antes de serem trocados por <mark>
+_MATCH_START = '\ue000'
+_MATCH_STOP = '\ue001'
+
+_POSTGRESQL_PAGE_SQL = """
+    SELECT id, rank FROM (
+        SELECT t.id AS id, ts_rank_cd(t.search_vector, tsq) AS rank
+        FROM tasks t, websearch_to_tsquery('simple', :q) tsq
+        WHERE t.user_id = :user_id AND t.search_vector @@ tsq
+    ) matches
+    {keyset}
+    ORDER BY rank DESC, id DESC
+    LIMIT :limit
+"""
+
+_POSTGRESQL_SNIPPET_SQL = """
+    SELECT id, ts_headline(
+        'simple',
+        coalesce(title, '') || ' ' || coalesce(description, ''),
+        websearch_to_tsquery('simple', :q),
+        :headline_options
+    ) AS snippet
+    FROM tasks
+    WHERE id IN :ids
+"""
+
+_SQLITE_PAGE_SQL = """
+    SELECT id, rank, snippet FROM (
+        SELECT t.id AS id,
+               -bm25(tasks_fts, 10.0, 1.0) AS rank,
+               snippet(tasks_fts, -1, :match_start, :match_stop, '…', 12) AS snippet
+        FROM tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid
+        WHERE tasks_fts MATCH :q AND t.user_id = :user_id
+    ) matches
+    {keyset}
+    ORDER BY rank DESC, id DESC
+    LIMIT :limit
+"""
+
+_KEYSET_SQL = "WHERE rank < :cursor_rank OR (rank = :cursor_rank AND id < :cursor_id)"
+
+def _highlight(snippet: Optional[str]) -> Optional[str]:
+    """Escapa o HTML do texto da tarefa e destaca os termos com <mark>"""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_MATCH_START, '<mark>').replace(_MATCH_STOP, '</mark>')
+
+class SearchService:
+    """Classe de serviço para pesquisa full-text de tarefas"""
+
+    @staticmethod
+    def _sqlite_match_expression(q: str) -> str:
+        """
+        Converte o texto do utilizador numa expressão FTS5 segura
+
+        Cada palavra é citada (sem operadores FTS5) e todas têm de ocorrer.
+
+        Args:
+            q: Texto pesquisado
+
+        Returns:
+            str: Expressão MATCH
+
+        Raises:
+            ValidationException: Se o texto não tiver palavras pesquisáveis
+        """
+        terms = re.findall(r'\w+', q)
+        if not terms:
+            raise ValidationException(
+                message="Pesquisa sem termos válidos",
+                details={"q": q}
+            )
+        return ' '.join(f'"{term}"' for term in terms)
+
+    @staticmethod
+    def search_tasks(
+        user: User,
+        query: TaskSearchQuery
+    ) -> Tuple[List[Tuple[Task, float, Optional[str]]], Optional[str]]:
+        """
+        Pesquisa tarefas do utilizador por título e descrição
+
+        Usa o índice invertido do dialeto (GIN sobre tsvector no PostgreSQL,
+        FTS5 no SQLite): o custo depende das ocorrências dos termos e não do
+        número de tarefas do utilizador.
+
+        Args:
+            user: Utilizador autenticado
+            query: Texto, limite e cursor da página anterior
+
+        Returns:
+            Tuple: Lista de (tarefa, relevância, excerto destacado) por ordem
+            de relevância e cursor da página seguinte (None se não houver mais).
+            O excerto é HTML: texto escapado, termos encontrados em <mark>
+
+        Raises:
+            ValidationException: Se o cursor ou o texto forem inválidos
+        """
+        dialect = db.engine.dialect.name
+        params = {'user_id': user.id, 'limit': query.limit + 1}
+        keyset = ''
+
+        if query.cursor:
+            cursor_rank, cursor_id = decode_cursor(query.cursor, SEARCH_SORT_KEY)
+            if not isinstance(cursor_rank, (int, float)):
+                raise ValidationException(
+                    message="Cursor de paginação inválido",
+                    details={"cursor": query.cursor}
+                )
+            params.update(cursor_rank=cursor_rank, cursor_id=cursor_id)
+            keyset = _KEYSET_SQL
+
+        if dialect == 'postgresql':
+            params['q'] = query.q
+            rows = db.session.execute(text(_POSTGRESQL_PAGE_SQL.format(keyset=keyset)), params).all()
+            snippets = {}
+            if rows:
+                snippet_sql = text(_POSTGRESQL_SNIPPET_SQL).bindparams(bindparam('ids', expanding=True))
+                snippets = dict(db.session.execute(snippet_sql, {
+                    'q': query.q,
+                    'ids': [row.id for row in rows],
+                    'headline_options': f'StartSel={_MATCH_START}, StopSel={_MATCH_STOP}, MaxWords=20, MinWords=5'
+                }).all())
+            matches = [(row.id, row.rank, snippets.get(row.id)) for row in rows]
+        elif dialect == 'sqlite':
+            params.update(
+                q=SearchService._sqlite_match_expression(query.q),
+                match_start=_MATCH_START,
+                match_stop=_MATCH_STOP
+            )
+            rows = db.session.execute(text(_SQLITE_PAGE_SQL.format(keyset=keyset)), params).all()
+            matches = [(row.id, row.rank, row.snippet) for row in rows]
+        else:
+            raise DatabaseException(
+                message="Pesquisa não suportada por esta base de dados",
+                details={"dialect": dialect}
+            )
+
+        next_cursor = None
+        if len(matches) > query.limit:
+            matches = matches[:query.limit]
+            last_id, last_rank, _ = matches[-1]
+            next_cursor = encode_cursor(SEARCH_SORT_KEY, last_rank, last_id)
+
+        tasks = {}
+        if matches:
+            ids = [task_id for task_id, _, _ in matches]
+            tasks = {task.id: task for task in Task.query.filter(Task.id.in_(ids)).all()}
+
+        results = [
+            (tasks[task_id], float(rank), _highlight(snippet))
+            for task_id, rank, snippet in matches
+            if task_id in tasks
+        ]
+        return results, next_cursor
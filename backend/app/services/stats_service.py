@@ -0,0 +1,262 @@
+"""Serviço de estatísticas das tarefas - Service Layer Pattern"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, delete, func, insert, select
+
+from app import db
+from app.models.task import Task
+from app.models.task_stats import TaskStats, TaskDailyStats
+from app.models.user import User
+from app.exceptions.custom_exceptions import DatabaseException
+
+class StatsDelta:
+    """Variações dos contadores de um utilizador numa escrita"""
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.days: Dict[date, List[int]] = {}
+
+    def add(self, created_at: Optional[datetime], total: int = 0, completed: int = 0) -> None:
+        """
+        Regista a variação de uma tarefa
+
+        Args:
+            created_at: Data de criação da tarefa (define o dia)
+            total: Variação do número de tarefas (+1 criada, -1 eliminada)
+            completed: Variação do número de tarefas concluídas
+        """
+        if not total and not completed:
+            return
+        self.total += total
+        self.completed += completed
+        if created_at is not None:
+            counters = self.days.setdefault(created_at.date(), [0, 0])
+            counters[0] += total
+            counters[1] += completed
+
+    def __bool__(self) -> bool:
+        return bool(self.total or self.completed)
+
+def _completed_sum():
+    """Expressão SQL que conta as tarefas concluídas"""
+    return func.coalesce(func.sum(case((Task.completed == True, 1), else_=0)), 0)  # noqa: E712
+
+def _dialect_insert(table):
+    """INSERT com suporte a ON CONFLICT do dialeto atual"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise DatabaseException(
+            message="Estatísticas não suportadas por esta base de dados",
+            details={"dialect": dialect}
+        )
+    return dialect_insert(table)
+
+def _upsert_counters(table, index_elements: List[str], rows: List[dict]) -> None:
+    """Soma as variações aos contadores existentes (ou cria as linhas)"""
+    statement = _dialect_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={
+            'total': table.c.total + statement.excluded.total,
+            'completed': table.c.completed + statement.excluded.completed
+        }
+    )
+    db.session.execute(statement, rows)
+
+class StatsService:
+    """Classe de serviço para as estatísticas das tarefas"""
+
+    @staticmethod
+    def apply_delta(user_id: int, delta: StatsDelta) -> None:
+        """
+        Aplica as variações aos contadores na transação atual
+
+        Deve ser chamado pelo TaskService antes do commit da escrita, para
+        que os contadores e as tarefas mudem atomicamente.
+
+        Args:
+            user_id: ID do utilizador
+            delta: Variações acumuladas
+        """
+        if not delta:
+            return
+        _upsert_counters(
+            TaskStats.__table__, ['user_id'],
+            [{'user_id': user_id, 'total': delta.total, 'completed': delta.completed}]
+        )
+        day_rows = [
+            {'user_id': user_id, 'day': day, 'total': total, 'completed': completed}
+            for day, (total, completed) in sorted(delta.days.items())
+            if total or completed
+        ]
+        if day_rows:
+            _upsert_counters(TaskDailyStats.__table__, ['user_id', 'day'], day_rows)
+
+    @staticmethod
+    def _aggregate_totals(user_id: int) -> Dict[str, int]:
+        """Conta as tarefas com GROUP BY (sem contadores)"""
+        total, completed = db.session.execute(
+            select(func.count(Task.id), _completed_sum()).where(Task.user_id == user_id)
+        ).one()
+        return {'total': total, 'completed': completed}
+
+    @staticmethod
+    def _aggregate_days(user_id: int, since: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Conta as tarefas por dia de criação com GROUP BY"""
+        day = func.date(Task.created_at)
+        statement = (
+            select(day.label('day'), func.count(Task.id), _completed_sum())
+            .where(Task.user_id == user_id, Task.created_at.isnot(None))
+            .group_by(day)
+            .order_by(day)
+        )
+        if since is not None:
+            statement = statement.where(Task.created_at >= datetime.combine(since, datetime.min.time()))
+        return [
+            {'day': str(row_day), 'total': total, 'completed': completed}
+            for row_day, total, completed in db.session.execute(statement).all()
+        ]
+
+    @staticmethod
+    def get_stats(user: User, days: int = 30) -> Dict[str, Any]:
+        """
+        Devolve os totais por estado e por dia de criação
+
+        Lê uma linha de task_stats e no máximo `days` linhas de
+        task_daily_stats, independentemente do número de tarefas. Se o
+        utilizador ainda não tiver contadores, calcula-os com GROUP BY.
+
+        Args:
+            user: Utilizador autenticado
+            days: Número de dias (a contar de hoje) incluídos em by_day
+
+        Returns:
+            Dict[str, Any]: total, completed, pending, by_day e source
+        """
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        counters = db.session.get(TaskStats, user.id)
+
+        if counters is None:
+            totals = StatsService._aggregate_totals(user.id)
+            by_day = StatsService._aggregate_days(user.id, since)
+            source = 'aggregate'
+        else:
+            totals = {'total': counters.total, 'completed': counters.completed}
+            rows = db.session.execute(
+                select(TaskDailyStats.day, TaskDailyStats.total, TaskDailyStats.completed)
+                .where(TaskDailyStats.user_id == user.id, TaskDailyStats.day >= since)
+                .order_by(TaskDailyStats.day)
+            ).all()
+            by_day = [
+                {'day': row.day.isoformat(), 'total': row.total, 'completed': row.completed}
+                for row in rows
+                if row.total
+            ]
+            source = 'counters'
+
+        for entry in by_day:
+            entry['pending'] = entry['total'] - entry['completed']
+
+        return {
+            'total': totals['total'],
+            'completed': totals['completed'],
+            'pending': totals['total'] - totals['completed'],
+            'by_day': by_day,
+            'source': source
+        }
+
+    @staticmethod
+    def reconcile(user_id: Optional[int] = None) -> List[int]:
+        """
+        Recalcula os contadores a partir das tarefas (GROUP BY)
+
+        Corrige desvios causados por escritas fora do TaskService ou por
+        atualizações concorrentes do mesmo estado.
+
+        Args:
+            user_id: Utilizador a reconciliar (None = todos)
+
+        Returns:
+            List[int]: IDs dos utilizadores cujos contadores estavam errados
+
+        Raises:
+            DatabaseException: Se houver erro ao guardar na base de dados
+        """
+        def scoped(statement, column):
+            return statement.where(column == user_id) if user_id is not None else statement
+
+        day = func.date(Task.created_at)
+        expected_totals = {
+            row[0]: tuple(row[1:])
+            for row in db.session.execute(scoped(
+                select(Task.user_id, func.count(Task.id), _completed_sum()).group_by(Task.user_id),
+                Task.user_id
+            )).all()
+        }
+        expected_days = {
+            (row[0], str(row[1])): tuple(row[2:])
+            for row in db.session.execute(scoped(
+                select(Task.user_id, day, func.count(Task.id), _completed_sum())
+                .where(Task.created_at.isnot(None))
+                .group_by(Task.user_id, day),
+                Task.user_id
+            )).all()
+        }
+        current_totals = {
+            row[0]: tuple(row[1:])
+            for row in db.session.execute(scoped(
+                select(TaskStats.user_id, TaskStats.total, TaskStats.completed), TaskStats.user_id
+            )).all()
+        }
+        current_days = {
+            (row[0], row[1].isoformat()): tuple(row[2:])
+            for row in db.session.execute(scoped(
+                select(TaskDailyStats.user_id, TaskDailyStats.day, TaskDailyStats.total, TaskDailyStats.completed)
+                .where(TaskDailyStats.total != 0),
+                TaskDailyStats.user_id
+            )).all()
+        }
+
+        drifted = {
+            uid for uid in expected_totals.keys() | current_totals.keys()
+            if expected_totals.get(uid, (0, 0)) != current_totals.get(uid, (0, 0))
+        }
+        drifted |= {
+            key[0] for key in expected_days.keys() | current_days.keys()
+            if expected_days.get(key) != current_days.get(key)
+        }
+        if not drifted:
+            return []
+
+        try:
+            db.session.execute(delete(TaskStats).where(TaskStats.user_id.in_(drifted)))
+            db.session.execute(delete(TaskDailyStats).where(TaskDailyStats.user_id.in_(drifted)))
+            total_rows = [
+                {'user_id': uid, 'total': total, 'completed': completed}
+                for uid, (total, completed) in expected_totals.items()
+                if uid in drifted
+            ]
+            day_rows = [
+                {'user_id': uid, 'day': date.fromisoformat(day_value), 'total': total, 'completed': completed}
+                for (uid, day_value), (total, completed) in expected_days.items()
+                if uid in drifted
+            ]
+            if total_rows:
+                db.session.execute(insert(TaskStats), total_rows)
+            if day_rows:
+                db.session.execute(insert(TaskDailyStats), day_rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseException(
+                message="Erro ao reconciliar estatísticas das tarefas",
+                details={"error": str(e)}
+            )
+
+        return sorted(drifted)
@@ -1,30 +1,420 @@
 """Serviço de tarefas - Service Layer Pattern"""
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, NoReturn, Optional, Tuple
+from flask import current_app
+from sqlalchemy import delete, insert, select, tuple_, update
 from app import db
 from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
 from app.models.user import User
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskFilterQuery, TaskListQuery, TaskBatchRequest
+)
+from app.services.stats_service import StatsService, StatsDelta
+from app.utils.cache import get_task_list_cache
+from app.utils.serializers import TASK_FIELDS
+from app.utils.pagination import (
+    encode_cursor, decode_cursor, encode_sync_token, decode_sync_token
+)
 from app.exceptions.custom_exceptions import (
     ResourceNotFoundException,
     AuthorizationException,
-    DatabaseException
+    DatabaseException,
+    ValidationException,
+    SyncTokenExpiredException
 )
 
+EXPORT_BATCH_SIZE = 500
+IMPORT_BATCH_SIZE = 500
+DEFAULT_TOMBSTONE_RETENTION_DAYS = 30
+
 class TaskService:
     """Classe de serviço para operações com tarefas"""
     
     @staticmethod
-    def get_user_tasks(user: User) -> List[Task]:
+    def _build_list_query(user: User, query: TaskFilterQuery):
+        """
+        Constrói a query filtrada e ordenada da listagem de tarefas
+        
+        Os filtros são predicados SQL; a ordenação termina sempre em id para
+        ser total e poder ser usada como keyset.
+        
+        Args:
+            user: Utilizador autenticado
+            query: Filtros e ordenação
+            
+        Returns:
+            Query: Query SQLAlchemy pronta a executar
+        """
+        sort_column = getattr(Task, query.sort)
+        statement = Task.query.filter(Task.user_id == user.id)
+        
+        if query.completed is not None:
+            # Comparação explícita (e não IS) para o planner usar o índice parcial
+            statement = statement.filter(Task.completed == query.completed)
+        if query.created_after is not None:
+            statement = statement.filter(Task.created_at >= query.created_after)
+        if query.created_before is not None:
+            statement = statement.filter(Task.created_at < query.created_before)
+        if query.updated_after is not None:
+            statement = statement.filter(Task.updated_at >= query.updated_after)
+        if query.updated_before is not None:
+            statement = statement.filter(Task.updated_at < query.updated_before)
+        
+        if query.order == 'asc':
+            return statement.order_by(sort_column.asc(), Task.id.asc())
+        return statement.order_by(sort_column.desc(), Task.id.desc())
+    
+    @staticmethod
+    def get_tasks_version(user: User) -> int:
+        """
+        Devolve a versão das tarefas do utilizador
+        
+        A versão é um contador em users.tasks_version incrementado na mesma
+        transação de cada escrita; permite validar ETags sem ler tarefas.
+        
+        Args:
+            user: Utilizador autenticado
+            
+        Returns:
+            int: Versão atual (0 se o utilizador não tiver escritas)
+        """
+        version = db.session.scalar(select(User.tasks_version).where(User.id == user.id))
+        return version or 0
+    
+    @staticmethod
+    def _bump_version(user_id: int) -> None:
+        """Incrementa a versão das tarefas do utilizador na transação atual"""
+        db.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(tasks_version=User.tasks_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def _invalidate_cache(user_id: int) -> None:
+        """Liberta as listagens em cache do utilizador após uma escrita confirmada"""
+        get_task_list_cache().invalidate(str(user_id))
+    
+    @staticmethod
+    def _record_tombstones(user_id: int, task_ids: List[int]) -> None:
+        """Regista as eliminações na transação atual (para a sincronização incremental)"""
+        if task_ids:
+            db.session.execute(
+                insert(TaskTombstone),
+                [{'task_id': task_id, 'user_id': user_id} for task_id in task_ids]
+            )
+    
+    @staticmethod
+    def _tombstone_retention() -> timedelta:
+        """Período durante o qual as eliminações ficam disponíveis para sincronização"""
+        return timedelta(days=current_app.config.get(
+            'TOMBSTONE_RETENTION_DAYS', DEFAULT_TOMBSTONE_RETENTION_DAYS
+        ))
+    
+    @staticmethod
+    def _sync_safety_window() -> timedelta:
+        """Duração máxima de uma transação de escrita (SYNC_SAFETY_WINDOW_SECONDS)"""
+        return timedelta(seconds=current_app.config.get('SYNC_SAFETY_WINDOW_SECONDS', 30))
+    
+    @staticmethod
+    def _advance_sync_position(
+        position: Optional[Tuple[datetime, int]],
+        page_end: Optional[Tuple[datetime, int]],
+        horizon: Tuple[datetime, int]
+    ) -> Tuple[Optional[Tuple[datetime, int]], bool]:
+        """
+        Próxima posição de um cursor de sincronização
+        
+        updated_at e deleted_at são da hora do statement e não do commit:
+        uma transação iniciada antes desta leitura pode confirmar depois com
+        datas anteriores. O cursor nunca passa de horizon (agora menos a
+        janela de segurança); as linhas mais recentes voltam a ser entregues
+        e o cliente aplica-as por id.
+        
+        Args:
+            position: Posição atual (None = desde o início)
+            page_end: Última linha entregue se houver mais páginas, senão None
+            horizon: Limite seguro
+            
+        Returns:
+            Tuple: (nova posição, True se avançou)
+        """
+        target = min(page_end, horizon) if page_end is not None else horizon
+        if position is not None and target <= position:
+            return position, False
+        return target, True
+    
+    @staticmethod
+    def get_changes(user: User, since: Optional[str], limit: int) -> Dict[str, Any]:
+        """
+        Devolve as tarefas alteradas e eliminadas desde um token de sincronização
+        
+        Lê (user_id, updated_at, id) e (user_id, deleted_at, id) por keyset, pelo
+        que o custo depende do número de alterações e não do total de tarefas.
+        Sem token, devolve todas as tarefas (sincronização completa). As
+        alterações dos últimos SYNC_SAFETY_WINDOW_SECONDS voltam a ser
+        entregues na sincronização seguinte (ver _advance_sync_position).
+        
+        Args:
+            user: Utilizador autenticado
+            since: Token devolvido pela sincronização anterior (opcional)
+            limit: Número máximo de tarefas e de eliminações por resposta
+            
+        Returns:
+            Dict[str, Any]: Tarefas alteradas, IDs eliminados, próximo token e
+            has_more (True se for preciso pedir novamente com o novo token)
+            
+        Raises:
+            ValidationException: Se o token for inválido
+            SyncTokenExpiredException: Se o token for anterior à retenção das eliminações
+        """
+        now = datetime.utcnow()
+        horizon = (now - TaskService._sync_safety_window(), 0)
+        
+        if since:
+            task_position, tombstone_position = decode_sync_token(since)
+            if tombstone_position[0] < now - TaskService._tombstone_retention():
+                raise SyncTokenExpiredException(details={"since": since})
+        else:
+            # A listagem completa já reflete as eliminações confirmadas; as de
+            # transações ainda abertas chegam na próxima sincronização
+            task_position, tombstone_position = None, horizon
+        
+        tasks_query = Task.query.filter(Task.user_id == user.id)
+        if task_position is not None:
+            tasks_query = tasks_query.filter(tuple_(Task.updated_at, Task.id) > tuple_(*task_position))
+        changed = tasks_query.order_by(Task.updated_at.asc(), Task.id.asc()).limit(limit + 1).all()
+        
+        deleted = []
+        if since:
+            deleted = db.session.execute(
+                select(TaskTombstone.id, TaskTombstone.task_id, TaskTombstone.deleted_at)
+                .where(
+                    TaskTombstone.user_id == user.id,
+                    tuple_(TaskTombstone.deleted_at, TaskTombstone.id) > tuple_(*tombstone_position)
+                )
+                .order_by(TaskTombstone.deleted_at.asc(), TaskTombstone.id.asc())
+                .limit(limit + 1)
+            ).all()
+        
+        more_changed = len(changed) > limit
+        more_deleted = len(deleted) > limit
+        changed = changed[:limit]
+        deleted = deleted[:limit]
+        
+        task_position, tasks_advanced = TaskService._advance_sync_position(
+            task_position,
+            (changed[-1].updated_at, changed[-1].id) if more_changed else None,
+            horizon
+        )
+        tombstone_position, tombstones_advanced = TaskService._advance_sync_position(
+            tombstone_position,
+            (deleted[-1].deleted_at, deleted[-1].id) if more_deleted else None,
+            horizon
+        )
+        
+        return {
+            'changed': changed,
+            'deleted': [row.task_id for row in deleted],
+            'next_token': encode_sync_token(task_position, tombstone_position),
+            # Sem avanço (página inteira dentro da janela) o cliente repete mais tarde
+            'has_more': (more_changed and tasks_advanced) or (more_deleted and tombstones_advanced)
+        }
+    
+    @staticmethod
+    def compact_tombstones(retention: Optional[timedelta] = None) -> int:
+        """
+        Remove registos de eliminação mais antigos que o período de retenção
+        
+        Clientes com tokens anteriores a esse período recebem 410 e têm de
+        fazer uma sincronização completa.
+        
+        Args:
+            retention: Período de retenção (por omissão TOMBSTONE_RETENTION_DAYS)
+            
+        Returns:
+            int: Número de registos removidos
+            
+        Raises:
+            DatabaseException: Se houver erro ao remover os registos
+        """
+        cutoff = datetime.utcnow() - (retention or TaskService._tombstone_retention())
+        try:
+            result = db.session.execute(delete(TaskTombstone).where(TaskTombstone.deleted_at < cutoff))
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseException(
+                message="Erro ao compactar registos de eliminação",
+                details={"error": str(e)}
+            )
+    
+    @staticmethod
+    def get_user_tasks(user: User, query: Optional[TaskListQuery] = None) -> List[Task]:
         """
         Lista todas as tarefas de um utilizador
         
         Args:
             user: Utilizador autenticado
+            query: Filtros e ordenação (opcional)
             
         Returns:
             List[Task]: Lista de tarefas do utilizador
         """
-        return Task.query.filter_by(user_id=user.id).order_by(Task.created_at.desc()).all()
+        return TaskService._build_list_query(user, query or TaskListQuery()).all()
+    
+    @staticmethod
+    def _apply_cursor(statement, query: TaskListQuery):
+        """
+        Aplica o keyset (coluna de ordenação, id) do cursor à query
+        
+        Raises:
+            ValidationException: Se o cursor for inválido
+        """
+        if not query.cursor:
+            return statement
+        
+        sort_column = getattr(Task, query.sort)
+        sort_value, task_id = decode_cursor(query.cursor, query.sort_key)
+        position = tuple_(sort_column, Task.id)
+        boundary = tuple_(sort_value, task_id)
+        return statement.filter(position > boundary if query.order == 'asc' else position < boundary)
+    
+    @staticmethod
+    def _split_page(items: list, query: TaskListQuery) -> Tuple[list, Optional[str]]:
+        """Separa a linha extra pedida a mais e gera o cursor da página seguinte"""
+        next_cursor = None
+        if len(items) > query.limit:
+            items = items[:query.limit]
+            last = items[-1]
+            next_cursor = encode_cursor(query.sort_key, getattr(last, query.sort), last.id)
+        return items, next_cursor
+    
+    @staticmethod
+    def get_user_tasks_page(user: User, query: TaskListQuery) -> Tuple[List[Task], Optional[str]]:
+        """
+        Lista uma página de tarefas do utilizador por keyset em (coluna de ordenação, id)
+        
+        Ao contrário de OFFSET, o custo de cada página não depende da
+        profundidade: o cursor posiciona a leitura diretamente no índice.
+        
+        Args:
+            user: Utilizador autenticado
+            query: Filtros, ordenação, limite e cursor da página anterior
+            
+        Returns:
+            Tuple[List[Task], Optional[str]]: Tarefas da página e cursor da
+            página seguinte (None se não houver mais tarefas)
+            
+        Raises:
+            ValidationException: Se o cursor for inválido
+        """
+        statement = TaskService._apply_cursor(TaskService._build_list_query(user, query), query)
+        tasks = statement.limit(query.limit + 1).all()
+        return TaskService._split_page(tasks, query)
+    
+    @staticmethod
+    def _row_columns(fields: Tuple[str, ...], extra: Tuple[str, ...] = ()) -> list:
+        """
+        Colunas a ler para os campos pedidos (pela ordem de fields)
+        
+        As colunas de extra (ex: id e coluna de ordenação para o cursor) são
+        acrescentadas no fim se não tiverem sido pedidas; os serializadores
+        ignoram-nas.
+        """
+        names = list(fields) + [name for name in extra if name not in fields]
+        return [getattr(Task, name) for name in names]
+    
+    @staticmethod
+    def get_user_task_rows(user: User, query: Optional[TaskListQuery] = None) -> List[Any]:
+        """
+        Lista as tarefas de um utilizador como tuplos de colunas
+        
+        Caminho de leitura sem ORM: não há hidratação de objetos nem
+        identity map, e só são lidas as colunas de query.fields. As linhas
+        são serializadas por app.utils.serializers.
+        
+        Args:
+            user: Utilizador autenticado
+            query: Filtros, ordenação e campos (opcional)
+            
+        Returns:
+            List[Row]: Linhas com as colunas pela ordem de query.selected_fields
+        """
+        query = query or TaskListQuery()
+        statement = TaskService._build_list_query(user, query)
+        columns = TaskService._row_columns(query.selected_fields)
+        return db.session.execute(statement.with_entities(*columns).statement).all()
+    
+    @staticmethod
+    def get_user_task_rows_page(user: User, query: TaskListQuery) -> Tuple[List[Any], Optional[str]]:
+        """
+        Versão de get_user_tasks_page que devolve tuplos de colunas
+        
+        Raises:
+            ValidationException: Se o cursor for inválido
+        """
+        statement = TaskService._apply_cursor(TaskService._build_list_query(user, query), query)
+        columns = TaskService._row_columns(query.selected_fields, ('id', query.sort))
+        rows = db.session.execute(
+            statement.with_entities(*columns).limit(query.limit + 1).statement
+        ).all()
+        return TaskService._split_page(rows, query)
+    
+    @staticmethod
+    def iter_user_tasks(
+        user: User,
+        query: TaskFilterQuery,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[Task]:
+        """
+        Percorre as tarefas do utilizador em lotes, sem as carregar todas
+        
+        Usa um cursor do lado do servidor (stream_results) e yield_per, pelo
+        que a memória usada não depende do número de tarefas e a primeira
+        linha fica disponível antes de a query terminar.
+        
+        Args:
+            user: Utilizador autenticado
+            query: Filtros e ordenação
+            batch_size: Número de linhas obtidas por ida à base de dados
+            
+        Yields:
+            Task: Tarefas do utilizador pela ordem pedida
+        """
+        statement = TaskService._build_list_query(user, query).statement
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        try:
+            for task in result.scalars():
+                yield task
+                # Liberta o identity map para a memória não crescer com o export
+                db.session.expunge(task)
+        finally:
+            result.close()
+    
+    @staticmethod
+    def iter_user_task_rows(
+        user: User,
+        query: TaskFilterQuery,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[Any]:
+        """
+        Versão de iter_user_tasks que devolve tuplos de colunas (sem ORM)
+        
+        Yields:
+            Row: Linhas com as colunas pela ordem de query.selected_fields
+        """
+        columns = TaskService._row_columns(query.selected_fields)
+        statement = TaskService._build_list_query(user, query).with_entities(*columns).statement
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        try:
+            for row in result:
+                yield row
+        finally:
+            result.close()
     
     @staticmethod
     def get_task_by_id(task_id: int, user: User) -> Task:
@@ -58,6 +448,68 @@ class TaskService:
         
         return task
     
+    @staticmethod
+    def _raise_not_owned(task_id: int, user: User) -> NoReturn:
+        """
+        Erro para uma escrita que não encontrou a tarefa do utilizador
+        
+        Só corre quando o UPDATE/DELETE não afetou nenhuma linha: distingue
+        tarefa inexistente de tarefa de outro utilizador.
+        
+        Raises:
+            ResourceNotFoundException: Se tarefa não for encontrada
+            AuthorizationException: Se tarefa não pertencer ao utilizador
+        """
+        owner_id = db.session.scalar(select(Task.user_id).where(Task.id == task_id))
+        if owner_id is None:
+            raise ResourceNotFoundException(
+                resource="Tarefa",
+                details={"task_id": task_id}
+            )
+        raise AuthorizationException(
+            message="Não tem permissão para aceder a esta tarefa",
+            details={"task_id": task_id, "user_id": user.id}
+        )
+    
+    @staticmethod
+    def _supports_returning(statement: str) -> bool:
+        """Indica se a BD aceita '<statement> ... RETURNING' (insert, update, delete)"""
+        return getattr(db.session.get_bind().dialect, f'{statement}_returning', False)
+    
+    @staticmethod
+    def get_task_row(task_id: int, user: User, fields: Tuple[str, ...] = TASK_FIELDS) -> Any:
+        """
+        Busca uma tarefa do utilizador lendo apenas as colunas pedidas
+        
+        Args:
+            task_id: ID da tarefa
+            user: Utilizador autenticado
+            fields: Campos a ler
+            
+        Returns:
+            Row: Linha com as colunas pela ordem de fields
+            
+        Raises:
+            ResourceNotFoundException: Se tarefa não for encontrada
+            AuthorizationException: Se tarefa não pertencer ao utilizador
+        """
+        columns = TaskService._row_columns(fields, ('user_id',))
+        row = db.session.execute(select(*columns).where(Task.id == task_id)).first()
+        
+        if row is None:
+            raise ResourceNotFoundException(
+                resource="Tarefa",
+                details={"task_id": task_id}
+            )
+        
+        if row.user_id != user.id:
+            raise AuthorizationException(
+                message="Não tem permissão para aceder a esta tarefa",
+                details={"task_id": task_id, "user_id": user.id}
+            )
+        
+        return row
+    
     @staticmethod
     def create_task(task_data: TaskCreate, user: User) -> Task:
         """
@@ -81,8 +533,18 @@ class TaskService:
                 user_id=user.id
             )
             db.session.add(new_task)
+            # Um só INSERT (o id vem com ele: RETURNING ou lastrowid); as
+            # datas são geradas em Python e já estão no objeto
+            db.session.flush()
+            
+            delta = StatsDelta()
+            delta.add(new_task.created_at, total=1, completed=int(new_task.completed))
+            StatsService.apply_delta(user.id, delta)
+            TaskService._bump_version(user.id)
+            # Fora da sessão o commit não expira os atributos: sem SELECT depois
+            db.session.expunge(new_task)
             db.session.commit()
-            db.session.refresh(new_task)
+            TaskService._invalidate_cache(user.id)
             return new_task
         except Exception as e:
             db.session.rollback()
@@ -91,11 +553,319 @@ class TaskService:
                 details={"error": str(e)}
             )
     
+    @staticmethod
+    def import_tasks(
+        tasks_data: Iterable[TaskCreate],
+        user: User,
+        batch_size: int = IMPORT_BATCH_SIZE
+    ) -> int:
+        """
+        Cria tarefas em massa numa única transação
+        
+        As tarefas são inseridas em lotes com um INSERT executemany por lote
+        (em vez de add/commit/refresh por tarefa); o iterável é consumido de
+        forma incremental, pelo que pode vir diretamente de um stream.
+        
+        Args:
+            tasks_data: Dados das tarefas (já validados)
+            user: Utilizador autenticado
+            batch_size: Número de linhas por INSERT
+            
+        Returns:
+            int: Número de tarefas criadas
+            
+        Raises:
+            DatabaseException: Se houver erro ao guardar na base de dados
+        """
+        statement = insert(Task)
+        imported = 0
+        batch = []
+        # Data comum a todo o lote, para saber o dia dos contadores sem reler as linhas
+        now = datetime.utcnow()
+        delta = StatsDelta()
+        
+        try:
+            for task_data in tasks_data:
+                batch.append({
+                    'title': task_data.title,
+                    'description': task_data.description,
+                    'completed': task_data.completed,
+                    'created_at': now,
+                    'updated_at': now,
+                    'user_id': user.id
+                })
+                delta.add(now, total=1, completed=int(task_data.completed))
+                if len(batch) >= batch_size:
+                    db.session.execute(statement, batch)
+                    imported += len(batch)
+                    batch = []
+            if batch:
+                db.session.execute(statement, batch)
+                imported += len(batch)
+            if imported:
+                StatsService.apply_delta(user.id, delta)
+                TaskService._bump_version(user.id)
+            db.session.commit()
+            if imported:
+                TaskService._invalidate_cache(user.id)
+            return imported
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseException(
+                message="Erro ao importar tarefas na base de dados",
+                details={"error": str(e)}
+            )
+    
+    @staticmethod
+    def _check_batch_ownership(task_ids: List[int], user: User) -> Dict[int, Any]:
+        """
+        Verifica numa só query que todas as tarefas existem e são do utilizador
+        
+        Returns:
+            Dict[int, Any]: Estado atual (completed, created_at) de cada tarefa
+            
+        Raises:
+            ResourceNotFoundException: Se alguma tarefa não existir
+            AuthorizationException: Se alguma tarefa pertencer a outro utilizador
+        """
+        if not task_ids:
+            return {}
+        
+        rows = {
+            row.id: row
+            for row in db.session.execute(
+                select(Task.id, Task.user_id, Task.completed, Task.created_at)
+                .where(Task.id.in_(task_ids))
+            ).all()
+        }
+        owners = {task_id: row.user_id for task_id, row in rows.items()}
+        
+        missing = sorted(set(task_ids) - owners.keys())
+        if missing:
+            raise ResourceNotFoundException(
+                resource="Tarefa",
+                details={"task_ids": missing}
+            )
+        
+        foreign = sorted(task_id for task_id, owner_id in owners.items() if owner_id != user.id)
+        if foreign:
+            raise AuthorizationException(
+                message="Não tem permissão para aceder a esta tarefa",
+                details={"task_ids": foreign, "user_id": user.id}
+            )
+        
+        return rows
+    
+    @staticmethod
+    def apply_batch(batch: TaskBatchRequest, user: User) -> Dict[str, list]:
+        """
+        Aplica um lote de criações, atualizações e eliminações numa transação
+        
+        A posse das tarefas é verificada uma vez para todo o lote. As
+        operações são aplicadas por conjuntos: um INSERT para as criações, um
+        UPDATE por cada combinação distinta de campos/valores e um DELETE
+        para as eliminações. Atualizações repetidas da mesma tarefa são
+        combinadas pela ordem recebida.
+        
+        Args:
+            batch: Operações validadas
+            user: Utilizador autenticado
+            
+        As tarefas criadas e atualizadas vêm do próprio INSERT/UPDATE
+        (RETURNING) como linhas de colunas, sem SELECT depois do commit.
+        
+        Returns:
+            Dict[str, list]: Linhas (TASK_FIELDS) das tarefas criadas e
+            atualizadas e IDs eliminados
+            
+        Raises:
+            ValidationException: Se uma tarefa for atualizada e eliminada no mesmo lote
+            ResourceNotFoundException: Se alguma tarefa não existir
+            AuthorizationException: Se alguma tarefa pertencer a outro utilizador
+            DatabaseException: Se houver erro ao guardar na base de dados
+        """
+        creates = []
+        updates: Dict[int, dict] = {}
+        deletes = []
+        
+        for operation in batch.operations:
+            if operation.op == 'create':
+                creates.append({
+                    'title': operation.data.title,
+                    'description': operation.data.description,
+                    'completed': operation.data.completed,
+                    'user_id': user.id
+                })
+            elif operation.op == 'update':
+                changes = operation.data.model_dump(exclude_none=True)
+                updates.setdefault(operation.id, {}).update(changes)
+            else:
+                deletes.append(operation.id)
+        
+        conflicting = sorted(set(updates) & set(deletes))
+        if conflicting:
+            raise ValidationException(
+                message="Uma tarefa não pode ser atualizada e eliminada no mesmo lote",
+                details={"task_ids": conflicting}
+            )
+        
+        current = TaskService._check_batch_ownership(list(updates) + deletes, user)
+        
+        delta = StatsDelta()
+        for task_id, changes in updates.items():
+            if 'completed' in changes:
+                row = current[task_id]
+                delta.add(row.created_at, completed=int(changes['completed']) - int(row.completed))
+        for task_id in set(deletes):
+            row = current[task_id]
+            delta.add(row.created_at, total=-1, completed=-int(row.completed))
+        
+        # Agrupa as atualizações com os mesmos valores num único UPDATE
+        groups: Dict[tuple, List[int]] = {}
+        for task_id, changes in updates.items():
+            if changes:
+                groups.setdefault(tuple(sorted(changes.items())), []).append(task_id)
+        
+        columns = TaskService._row_columns(TASK_FIELDS)
+        
+        try:
+            created = []
+            if creates:
+                if TaskService._supports_returning('insert'):
+                    # Um só INSERT com várias linhas; RETURNING não garante a
+                    # ordem, mas os ids seguem a ordem das VALUES
+                    created = sorted(
+                        db.session.execute(insert(Task).returning(*columns), creates).all(),
+                        key=lambda row: row.id
+                    )
+                else:
+                    # Sem RETURNING: INSERTs pelo ORM e um SELECT das linhas criadas
+                    tasks = [Task(**values) for values in creates]
+                    db.session.add_all(tasks)
+                    db.session.flush()
+                    created = db.session.execute(
+                        select(*columns).where(Task.id.in_([task.id for task in tasks])).order_by(Task.id)
+                    ).all()
+                for row in created:
+                    delta.add(row.created_at, total=1, completed=int(row.completed))
+            
+            updated = []
+            for changes, task_ids in groups.items():
+                statement = (
+                    update(Task)
+                    .where(Task.id.in_(task_ids), Task.user_id == user.id)
+                    .values(**dict(changes))
+                    .execution_options(synchronize_session=False)
+                )
+                if TaskService._supports_returning('update'):
+                    updated.extend(db.session.execute(statement.returning(*columns)).all())
+                else:
+                    db.session.execute(statement)
+            if updates and not TaskService._supports_returning('update'):
+                # Sem RETURNING: um SELECT das linhas atualizadas
+                updated = db.session.execute(select(*columns).where(Task.id.in_(list(updates)))).all()
+            updated.sort(key=lambda row: row.id)
+            
+            if deletes:
+                db.session.execute(
+                    delete(Task)
+                    .where(Task.id.in_(deletes), Task.user_id == user.id)
+                    .execution_options(synchronize_session=False)
+                )
+                TaskService._record_tombstones(user.id, sorted(set(deletes)))
+            
+            StatsService.apply_delta(user.id, delta)
+            TaskService._bump_version(user.id)
+            db.session.commit()
+            TaskService._invalidate_cache(user.id)
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseException(
+                message="Erro ao aplicar lote de operações na base de dados",
+                details={"error": str(e)}
+            )
+        
+        return {
+            'created': created,
+            'updated': updated,
+            'deleted': sorted(set(deletes))
+        }
+    
+    @staticmethod
+    def _update_with_previous_statement(owned: tuple, values: dict):
+        """
+        UPDATE que devolve a tarefa e o completed anterior (PostgreSQL)
+        
+        A CTE bloqueia a linha (FOR UPDATE) e lê o estado anterior; o
+        UPDATE ... FROM devolve-o no RETURNING, num só statement.
+        """
+        previous = select(Task.id, Task.completed).where(*owned).with_for_update().cte('previous')
+        return (
+            update(Task)
+            .where(Task.id == previous.c.id)
+            .values(**values)
+            .returning(Task, previous.c.completed.label('previous_completed'))
+        )
+    
+    @staticmethod
+    def _update_returns_previous() -> bool:
+        """Indica se o UPDATE ... RETURNING pode devolver o estado anterior (PostgreSQL)"""
+        return db.session.get_bind().dialect.name == 'postgresql'
+    
+    @staticmethod
+    def _update_owned_task(owned: tuple, values: dict, with_previous: bool) -> Tuple[Optional[Task], Optional[bool]]:
+        """
+        Aplica o UPDATE à tarefa do utilizador na transação atual
+        
+        Args:
+            owned: Condições que identificam a tarefa do utilizador
+            values: Colunas a alterar
+            with_previous: Se deve devolver também o completed anterior
+            
+        Returns:
+            Tuple: (tarefa atualizada ou None se nenhuma linha foi afetada,
+            completed anterior ou None se não pedido)
+        """
+        options = {'synchronize_session': False, 'populate_existing': True}
+        if with_previous and TaskService._update_returns_previous():
+            row = db.session.execute(
+                TaskService._update_with_previous_statement(owned, values),
+                execution_options=options
+            ).one_or_none()
+            return (row[0], row[1]) if row is not None else (None, None)
+        
+        previous = None
+        if with_previous:
+            # SQLite: dois statements. O RETURNING só vê a linha nova e não
+            # pode referir as tabelas de um UPDATE ... FROM, por isso o estado
+            # anterior é lido pela chave primária na mesma transação
+            previous = db.session.scalar(select(Task.completed).where(*owned))
+            if previous is None:
+                return None, None
+        
+        statement = update(Task).where(*owned).values(**values)
+        if TaskService._supports_returning('update'):
+            task = db.session.scalars(statement.returning(Task), execution_options=options).one_or_none()
+        else:
+            result = db.session.execute(statement, execution_options={'synchronize_session': False})
+            task = db.session.scalars(
+                select(Task).where(*owned).execution_options(populate_existing=True)
+            ).one_or_none() if result.rowcount else None
+        return task, previous
+    
     @staticmethod
     def update_task(task_id: int, task_data: TaskUpdate, user: User) -> Task:
         """
         Atualiza uma tarefa existente
         
+        A tarefa é alterada e devolvida por um só UPDATE ... RETURNING,
+        filtrado pelo dono (sem SELECT depois). Quando o pedido inclui
+        completed, o PostgreSQL devolve o estado anterior no mesmo statement;
+        o SQLite precisa de dois (SELECT pela chave primária e UPDATE). Na
+        mesma transação seguem os contadores (se o estado mudar) e a versão
+        das tarefas do utilizador. Se o UPDATE não afetar nenhuma linha, uma
+        query distingue 404 de 403.
+        
         Args:
             task_id: ID da tarefa
             task_data: Dados para atualização
@@ -109,31 +879,43 @@ class TaskService:
             AuthorizationException: Se tarefa não pertencer ao utilizador
             DatabaseException: Se houver erro ao atualizar na base de dados
         """
-        task = TaskService.get_task_by_id(task_id, user)
+        values = task_data.model_dump(include={'title', 'description', 'completed'}, exclude_none=True)
+        owned = (Task.id == task_id, Task.user_id == user.id)
         
         try:
-            if task_data.title is not None:
-                task.title = task_data.title
-            if task_data.description is not None:
-                task.description = task_data.description
-            if task_data.completed is not None:
-                task.completed = task_data.completed
+            task, previous = TaskService._update_owned_task(owned, values, task_data.completed is not None)
             
-            db.session.commit()
-            db.session.refresh(task)
-            return task
+            if task is not None:
+                if previous is not None:
+                    delta = StatsDelta()
+                    delta.add(task.created_at, completed=int(task.completed) - int(previous))
+                    StatsService.apply_delta(user.id, delta)
+                TaskService._bump_version(user.id)
+                # Fora da sessão o commit não expira os atributos: sem SELECT depois
+                db.session.expunge(task)
+                db.session.commit()
+                TaskService._invalidate_cache(user.id)
+                return task
+            db.session.rollback()
         except Exception as e:
             db.session.rollback()
             raise DatabaseException(
                 message="Erro ao atualizar tarefa na base de dados",
                 details={"error": str(e)}
             )
+        
+        TaskService._raise_not_owned(task_id, user)
     
     @staticmethod
     def delete_task(task_id: int, user: User) -> None:
         """
         Elimina uma tarefa
         
+        Um só DELETE ... RETURNING, filtrado pelo dono, devolve o que os
+        contadores precisam (data de criação e estado) sem SELECT antes. Na
+        mesma transação seguem os contadores, o tombstone e a versão das
+        tarefas do utilizador.
+        
         Args:
             task_id: ID da tarefa
             user: Utilizador autenticado
@@ -143,15 +925,32 @@ class TaskService:
             AuthorizationException: Se tarefa não pertencer ao utilizador
             DatabaseException: Se houver erro ao eliminar na base de dados
         """
-        task = TaskService.get_task_by_id(task_id, user)
+        owned = (Task.id == task_id, Task.user_id == user.id)
         
         try:
-            db.session.delete(task)
-            db.session.commit()
+            statement = delete(Task).where(*owned).execution_options(synchronize_session=False)
+            if TaskService._supports_returning('delete'):
+                row = db.session.execute(statement.returning(Task.created_at, Task.completed)).one_or_none()
+            else:
+                row = db.session.execute(select(Task.created_at, Task.completed).where(*owned)).one_or_none()
+                if row is not None:
+                    db.session.execute(statement)
+            
+            if row is not None:
+                delta = StatsDelta()
+                delta.add(row.created_at, total=-1, completed=-int(row.completed))
+                StatsService.apply_delta(user.id, delta)
+                TaskService._record_tombstones(user.id, [task_id])
+                TaskService._bump_version(user.id)
+                db.session.commit()
+                TaskService._invalidate_cache(user.id)
+                return
+            db.session.rollback()
         except Exception as e:
             db.session.rollback()
             raise DatabaseException(
                 message="Erro ao eliminar tarefa na base de dados",
                 details={"error": str(e)}
             )
-
+        
+        TaskService._raise_not_owned(task_id, user)
@@ -0,0 +1,73 @@
+"""Leitura e validação incremental de tarefas para importação em massa"""
+import json
+from typing import IO, Any, Iterable, Iterator, List
+
+from pydantic import ValidationError
+
+from app.schemas.task import TaskCreate
+from app.middleware.error_handler import format_validation_errors
+
+# Número máximo de erros devolvidos na resposta (os restantes só são contados)
+MAX_REPORTED_ERRORS = 100
+
+class _InvalidLine:
+    """Marcador de linha NDJSON que não é JSON válido"""
+    def __init__(self, error: str):
+        self.error = error
+
+def iter_ndjson(stream: IO[bytes]) -> Iterator[Any]:
+    """
+    Lê um corpo NDJSON linha a linha, sem o carregar todo em memória
+
+    Args:
+        stream: Stream binário do pedido
+
+    Yields:
+        Any: Objeto de cada linha não vazia (ou marcador de linha inválida)
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield _InvalidLine(str(e))
+
+class ImportReport:
+    """Acumula o resultado da validação de uma importação"""
+
+    def __init__(self, max_reported_errors: int = MAX_REPORTED_ERRORS):
+        self.max_reported_errors = max_reported_errors
+        self.received = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def add_error(self, index: int, errors: list) -> None:
+        """Regista um item inválido"""
+        self.failed += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append({'index': index, 'errors': errors})
+
+    def validate(self, raw_items: Iterable[Any]) -> Iterator[TaskCreate]:
+        """
+        Valida cada item com TaskCreate, registando os inválidos
+
+        Args:
+            raw_items: Itens recebidos (dicionários)
+
+        Yields:
+            TaskCreate: Itens válidos, pela ordem recebida
+        """
+        for index, raw in enumerate(raw_items):
+            self.received += 1
+            if isinstance(raw, _InvalidLine):
+                self.add_error(index, [{'loc': [], 'msg': f'JSON inválido: {raw.error}', 'type': 'json_invalid'}])
+                continue
+            if not isinstance(raw, dict):
+                self.add_error(index, [{'loc': [], 'msg': 'O item deve ser um objeto JSON', 'type': 'dict_type'}])
+                continue
+            try:
+                yield TaskCreate(**raw)
+            except ValidationError as e:
+                self.add_error(index, format_validation_errors(e))
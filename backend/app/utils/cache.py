@@ -0,0 +1,299 @@
+"""Cache de respostas serializadas da listagem de tarefas
+
+As chaves incluem a versão das tarefas do utilizador (users.tasks_version),
+pelo que uma entrada nunca é servida depois de uma escrita confirmada, mesmo
+com vários workers. A invalidação explícita após cada escrita apenas liberta
+as entradas obsoletas.
+
+Backends:
+    memory: LRU com TTL no próprio processo (por omissão)
+    file:   diretório partilhado entre processos (ex: workers do Gunicorn)
+    none:   cache desativada
+
+Cada resposta é uma listagem inteira e qualquer variação da query string
+(cursor, fields) é uma entrada nova: os backends limitam o total em bytes
+(TASK_CACHE_MAX_BYTES) e não guardam respostas acima de
+TASK_CACHE_MAX_ENTRY_BYTES.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from flask import current_app
+
+TASK_LIST_CACHE_EXTENSION = 'task_list_cache'
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_ENTRY_BYTES = 1024 * 1024
+
+class CacheBackend:
+    """Interface dos backends de cache (chaves agrupadas por namespace)"""
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, namespace: str) -> None:
+        raise NotImplementedError
+
+class NullCacheBackend(CacheBackend):
+    """Backend que não guarda nada (cache desativada)"""
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        pass
+
+    def invalidate(self, namespace: str) -> None:
+        pass
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU limitado em número de entradas e em bytes, com expiração por TTL"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 60.0,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, entry_key: tuple) -> None:
+        _, value = self._entries.pop(entry_key)
+        self._bytes -= len(value)
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove((namespace, key))
+                return None
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        with self._lock:
+            if (namespace, key) in self._entries:
+                self._remove((namespace, key))
+            if len(value) > self.max_entry_bytes:
+                # Respostas muito grandes não são guardadas
+                return
+            self._entries[(namespace, key)] = (time.monotonic() + self.ttl, value)
+            self._bytes += len(value)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                self._remove(entry_key)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total em bytes das respostas guardadas"""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class FileCacheBackend(CacheBackend):
+    """
+    Cache partilhada num diretório (um subdiretório por namespace)
+
+    Serve de backend partilhado local: todos os processos que usam o mesmo
+    diretório veem as mesmas entradas. As escritas são atómicas (ficheiro
+    temporário + rename) e a expiração usa a data de modificação.
+
+    Depois de cada processo escrever max_bytes / 4, percorre o diretório:
+    remove as entradas expiradas e, acima de max_bytes, as mais antigas.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = 60.0,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self._written = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _namespace_dir(self, namespace: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(namespace.encode('utf-8')).hexdigest()[:32])
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self._namespace_dir(namespace), hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        path = self._path(namespace, key)
+        try:
+            if os.path.getmtime(path) + self.ttl <= time.time():
+                os.remove(path)
+                return None
+            with open(path, 'rb') as cache_file:
+                return cache_file.read()
+        except OSError:
+            return None
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        if len(value) > self.max_entry_bytes:
+            # Respostas muito grandes não são guardadas (nem fica a versão anterior)
+            try:
+                os.remove(self._path(namespace, key))
+            except OSError:
+                pass
+            return
+        directory = self._namespace_dir(namespace)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as cache_file:
+                cache_file.write(value)
+            os.replace(tmp_path, self._path(namespace, key))
+        except OSError:
+            # Uma falha da cache nunca deve falhar o pedido
+            return
+
+        with self._lock:
+            self._written += len(value)
+            if self._written < self.max_bytes // 4:
+                return
+            self._written = 0
+        self.cleanup()
+
+    def cleanup(self) -> int:
+        """
+        Remove as entradas expiradas e as mais antigas até caber em max_bytes
+
+        Returns:
+            int: Total em bytes das entradas que ficaram
+        """
+        now = time.time()
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    if stat.st_mtime + self.ttl <= now:
+                        os.remove(path)
+                        continue
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        return total
+
+    def invalidate(self, namespace: str) -> None:
+        shutil.rmtree(self._namespace_dir(namespace), ignore_errors=True)
+
+class ResponseCache:
+    """Cache de respostas com contadores de hits, misses e invalidações"""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        """Devolve a resposta guardada ou None (contabiliza hit/miss)"""
+        value = self.backend.get(namespace, key)
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        """Guarda uma resposta serializada"""
+        self.backend.set(namespace, key, value)
+
+    def invalidate(self, namespace: str) -> None:
+        """Remove todas as entradas de um namespace (ex: de um utilizador)"""
+        self.backend.invalidate(namespace)
+        self._count('invalidations')
+
+    def stats(self) -> Dict[str, object]:
+        """Contadores deste processo e taxa de acerto"""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_ratio'] = round(counters['hits'] / lookups, 4) if lookups else None
+        counters['backend'] = type(self.backend).__name__
+        if isinstance(self.backend, MemoryCacheBackend):
+            counters['entries'] = len(self.backend)
+            counters['bytes'] = self.backend.size_bytes
+        return counters
+
+def create_cache_backend(config) -> CacheBackend:
+    """
+    Cria o backend configurado em TASK_CACHE_BACKEND
+
+    Args:
+        config: Configuração da aplicação
+
+    Returns:
+        CacheBackend: Backend de cache
+
+    Raises:
+        ValueError: Se o backend não for suportado
+    """
+    name = config.get('TASK_CACHE_BACKEND', 'memory')
+    ttl = config.get('TASK_CACHE_TTL', 60)
+
+    max_bytes = config.get('TASK_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+    max_entry_bytes = config.get('TASK_CACHE_MAX_ENTRY_BYTES', DEFAULT_MAX_ENTRY_BYTES)
+
+    if name == 'memory':
+        return MemoryCacheBackend(config.get('TASK_CACHE_MAX_ENTRIES', 1024), ttl, max_bytes, max_entry_bytes)
+    if name == 'file':
+        directory = config.get('TASK_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'taskmanager-cache')
+        return FileCacheBackend(directory, ttl, max_bytes, max_entry_bytes)
+    if name == 'none':
+        return NullCacheBackend()
+    raise ValueError(f'TASK_CACHE_BACKEND não suportado: {name}')
+
+def setup_task_cache(app) -> ResponseCache:
+    """Regista a cache da listagem de tarefas na aplicação"""
+    cache = ResponseCache(create_cache_backend(app.config))
+    app.extensions[TASK_LIST_CACHE_EXTENSION] = cache
+    return cache
+
+def get_task_list_cache() -> ResponseCache:
+    """Devolve a cache da listagem de tarefas da aplicação atual"""
+    cache = current_app.extensions.get(TASK_LIST_CACHE_EXTENSION)
+    if cache is None:
+        cache = setup_task_cache(current_app)
+    return cache
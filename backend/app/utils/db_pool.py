@@ -0,0 +1,146 @@
+"""Pool de ligações à base de dados dimensionado e instrumentado
+
+Cada worker do Gunicorn tem o seu pool; por omissão uma ligação por thread
+(GUNICORN_THREADS), mais DB_MAX_OVERFLOW ligações extra para picos. Com
+SQLite as opções não se aplicam (o Flask-SQLAlchemy escolhe o pool).
+
+InstrumentedQueuePool mede o tempo que cada pedido espera por uma ligação
+livre, separado do tempo de abrir ligações novas: espera acumulada com as
+threads livres indica pedidos em fila para a BD e não para o Gunicorn.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+DB_POOL_METRICS_EXTENSION = 'db_pool_metrics'
+# Esperas acima disto contam como pedido em fila (abaixo é o custo do lock)
+WAIT_THRESHOLD = 0.001
+
+class PoolMetrics:
+    """Contadores do pool de ligações (por worker)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            'checkouts': 0, 'waited': 0, 'timeouts': 0,
+            'overflows': 0, 'connects': 0, 'invalidations': 0
+        }
+        self._wait_seconds = 0.0
+        self._max_wait = 0.0
+        self._peak_in_use = 0
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def record_checkout(self, wait: float, in_use: int) -> None:
+        """Regista uma ligação obtida após `wait` segundos em fila"""
+        with self._lock:
+            self._counters['checkouts'] += 1
+            self._wait_seconds += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._peak_in_use = max(self._peak_in_use, in_use)
+            if wait >= WAIT_THRESHOLD:
+                self._counters['waited'] += 1
+
+    def record_timeout(self, wait: float) -> None:
+        """Regista um pedido que desistiu (pool_timeout) sem obter ligação"""
+        with self._lock:
+            self._counters['timeouts'] += 1
+            self._wait_seconds += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def stats(self, pool: QueuePool) -> Dict[str, Any]:
+        """Estado atual do pool e contadores deste processo"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            checkouts, wait_seconds = self._counters['checkouts'], self._wait_seconds
+            stats['avg_wait_ms'] = round(wait_seconds / checkouts * 1000, 2) if checkouts else None
+            stats['max_wait_ms'] = round(self._max_wait * 1000, 2)
+            stats['peak_in_use'] = self._peak_in_use
+        stats['pool_size'] = pool.size()
+        stats['in_use'] = pool.checkedout()
+        stats['idle'] = pool.checkedin()
+        # Negativo enquanto o pool ainda não abriu pool_size ligações
+        stats['overflow'] = max(pool.overflow(), 0)
+        return stats
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que regista a espera por ligação, overflow e timeouts"""
+
+    metrics: Optional[PoolMetrics] = None
+    # Tempo a abrir ligações durante o checkout atual (não conta como espera)
+    _local = threading.local()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        self._local.connect_seconds = 0.0
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        if self.metrics is not None:
+            wait = time.perf_counter() - started - self._local.connect_seconds
+            self.metrics.record_checkout(max(wait, 0.0), self.checkedout())
+        return record
+
+    def _create_connection(self):
+        if self.metrics is not None and self._overflow > 0:
+            # Ligação além de pool_size (max_overflow)
+            self.metrics.count('overflows')
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            self._local.connect_seconds = getattr(self._local, 'connect_seconds', 0.0) + (
+                time.perf_counter() - started
+            )
+
+    def recreate(self) -> 'InstrumentedQueuePool':
+        # dispose() (ex: após o fork) cria um pool novo: os contadores continuam
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+def configure_engine_options(app) -> None:
+    """
+    Define SQLALCHEMY_ENGINE_OPTIONS a partir de DB_POOL_* (exceto SQLite)
+
+    Opções já definidas em SQLALCHEMY_ENGINE_OPTIONS têm precedência.
+    """
+    if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        return
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': app.config.get('DB_POOL_SIZE', 2),
+        'max_overflow': app.config.get('DB_MAX_OVERFLOW', 2),
+        'pool_timeout': app.config.get('DB_POOL_TIMEOUT', 10),
+        'pool_recycle': app.config.get('DB_POOL_RECYCLE', 300),
+        'pool_pre_ping': app.config.get('DB_POOL_PRE_PING', True)
+    }
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+def instrument_pool(pool: InstrumentedQueuePool) -> PoolMetrics:
+    """Liga os contadores e os listeners de eventos a um pool"""
+    metrics = PoolMetrics()
+    pool.metrics = metrics
+    # Os listeners passam para os pools recriados (dispatch partilhado)
+    event.listen(pool, 'connect', lambda *args: metrics.count('connects'))
+    event.listen(pool, 'invalidate', lambda *args: metrics.count('invalidations'))
+    return metrics
+
+def setup_pool_metrics(app, db) -> Optional[PoolMetrics]:
+    """Regista as métricas do pool da aplicação (None se não for InstrumentedQueuePool)"""
+    with app.app_context():
+        pool = db.engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return None
+    metrics = instrument_pool(pool)
+    app.extensions[DB_POOL_METRICS_EXTENSION] = metrics
+    return metrics
@@ -1,7 +1,8 @@
 from functools import wraps
 from flask import jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.models.user import User
+from app.utils.principal import Principal, user_exists
 from app import db
 
 def get_current_user():
@@ -9,14 +10,23 @@ def get_current_user():
     user_id = get_jwt_identity()
     return User.query.get(user_id)
 
+def get_current_principal() -> Principal:
+    """Constrói o utilizador autenticado a partir das claims do token (sem BD)"""
+    return Principal(get_jwt_identity(), get_jwt().get('username'))
+
 def require_auth(f):
-    """Decorator para rotas que requerem autenticação"""
+    """
+    Decorator para rotas que requerem autenticação
+    
+    A rota recebe um Principal construído a partir do token. A existência
+    da conta é confirmada pela cache de utilizadores (sem BD quando está em
+    cache); um token de uma conta eliminada recebe 404.
+    """
     @wraps(f)
     @jwt_required()
     def decorated_function(*args, **kwargs):
-        current_user = get_current_user()
-        if not current_user:
+        current_user = get_current_principal()
+        if not user_exists(current_user.id):
             return jsonify({'message': 'Utilizador não encontrado'}), 404
         return f(current_user, *args, **kwargs)
     return decorated_function
-
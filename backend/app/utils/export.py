@@ -0,0 +1,87 @@
+"""Serialização incremental de tarefas para exportação (NDJSON e CSV)
+
+Os writers recebem linhas (tuplos pela ordem de TASK_FIELDS) lidas sem ORM
+por TaskService.iter_user_task_rows.
+"""
+import csv
+import io
+from typing import Any, Iterable, Iterator, Sequence, Tuple
+
+from app.utils.serializers import TASK_FIELDS, compile_task_encoder, encode_task_row_ndjson
+
+EXPORT_FIELDS = list(TASK_FIELDS)
+
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+# Número de linhas agrupadas em cada bloco escrito na resposta
+CHUNK_ROWS = 200
+
+def iter_ndjson(
+    rows: Iterable[Sequence[Any]],
+    chunk_rows: int = CHUNK_ROWS,
+    fields: Tuple[str, ...] = TASK_FIELDS
+) -> Iterator[str]:
+    """
+    Serializa tarefas em NDJSON (um objeto JSON por linha)
+
+    Args:
+        rows: Iterável de linhas de tarefas (colunas pela ordem de fields)
+        chunk_rows: Linhas por bloco devolvido
+        fields: Campos exportados
+
+    Yields:
+        str: Blocos de texto NDJSON
+    """
+    encode = encode_task_row_ndjson if fields == TASK_FIELDS else compile_task_encoder(fields, ndjson=True)
+    lines = []
+    for row in rows:
+        lines.append(encode(row))
+        if len(lines) >= chunk_rows:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def iter_csv(
+    rows: Iterable[Sequence[Any]],
+    chunk_rows: int = CHUNK_ROWS,
+    fields: Tuple[str, ...] = TASK_FIELDS
+) -> Iterator[str]:
+    """
+    Serializa tarefas em CSV com linha de cabeçalho
+
+    Args:
+        rows: Iterável de linhas de tarefas (colunas pela ordem de fields)
+        chunk_rows: Linhas por bloco devolvido
+        fields: Campos exportados (colunas do CSV)
+
+    Yields:
+        str: Blocos de texto CSV
+    """
+    dates = [index for index, field in enumerate(fields) if field in ('created_at', 'updated_at')]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    written = 0
+    for row in rows:
+        values = list(row[:len(fields)])
+        # Datas em ISO 8601, como em Task.to_dict
+        for index in dates:
+            if values[index] is not None:
+                values[index] = values[index].isoformat()
+        writer.writerow(values)
+        written += 1
+        if written >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            written = 0
+    yield buffer.getvalue()
+
+EXPORT_WRITERS = {
+    'ndjson': iter_ndjson,
+    'csv': iter_csv
+}
@@ -0,0 +1,194 @@
+"""Executor dedicado para hash e verificação de palavras-passe (bcrypt)
+
+O bcrypt ocupa o CPU durante centenas de milissegundos. Executá-lo num pool
+de processos separado deixa as threads do Gunicorn livres para o resto da
+API; a fila é limitada e, quando está cheia, o pedido falha de imediato com
+503 + Retry-After em vez de ficar à espera.
+
+AUTH_HASH_POOL_SIZE=0 (padrão) executa o bcrypt na própria thread. É o modo
+indicado para instâncias pequenas: cada worker do Gunicorn cria o seu pool,
+pelo que AUTH_HASH_POOL_SIZE=N acrescenta GUNICORN_WORKERS × N interpretadores
+(cada um com o passlib carregado) à memória da instância. Nos dois modos, cada
+worker aceita no máximo max(AUTH_HASH_POOL_SIZE, 1) + AUTH_HASH_QUEUE_SIZE
+operações bcrypt em simultâneo; acima disso responde 503 + Retry-After. Em
+modo inline não há timeout: o hash já em curso não pode ser interrompido.
+"""
+import os
+import threading
+# BrokenExecutor inclui o BrokenProcessPool sem importar concurrent.futures.process
+from concurrent.futures import BrokenExecutor, TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from flask import current_app
+
+from app.exceptions.custom_exceptions import ServiceUnavailableException
+from app.utils.security import (
+    DEFAULT_BCRYPT_ROUNDS,
+    get_crypt_context,
+    get_password_hash,
+    verify_and_update_password
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+HASHING_POOL_EXTENSION = 'hashing_pool'
+
+def _prepare_process(rounds: int) -> None:
+    """Carrega o passlib e o contexto bcrypt num processo do pool"""
+    get_crypt_context(rounds)
+
+class HashingPool:
+    """Pool de processos com fila limitada para operações bcrypt"""
+
+    def __init__(self, pool_size: int = 0, queue_size: int = 4, timeout: float = 10.0, retry_after: int = 1):
+        self.pool_size = pool_size
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        # Operações em execução + em espera
+        self._slots = threading.BoundedSemaphore(max(pool_size, 1) + queue_size)
+        self._lock = threading.Lock()
+        self._executor: Optional['ProcessPoolExecutor'] = None
+        self._executor_pid: Optional[int] = None
+        self._counters = {'completed': 0, 'rejected': 0, 'timeouts': 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _get_executor(self) -> 'ProcessPoolExecutor':
+        """Cria o pool no processo atual (cada worker do Gunicorn tem o seu)"""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.pool_size,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        """Descarta um pool avariado (ex: processo filho terminado)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _unavailable(self, reason: str) -> ServiceUnavailableException:
+        return ServiceUnavailableException(
+            message="Serviço de autenticação sobrecarregado, tente novamente",
+            retry_after=self.retry_after,
+            details={"reason": reason}
+        )
+
+    def run(self, func: Callable, *args) -> Any:
+        """
+        Executa uma função de hashing no pool
+
+        Args:
+            func: Função ao nível do módulo (tem de ser serializável)
+            args: Argumentos da função
+
+        Returns:
+            Any: Resultado da função
+
+        Raises:
+            ServiceUnavailableException: Se a fila estiver cheia ou a operação exceder o timeout
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise self._unavailable('queue_full')
+
+        if self.pool_size <= 0:
+            try:
+                result = func(*args)
+                self._count('completed')
+                return result
+            finally:
+                self._slots.release()
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except (BrokenExecutor, RuntimeError):
+            self._slots.release()
+            self._reset_executor()
+            raise self._unavailable('pool_unavailable')
+
+        # O lugar só é libertado quando o processo termina (mesmo após timeout)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._count('timeouts')
+            raise self._unavailable('timeout')
+        except BrokenExecutor:
+            self._reset_executor()
+            raise self._unavailable('pool_unavailable')
+        self._count('completed')
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores deste processo"""
+        with self._lock:
+            stats = dict(self._counters)
+        stats['pool_size'] = self.pool_size
+        stats['queue_size'] = self.queue_size
+        return stats
+
+    def warm_up(self, rounds: int = DEFAULT_BCRYPT_ROUNDS) -> None:
+        """
+        Arranca os processos do pool antes do primeiro login
+
+        Sem isto, o primeiro login de cada worker paga o arranque de um
+        interpretador (spawn) e a importação do passlib. Não espera pelos
+        processos: arrancam em paralelo com os primeiros pedidos.
+        """
+        if self.pool_size <= 0:
+            return
+        executor = self._get_executor()
+        for _ in range(self.pool_size):
+            executor.submit(_prepare_process, rounds)
+
+    def shutdown(self) -> None:
+        """Termina os processos do pool"""
+        self._reset_executor()
+
+def setup_hashing_pool(app) -> HashingPool:
+    """Regista o pool de hashing na aplicação"""
+    pool = HashingPool(
+        pool_size=app.config.get('AUTH_HASH_POOL_SIZE', 0),
+        queue_size=app.config.get('AUTH_HASH_QUEUE_SIZE', 4),
+        timeout=app.config.get('AUTH_HASH_TIMEOUT', 10),
+        retry_after=app.config.get('AUTH_HASH_RETRY_AFTER', 1)
+    )
+    app.extensions[HASHING_POOL_EXTENSION] = pool
+    return pool
+
+def get_hashing_pool() -> HashingPool:
+    """Devolve o pool de hashing da aplicação atual"""
+    pool = current_app.extensions.get(HASHING_POOL_EXTENSION)
+    if pool is None:
+        pool = setup_hashing_pool(current_app)
+    return pool
+
+def _bcrypt_rounds() -> int:
+    return current_app.config.get('BCRYPT_ROUNDS', DEFAULT_BCRYPT_ROUNDS)
+
+def hash_password(password: str) -> str:
+    """Gera o hash da palavra-passe no pool de hashing (custo BCRYPT_ROUNDS)"""
+    return get_hashing_pool().run(get_password_hash, password, _bcrypt_rounds())
+
+def check_password_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a palavra-passe no pool de hashing
+
+    Returns:
+        Tuple[bool, Optional[str]]: (válida, novo hash se o custo mudou)
+    """
+    return get_hashing_pool().run(
+        verify_and_update_password, plain_password, hashed_password, _bcrypt_rounds()
+    )
@@ -0,0 +1,139 @@
+"""Verificação de prontidão (readiness) com o resultado da BD em cache
+
+Um sondador agressivo (uptime monitor, load balancer) não deve gerar uma
+query por pedido nem ocupar ligações do pool. A verificação da BD é uma só
+query (SELECT à alembic_version: ligação + estado das migrações), feita no
+máximo uma vez por READINESS_CACHE_TTL segundos em cada worker; as
+restantes threads usam o mesmo resultado.
+
+O estado do pool (saturação) é lido em memória em cada pedido, sem I/O.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import exc, text
+from sqlalchemy.pool import QueuePool
+
+from app import db
+
+READINESS_PROBE_EXTENSION = 'readiness_probe'
+
+class ReadinessProbe:
+    """Resultado da verificação da BD, partilhado pelas threads durante um TTL"""
+
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._head_revision: Optional[str] = None
+        self._head_loaded = False
+        self._counters = {'probes': 0, 'cache_hits': 0}
+
+    def head_revision(self) -> Optional[str]:
+        """Revisão mais recente em migrations/ (lida uma vez; None se indisponível)"""
+        if not self._head_loaded:
+            from app.utils.migrations import get_head_revision
+
+            try:
+                self._head_revision = get_head_revision()
+            except Exception:
+                self._head_revision = None
+            self._head_loaded = True
+        return self._head_revision
+
+    def _probe(self) -> Dict[str, Any]:
+        """Uma ida à BD: abre (ou reutiliza) uma ligação e lê a revisão aplicada"""
+        started = time.perf_counter()
+        try:
+            with db.engine.connect() as connection:
+                try:
+                    revision = connection.execute(text('SELECT version_num FROM alembic_version')).scalar()
+                except exc.DBAPIError:
+                    # Ligação funciona, mas a base de dados não está versionada
+                    revision = None
+        except Exception as e:
+            return {
+                'database': {'status': 'disconnected', 'error': str(e)},
+                'migrations': None
+            }
+
+        head = self.head_revision()
+        return {
+            'database': {
+                'status': 'connected',
+                'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+            },
+            'migrations': {
+                'current': revision,
+                'head': head,
+                'up_to_date': revision is not None and (head is None or revision == head)
+            }
+        }
+
+    def check(self, refresh: bool = True) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """
+        Devolve o resultado da verificação da BD e a sua idade (segundos)
+
+        Só uma thread verifica de cada vez. As outras esperam por ela apenas
+        se ainda não houver resultado; caso contrário usam o anterior.
+
+        Args:
+            refresh: False para não ir à BD (ex: pool saturado), mesmo com cache expirada
+
+        Returns:
+            Tuple: (resultado ou None se nunca verificado, idade em segundos)
+        """
+        now = time.monotonic()
+        result = self._result
+        if result is not None and (not refresh or now - self._checked_at < self.ttl):
+            self._counters['cache_hits'] += 1
+            return result, now - self._checked_at
+        if not refresh:
+            return None, None
+
+        if not self._lock.acquire(blocking=result is None):
+            self._counters['cache_hits'] += 1
+            return result, now - self._checked_at
+        try:
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                self._result = self._probe()
+                self._checked_at = time.monotonic()
+                self._counters['probes'] += 1
+            else:
+                self._counters['cache_hits'] += 1
+            return self._result, time.monotonic() - self._checked_at
+        finally:
+            self._lock.release()
+
+    def stats(self) -> Dict[str, int]:
+        """Verificações à BD e respostas servidas da cache neste processo"""
+        return dict(self._counters)
+
+def pool_saturation(pool) -> Optional[Dict[str, Any]]:
+    """
+    Ocupação do pool de ligações (sem I/O)
+
+    Returns:
+        dict ou None se o pool não tiver limite (ex: SQLite em memória)
+    """
+    if not isinstance(pool, QueuePool):
+        return None
+    max_overflow = getattr(pool, '_max_overflow', 0)
+    in_use = pool.checkedout()
+    if max_overflow < 0:
+        return {'in_use': in_use, 'capacity': None, 'saturation': None, 'saturated': False}
+    capacity = pool.size() + max_overflow
+    return {
+        'in_use': in_use,
+        'capacity': capacity,
+        'saturation': round(in_use / capacity, 2) if capacity else None,
+        'saturated': in_use >= capacity
+    }
+
+def setup_readiness_probe(app) -> ReadinessProbe:
+    """Regista a verificação de prontidão (READINESS_CACHE_TTL)"""
+    probe = ReadinessProbe(ttl=app.config.get('READINESS_CACHE_TTL', 5))
+    app.extensions[READINESS_PROBE_EXTENSION] = probe
+    return probe
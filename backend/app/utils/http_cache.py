@@ -0,0 +1,59 @@
+"""Utilitários para ETags e pedidos condicionais (If-None-Match)"""
+import hashlib
+from typing import Optional
+
+from flask import Response, request
+
+# Os clientes guardam a resposta mas revalidam-na sempre com o servidor
+CACHE_CONTROL = 'private, no-cache'
+
+# Codificações que o middleware de compressão acrescenta à ETag
+ENCODED_ETAG_ENCODINGS = ('br', 'gzip')
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag da variante comprimida de uma representação"""
+    return f'{etag}-{encoding}'
+
+def build_etag(user_id: int, version: int, *parts: str) -> str:
+    """
+    Gera a ETag (forte) de uma representação das tarefas de um utilizador
+
+    Args:
+        user_id: ID do utilizador
+        version: Versão das tarefas do utilizador
+        parts: Componentes que distinguem a representação (rota, parâmetros)
+
+    Returns:
+        str: Valor da ETag sem aspas
+    """
+    digest = hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()[:16]
+    return f'u{user_id}-v{version}-{digest}'
+
+def request_etag_parts() -> tuple:
+    """Componentes da ETag derivados do pedido atual (rota e query string)"""
+    return (request.path, request.query_string.decode('latin-1'))
+
+def not_modified_response(etag: str) -> Optional[Response]:
+    """
+    Devolve uma resposta 304 se o cliente já tiver a representação atual
+
+    Args:
+        etag: ETag atual da representação
+
+    Returns:
+        Optional[Response]: Resposta 304 ou None se for necessário responder com o corpo
+    """
+    candidates = [etag] + [encoded_etag(etag, encoding) for encoding in ENCODED_ETAG_ENCODINGS]
+    if not any(candidate in request.if_none_match for candidate in candidates):
+        return None
+
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Adiciona ETag e Cache-Control a uma resposta"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
@@ -0,0 +1,96 @@
+"""Utilitários para aplicar migrações Alembic a partir da aplicação"""
+import os
+
+from sqlalchemy import inspect
+
+from app import db
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, 'migrations')
+
+# Revisão que descreve o esquema criado por db.create_all() antes das migrações
+BASELINE_REVISION = '0001'
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """
+    Filtro do autogenerate: ignora objetos da pesquisa full-text
+
+    A coluna tsvector (PostgreSQL) e a tabela FTS5 (SQLite) são criadas por
+    DDL específico do dialeto e não constam do metadata dos modelos.
+    """
+    from app.models.task_search import is_search_object
+
+    return not (reflected and compare_to is None and is_search_object(name, type_))
+
+def get_alembic_config(connection=None):
+    """
+    Cria a configuração do Alembic apontando para migrations/
+
+    Args:
+        connection: Conexão SQLAlchemy a reutilizar (opcional)
+
+    Returns:
+        alembic.config.Config: Configuração do Alembic
+    """
+    from alembic.config import Config as AlembicConfig
+
+    alembic_cfg = AlembicConfig(os.path.join(BACKEND_DIR, 'alembic.ini'))
+    alembic_cfg.set_main_option('script_location', MIGRATIONS_DIR)
+    alembic_cfg.attributes['configure_logger'] = False
+    if connection is not None:
+        alembic_cfg.attributes['connection'] = connection
+    return alembic_cfg
+
+def get_head_revision() -> str:
+    """Devolve a revisão mais recente disponível em migrations/versions"""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+def get_current_revision(connection) -> str:
+    """
+    Devolve a revisão aplicada à base de dados
+
+    Args:
+        connection: Conexão SQLAlchemy aberta
+
+    Returns:
+        str: Revisão atual ou None se a base de dados não estiver versionada
+    """
+    from alembic.runtime.migration import MigrationContext
+
+    return MigrationContext.configure(connection).get_current_revision()
+
+def upgrade_database(revision: str = 'head') -> None:
+    """
+    Aplica as migrações pendentes (requer contexto da aplicação)
+
+    Bases de dados criadas com db.create_all() antes das migrações não têm
+    tabela alembic_version: são marcadas na revisão base antes do upgrade.
+
+    Args:
+        revision: Revisão alvo
+    """
+    from alembic import command
+
+    with db.engine.begin() as connection:
+        alembic_cfg = get_alembic_config(connection)
+        tables = inspect(connection).get_table_names()
+        if 'alembic_version' not in tables and 'tasks' in tables:
+            command.stamp(alembic_cfg, BASELINE_REVISION)
+        command.upgrade(alembic_cfg, revision)
+
+def stamp_database(revision: str = 'head') -> None:
+    """
+    Marca uma base de dados não versionada numa revisão (requer contexto da aplicação)
+
+    Usado após db.create_all(), que já cria o esquema mais recente.
+
+    Args:
+        revision: Revisão a marcar
+    """
+    from alembic import command
+
+    with db.engine.begin() as connection:
+        if get_current_revision(connection) is None:
+            command.stamp(get_alembic_config(connection), revision)
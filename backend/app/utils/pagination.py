@@ -0,0 +1,123 @@
+"""Utilitários de paginação por cursor (keyset pagination) e tokens de sincronização"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from app.exceptions.custom_exceptions import ValidationException
+
+def _invalid_cursor(cursor: str) -> ValidationException:
+    """Cria a exceção de cursor inválido"""
+    return ValidationException(
+        message="Cursor de paginação inválido",
+        details={"cursor": cursor}
+    )
+
+def encode_cursor(sort_key: str, sort_value: Any, row_id: int) -> str:
+    """
+    Codifica a posição da última linha de uma página num cursor opaco
+
+    Args:
+        sort_key: Nome da ordenação (ex: "created_at:desc")
+        sort_value: Valor da coluna de ordenação da última linha
+        row_id: ID da última linha (desempate)
+
+    Returns:
+        str: Cursor em base64 url-safe
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = {'dt': sort_value.isoformat()}
+    payload = json.dumps([sort_key, sort_value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, sort_key: str) -> Tuple[Any, int]:
+    """
+    Descodifica um cursor opaco gerado por encode_cursor
+
+    Args:
+        cursor: Cursor recebido do cliente
+        sort_key: Ordenação do pedido atual (tem de coincidir com a do cursor)
+
+    Returns:
+        Tuple[Any, int]: Valor de ordenação e ID da última linha
+
+    Raises:
+        ValidationException: Se o cursor for inválido ou de outra ordenação
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_key, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if isinstance(sort_value, dict):
+            sort_value = datetime.fromisoformat(sort_value['dt'])
+    except (ValueError, TypeError, KeyError, binascii.Error, UnicodeError):
+        raise _invalid_cursor(cursor)
+
+    if cursor_key != sort_key or not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise _invalid_cursor(cursor)
+
+    return sort_value, row_id
+
+def _encode_position(position: Optional[Tuple[datetime, int]]) -> Optional[list]:
+    """Serializa uma posição (data, id) de um token de sincronização"""
+    if position is None:
+        return None
+    return [position[0].isoformat(), position[1]]
+
+def _decode_position(value: Any) -> Optional[Tuple[datetime, int]]:
+    """Descodifica uma posição (data, id) de um token de sincronização"""
+    if value is None:
+        return None
+    timestamp, row_id = value
+    if not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise ValueError('id inválido')
+    return datetime.fromisoformat(timestamp), row_id
+
+def encode_sync_token(
+    task_position: Optional[Tuple[datetime, int]],
+    tombstone_position: Tuple[datetime, int]
+) -> str:
+    """
+    Codifica o ponto de sincronização de um cliente num token opaco
+
+    O token guarda duas posições independentes: a última alteração de
+    tarefa entregue (updated_at, id) e a última eliminação (deleted_at, id).
+
+    Args:
+        task_position: Última tarefa entregue (None = desde o início)
+        tombstone_position: Última eliminação entregue
+
+    Returns:
+        str: Token em base64 url-safe
+    """
+    payload = json.dumps({
+        't': _encode_position(task_position),
+        'd': _encode_position(tombstone_position)
+    }, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_sync_token(token: str) -> Tuple[Optional[Tuple[datetime, int]], Tuple[datetime, int]]:
+    """
+    Descodifica um token gerado por encode_sync_token
+
+    Args:
+        token: Token recebido do cliente
+
+    Returns:
+        Tuple: Posição das tarefas e posição das eliminações
+
+    Raises:
+        ValidationException: Se o token for inválido
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        tombstone_position = _decode_position(payload['d'])
+        if tombstone_position is None:
+            raise ValueError('posição de eliminações em falta')
+        return _decode_position(payload['t']), tombstone_position
+    except (ValueError, TypeError, KeyError, binascii.Error, UnicodeError):
+        raise ValidationException(
+            message="Token de sincronização inválido",
+            details={"since": token}
+        )
@@ -0,0 +1,166 @@
+"""Utilizador autenticado construído a partir do token JWT (sem ir à BD)
+
+As rotas recebem um Principal com o id (e username) das claims do token.
+require_auth confirma que a conta existe através de uma cache limitada (só
+vai à BD num miss); Principal.user lê os restantes dados da mesma cache. A
+cache é invalidada depois do commit que altera ou elimina a conta pelo ORM.
+
+Com AUTH_USER_CACHE_BACKEND=memory (por omissão) a cache é de cada worker e
+a invalidação só chega ao worker que fez a alteração: os outros podem
+servir os dados anteriores (ou uma conta já eliminada) durante até
+AUTH_USER_CACHE_TTL segundos. Com AUTH_USER_CACHE_BACKEND=file a cache fica
+num diretório partilhado pelos workers e a invalidação chega a todos.
+"""
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models.user import User
+from app.utils.cache import CacheBackend, FileCacheBackend, MemoryCacheBackend, NullCacheBackend
+
+USER_CACHE_EXTENSION = 'user_cache'
+_USER_CACHE_KEY = 'user'
+# Contas alteradas na transação da sessão (Session.info), invalidadas no commit
+_CHANGED_USERS_KEY = 'changed_user_ids'
+
+class UserRecord(NamedTuple):
+    """Cópia imutável das colunas públicas de um utilizador"""
+    id: int
+    username: str
+    email: str
+    created_at: Optional[datetime]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converter para dicionário (igual a User.to_dict)"""
+        return {
+            'id': self.id,
+            'username': self.username,
+            'email': self.email,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    def encode(self) -> bytes:
+        """Serializa para guardar na cache"""
+        return json.dumps(self.to_dict()).encode('utf-8')
+
+    @classmethod
+    def decode(cls, value: bytes) -> 'UserRecord':
+        """Reconstrói a partir do valor guardado na cache"""
+        data = json.loads(value)
+        created_at = data['created_at']
+        return cls(
+            data['id'], data['username'], data['email'],
+            datetime.fromisoformat(created_at) if created_at else None
+        )
+
+class Principal:
+    """Utilizador autenticado de um pedido, a partir das claims do token"""
+
+    __slots__ = ('id', 'username')
+
+    def __init__(self, user_id: int, username: Optional[str] = None):
+        self.id = user_id
+        self.username = username
+
+    @property
+    def user(self) -> Optional[UserRecord]:
+        """Dados do utilizador (cache ou BD); None se a conta já não existir"""
+        return get_cached_user(self.id)
+
+    def __repr__(self):
+        return f'<Principal {self.id}>'
+
+def setup_user_cache(app) -> CacheBackend:
+    """
+    Regista a cache de utilizadores (AUTH_USER_CACHE_TTL=0 desativa)
+
+    Raises:
+        ValueError: Se AUTH_USER_CACHE_BACKEND não for suportado
+    """
+    ttl = app.config.get('AUTH_USER_CACHE_TTL', 60)
+    backend = app.config.get('AUTH_USER_CACHE_BACKEND', 'memory')
+    if ttl <= 0:
+        cache = NullCacheBackend()
+    elif backend == 'memory':
+        cache = MemoryCacheBackend(app.config.get('AUTH_USER_CACHE_MAX_ENTRIES', 1024), ttl)
+    elif backend == 'file':
+        directory = app.config.get('TASK_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'taskmanager-cache')
+        # Subdiretório próprio: os namespaces (ids) são os mesmos da cache de tarefas
+        cache = FileCacheBackend(os.path.join(directory, 'users'), ttl)
+    else:
+        raise ValueError(f'AUTH_USER_CACHE_BACKEND não suportado: {backend}')
+    app.extensions[USER_CACHE_EXTENSION] = cache
+    return cache
+
+def _user_cache() -> CacheBackend:
+    cache = current_app.extensions.get(USER_CACHE_EXTENSION)
+    if cache is None:
+        cache = setup_user_cache(current_app)
+    return cache
+
+def get_cached_user(user_id: int) -> Optional[UserRecord]:
+    """
+    Devolve os dados de um utilizador, lendo a BD só em caso de miss
+
+    Args:
+        user_id: ID do utilizador
+
+    Returns:
+        Optional[UserRecord]: Dados do utilizador ou None se não existir
+    """
+    cache = _user_cache()
+    value = cache.get(str(user_id), _USER_CACHE_KEY)
+    if value is not None:
+        return UserRecord.decode(value)
+
+    row = db.session.execute(
+        select(User.id, User.username, User.email, User.created_at).where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+
+    record = UserRecord(*row)
+    cache.set(str(user_id), _USER_CACHE_KEY, record.encode())
+    return record
+
+def user_exists(user_id: int) -> bool:
+    """Confirma que a conta existe (só lê a BD se não estiver em cache)"""
+    if _user_cache().get(str(user_id), _USER_CACHE_KEY) is not None:
+        return True
+    return get_cached_user(user_id) is not None
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Remove um utilizador da cache (conta alterada ou eliminada)"""
+    if has_app_context():
+        _user_cache().invalidate(str(user_id))
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _collect_changed_user(mapper, connection, target):
+    """
+    Regista a conta alterada ou eliminada pelo ORM
+
+    Corre no flush, antes do commit: invalidar aqui deixaria outro pedido
+    voltar a pôr na cache a linha antiga ainda confirmada.
+    """
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS_KEY, set()).add(target.id)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    """Invalida a cache das contas alteradas depois de a transação ser confirmada"""
+    for user_id in session.info.pop(_CHANGED_USERS_KEY, ()):
+        invalidate_cached_user(user_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    """Alterações revertidas: a cache continua válida"""
+    session.info.pop(_CHANGED_USERS_KEY, None)
@@ -1,16 +1,57 @@
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Tuple
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=12
-)
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+DEFAULT_BCRYPT_ROUNDS = 12
+
+@lru_cache(maxsize=8)
+def get_crypt_context(rounds: int = DEFAULT_BCRYPT_ROUNDS) -> 'CryptContext':
+    """
+    Contexto bcrypt para um custo (BCRYPT_ROUNDS)
+
+    min_rounds e max_rounds iguais ao custo fazem com que needs_update
+    assinale qualquer hash com outro custo, para ser refeito no login.
+    O passlib só é importado aqui, no primeiro hash ou verificação, e não
+    no arranque da aplicação.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds
+    )
+
+def get_pwd_context() -> 'CryptContext':
+    """Contexto bcrypt com o custo padrão, criado no primeiro uso"""
+    return get_crypt_context()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a palavra-passe fornecida corresponde ao hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def get_password_hash(password: str, rounds: int = DEFAULT_BCRYPT_ROUNDS) -> str:
+    """Gera hash da palavra-passe com o custo indicado"""
+    return get_crypt_context(rounds).hash(password)
+
+def password_needs_update(hashed_password: str, rounds: int = DEFAULT_BCRYPT_ROUNDS) -> bool:
+    """Indica se o hash foi gerado com um custo diferente do atual"""
+    return get_crypt_context(rounds).needs_update(hashed_password)
 
-def get_password_hash(password: str) -> str:
-    """Gera hash da palavra-passe"""
-    return pwd_context.hash(password)
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str,
+    rounds: int = DEFAULT_BCRYPT_ROUNDS
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a palavra-passe e, se o custo do hash estiver desatualizado,
+    gera um novo hash com o custo atual
 
+    Returns:
+        Tuple[bool, Optional[str]]: (válida, novo hash ou None)
+    """
+    return get_crypt_context(rounds).verify_and_update(plain_password, hashed_password)
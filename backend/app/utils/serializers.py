@@ -0,0 +1,194 @@
+"""Serialização rápida de linhas de tarefas (sem ORM) para JSON
+
+As linhas vêm de um SELECT de colunas (TASK_FIELDS, pela ordem de
+Task.to_dict) e são codificadas com templates pré-compilados e com os
+codificadores de strings em C do módulo json. O resultado é byte a byte
+igual ao de jsonify(task.to_dict()) com o fornecedor JSON por omissão do
+Flask (chaves ordenadas, ensure_ascii, separadores compactos).
+"""
+from datetime import datetime
+from functools import lru_cache
+from json import encoder
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+# Ordem das colunas selecionadas (igual à de Task.to_dict)
+TASK_FIELDS = ('id', 'title', 'description', 'completed', 'created_at', 'updated_at', 'user_id')
+
+_encode_ascii = encoder.encode_basestring_ascii
+_encode_unicode = encoder.encode_basestring
+
+# jsonify: chaves ordenadas e separadores compactos
+_COMPACT_TASK = (
+    '{"completed":%s,"created_at":%s,"description":%s,"id":%d,'
+    '"title":%s,"updated_at":%s,"user_id":%d}'
+)
+# NDJSON do export: ordem de to_dict e separadores por omissão de json.dumps
+_NDJSON_TASK = (
+    '{"id": %d, "title": %s, "description": %s, "completed": %s, '
+    '"created_at": %s, "updated_at": %s, "user_id": %d}'
+)
+
+_NOT_SET = object()
+
+def _datetime(value: Optional[datetime]) -> str:
+    """Data em JSON, como em to_dict (isoformat ou null)"""
+    return 'null' if value is None else '"%s"' % value.isoformat()
+
+def _converters(encode_string: Callable[[str], str]) -> Dict[str, Callable[[Any], str]]:
+    """Conversores de cada campo para JSON, com o codificador de strings indicado"""
+    def string(value):
+        return 'null' if value is None else encode_string(value)
+    
+    def integer(value):
+        return 'null' if value is None else '%d' % value
+    
+    def boolean(value):
+        return 'true' if value else 'false'
+    
+    return {
+        'id': integer,
+        'title': string,
+        'description': string,
+        'completed': boolean,
+        'created_at': _datetime,
+        'updated_at': _datetime,
+        'user_id': integer
+    }
+
+_ASCII_CONVERTERS = _converters(_encode_ascii)
+_UNICODE_CONVERTERS = _converters(_encode_unicode)
+
+@lru_cache(maxsize=64)
+def compile_task_encoder(fields: Tuple[str, ...], ndjson: bool = False) -> Callable[[Sequence[Any]], str]:
+    """
+    Compila um codificador para um subconjunto de campos (?fields=)
+
+    O template e os conversores são calculados uma vez por conjunto de
+    campos; cada linha só faz a substituição no template.
+
+    Args:
+        fields: Campos pela ordem das colunas da linha
+        ndjson: Formato do export (ordem de to_dict, separadores de json.dumps
+            e sem ensure_ascii) em vez do de jsonify
+
+    Returns:
+        Callable: Função que codifica uma linha
+    """
+    if ndjson:
+        order = list(enumerate(fields))
+        separator, colon, converters = ', ', ': ', _UNICODE_CONVERTERS
+    else:
+        order = sorted(enumerate(fields), key=lambda item: item[1])
+        separator, colon, converters = ',', ':', _ASCII_CONVERTERS
+    
+    template = '{' + separator.join(f'"{name}"{colon}%s' for _, name in order) + '}'
+    steps = tuple((index, converters[name]) for index, name in order)
+    
+    def encode(row: Sequence[Any]) -> str:
+        return template % tuple(convert(row[index]) for index, convert in steps)
+    
+    return encode
+
+def encode_task_row(row: Sequence[Any]) -> str:
+    """
+    Codifica uma linha de tarefa como jsonify codificaria task.to_dict()
+
+    Args:
+        row: Valores pela ordem de TASK_FIELDS
+
+    Returns:
+        str: Objeto JSON compacto (ASCII)
+    """
+    task_id, title, description, completed, created_at, updated_at, user_id = row
+    return _COMPACT_TASK % (
+        'true' if completed else 'false',
+        _datetime(created_at),
+        'null' if description is None else _encode_ascii(description),
+        task_id,
+        _encode_ascii(title),
+        _datetime(updated_at),
+        user_id
+    )
+
+def encode_task_row_ndjson(row: Sequence[Any]) -> str:
+    """
+    Codifica uma linha de tarefa como json.dumps(task.to_dict(), ensure_ascii=False)
+
+    Args:
+        row: Valores pela ordem de TASK_FIELDS
+
+    Returns:
+        str: Objeto JSON numa linha (sem o fim de linha)
+    """
+    task_id, title, description, completed, created_at, updated_at, user_id = row
+    return _NDJSON_TASK % (
+        task_id,
+        _encode_unicode(title),
+        'null' if description is None else _encode_unicode(description),
+        'true' if completed else 'false',
+        _datetime(created_at),
+        _datetime(updated_at),
+        user_id
+    )
+
+def task_row_to_dict(row: Sequence[Any], fields: Tuple[str, ...] = TASK_FIELDS) -> Dict[str, Any]:
+    """
+    Converte uma linha de tarefa no mesmo dicionário de Task.to_dict
+
+    Args:
+        row: Valores pela ordem de fields (colunas extra no fim são ignoradas)
+        fields: Campos incluídos
+
+    Returns:
+        Dict[str, Any]: Apenas os campos pedidos
+    """
+    task = dict(zip(fields, row))
+    for field in ('created_at', 'updated_at'):
+        if field in task:
+            task[field] = task[field].isoformat() if task[field] else None
+    return task
+
+def supports_fast_json(app: Flask) -> bool:
+    """
+    Indica se a serialização rápida produz os mesmos bytes que jsonify
+
+    Só é o caso com o fornecedor JSON por omissão, chaves ordenadas,
+    ensure_ascii e saída compacta (fora do modo debug).
+    """
+    provider = app.json
+    if type(provider) is not DefaultJSONProvider:
+        return False
+    compact = provider.compact if provider.compact is not None else not app.debug
+    return bool(compact and provider.sort_keys and provider.ensure_ascii)
+
+def encode_task_list(
+    rows: Iterable[Sequence[Any]],
+    message: str,
+    next_cursor: Any = _NOT_SET,
+    fields: Tuple[str, ...] = TASK_FIELDS
+) -> bytes:
+    """
+    Codifica a resposta da listagem de tarefas
+
+    Args:
+        rows: Linhas pela ordem de fields
+        message: Mensagem da resposta
+        next_cursor: Cursor da página seguinte (omitido se não for indicado)
+        fields: Campos incluídos em cada tarefa
+
+    Returns:
+        bytes: Corpo igual ao de jsonify({...}) incluindo o fim de linha
+    """
+    encode = encode_task_row if fields == TASK_FIELDS else compile_task_encoder(fields)
+    tasks = [encode(row) for row in rows]
+    parts = ['{"message":', _encode_ascii(message)]
+    if next_cursor is not _NOT_SET:
+        parts.append(',"next_cursor":')
+        parts.append('null' if next_cursor is None else _encode_ascii(next_cursor))
+    parts.append(',"tasks":[')
+    parts.append(','.join(tasks))
+    parts.append('],"total":%d}\n' % len(tasks))
+    return ''.join(parts).encode('ascii')
@@ -0,0 +1,226 @@
+"""Lista de tokens JWT revogados, verificada em memória em cada pedido
+
+A tabela revoked_tokens é a fonte de verdade. Cada worker mantém:
+
+- um filtro de Bloom com todos os tokens revogados ainda válidos, que
+  responde "não revogado" (o caso comum) sem ir à base de dados;
+- um conjunto exato e limitado (LRU) dos tokens revogados confirmados.
+
+Só um positivo do filtro que não esteja no conjunto exato (falso positivo
+ou entrada antiga) consulta a base de dados. As revogações feitas noutros
+workers chegam por sincronização incremental, no máximo a cada
+TOKEN_BLOCKLIST_SYNC_INTERVAL segundos.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from flask import current_app
+from sqlalchemy import select
+
+from app import db, jwt
+from app.models.revoked_token import RevokedToken
+
+TOKEN_BLOCKLIST_EXTENSION = 'token_blocklist'
+# Margem para revogações confirmadas (commit) depois da última sincronização
+_SYNC_OVERLAP = timedelta(seconds=60)
+# Reconstrução periódica para retirar do filtro os tokens já expirados
+_REBUILD_INTERVAL = 3600
+
+class BloomFilter:
+    """Filtro de Bloom sobre um bytearray (sem falsos negativos)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        """Posições dos bits da chave (double hashing sobre um blake2b de 128 bits)"""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        return ((first + i * second) % size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        bits = self._bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+class TokenBlocklist:
+    """Filtro de Bloom + conjunto exato limitado, sincronizados com revoked_tokens"""
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        error_rate: float = 0.001,
+        exact_size: int = 1024,
+        sync_interval: float = 5.0
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.exact_size = exact_size
+        self.sync_interval = sync_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._exact: 'OrderedDict[str, None]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._loaded = False
+        self._last_sync = 0.0
+        self._last_rebuild = 0.0
+        self._synced_until: Optional[datetime] = None
+        self._counters = {
+            'checks': 0, 'bloom_negatives': 0, 'exact_hits': 0,
+            'db_lookups': 0, 'false_positives': 0, 'syncs': 0
+        }
+
+    def _count(self, name: str) -> None:
+        # Sem lock: contadores indicativos, no caminho de todos os pedidos
+        self._counters[name] += 1
+
+    def _remember(self, jti: str) -> None:
+        """Guarda um token revogado confirmado no conjunto exato (LRU)"""
+        with self._lock:
+            self._exact[jti] = None
+            self._exact.move_to_end(jti)
+            while len(self._exact) > self.exact_size:
+                self._exact.popitem(last=False)
+
+    def add(self, jti: str) -> None:
+        """Regista um token revogado neste worker (sem esperar pela sincronização)"""
+        self._bloom.add(jti)
+        self._remember(jti)
+
+    def rebuild(self) -> None:
+        """Reconstrói o filtro com os tokens revogados ainda não expirados"""
+        now = datetime.utcnow()
+        rows = db.session.execute(
+            select(RevokedToken.jti, RevokedToken.revoked_at).where(RevokedToken.expires_at > now)
+        ).all()
+        # O filtro cresce com a lista para manter a taxa de falsos positivos
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        for jti, _ in rows:
+            bloom.add(jti)
+        with self._lock:
+            self._bloom = bloom
+            self._exact.clear()
+        self._synced_until = now
+        self._last_rebuild = self._last_sync = time.monotonic()
+        self._loaded = True
+        self._count('syncs')
+
+    def sync(self, force: bool = False) -> None:
+        """
+        Acrescenta as revogações feitas noutros workers
+
+        Executa no máximo uma vez por intervalo e por uma só thread; as
+        restantes continuam com o estado atual.
+        """
+        now = time.monotonic()
+        if not force and self._loaded and now - self._last_sync < self.sync_interval:
+            return
+        if not self._sync_lock.acquire(blocking=force or not self._loaded):
+            return
+        try:
+            if (
+                not self._loaded
+                or now - self._last_rebuild >= _REBUILD_INTERVAL
+                or self._bloom.count > self._bloom.capacity
+            ):
+                self.rebuild()
+                return
+
+            started = datetime.utcnow()
+            rows = db.session.execute(
+                select(RevokedToken.jti, RevokedToken.revoked_at)
+                .where(RevokedToken.revoked_at >= self._synced_until - _SYNC_OVERLAP)
+            ).all()
+            bloom = self._bloom
+            for jti, _ in rows:
+                if jti not in bloom:
+                    bloom.add(jti)
+            self._synced_until = started
+            self._last_sync = time.monotonic()
+            self._count('syncs')
+        finally:
+            self._sync_lock.release()
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Indica se o token foi revogado
+
+        Args:
+            jti: Identificador único do token
+
+        Returns:
+            bool: True se o token estiver na lista de revogados
+        """
+        self.sync()
+        self._count('checks')
+        if jti not in self._bloom:
+            self._count('bloom_negatives')
+            return False
+
+        with self._lock:
+            if jti in self._exact:
+                self._exact.move_to_end(jti)
+                self._count('exact_hits')
+                return True
+
+        self._count('db_lookups')
+        revoked = db.session.execute(
+            select(RevokedToken.id).where(RevokedToken.jti == jti)
+        ).first() is not None
+        if revoked:
+            self._remember(jti)
+        else:
+            self._count('false_positives')
+        return revoked
+
+    def stats(self) -> Dict[str, object]:
+        """Contadores e dimensão do filtro neste processo"""
+        stats = dict(self._counters)
+        stats['entries'] = self._bloom.count
+        stats['bloom_bytes'] = self._bloom.nbytes
+        stats['exact_entries'] = len(self._exact)
+        return stats
+
+def setup_token_blocklist(app) -> TokenBlocklist:
+    """Regista a lista de revogados e o callback token_in_blocklist do JWT"""
+    blocklist = TokenBlocklist(
+        capacity=app.config.get('TOKEN_BLOCKLIST_CAPACITY', 10000),
+        error_rate=app.config.get('TOKEN_BLOCKLIST_ERROR_RATE', 0.001),
+        exact_size=app.config.get('TOKEN_BLOCKLIST_EXACT_SIZE', 1024),
+        sync_interval=app.config.get('TOKEN_BLOCKLIST_SYNC_INTERVAL', 5)
+    )
+    app.extensions[TOKEN_BLOCKLIST_EXTENSION] = blocklist
+    return blocklist
+
+def get_token_blocklist() -> TokenBlocklist:
+    """Devolve a lista de revogados da aplicação atual"""
+    blocklist = current_app.extensions.get(TOKEN_BLOCKLIST_EXTENSION)
+    if blocklist is None:
+        blocklist = setup_token_blocklist(current_app)
+    return blocklist
+
+@jwt.token_in_blocklist_loader
+def _is_token_revoked(jwt_header: dict, jwt_payload: dict) -> bool:
+    """Callback do Flask-JWT-Extended chamado em cada pedido autenticado"""
+    return get_token_blocklist().is_revoked(jwt_payload['jti'])
@@ -0,0 +1,120 @@
+"""Preparação de cada worker do Gunicorn antes de aceitar pedidos
+
+Com preload_app=True a aplicação é criada no master e os workers herdam-na
+por fork, incluindo o pool de ligações do SQLAlchemy: uma ligação aberta no
+master (ex: DB_AUTO_CREATE) ficaria partilhada, com o mesmo socket, por
+todos os workers. reset_engines_after_fork descarta-a em cada worker.
+
+warm_up_worker faz no worker, antes do primeiro pedido, o trabalho que de
+outra forma esse pedido pagaria:
+
+- constrói os validadores pydantic diferidos (app.schemas.base.Schema);
+- abre uma ligação do pool e executa as queries da listagem de tarefas
+  (TaskService), deixando o SQL compilado na cache do SQLAlchemy;
+- carrega a lista de tokens revogados;
+- arranca os processos do pool de bcrypt.
+
+Uma falha num passo fica no log e não impede o worker de arrancar.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from app import db
+
+# Nenhum utilizador tem id 0: as queries de aquecimento não devolvem linhas
+WARMUP_USER_ID = 0
+
+def reset_engines_after_fork(app) -> None:
+    """
+    Descarta o pool de ligações herdado do master
+
+    Com close=False as ligações herdadas não são fechadas nem usadas pelo
+    worker (continuam a ser do master); o worker abre as suas.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+def _schema_classes() -> List[Type]:
+    """Todas as subclasses (diretas e indiretas) de Schema"""
+    from app.schemas.base import Schema
+
+    pending, found = [Schema], []
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            found.append(subclass)
+            pending.append(subclass)
+    return found
+
+def prebuild_schemas() -> int:
+    """
+    Constrói os validadores pydantic ainda não construídos
+
+    Returns:
+        int: Número de schemas construídos
+    """
+    # Importa (regista) todos os schemas da API
+    import app.schemas  # noqa: F401
+
+    built = 0
+    for schema in _schema_classes():
+        if not schema.__pydantic_complete__:
+            schema.model_rebuild()
+            built += 1
+    return built
+
+def warm_up_database() -> None:
+    """Abre uma ligação do pool e executa as queries da listagem de tarefas"""
+    from app.schemas.task import TaskListQuery
+    from app.services.task_service import TaskService
+    from app.utils.principal import Principal
+
+    principal = Principal(WARMUP_USER_ID)
+    TaskService.get_tasks_version(principal)
+    TaskService.get_user_task_rows(principal)
+    TaskService.get_user_task_rows_page(principal, TaskListQuery())
+
+def warm_up_revocation() -> None:
+    """Carrega a lista de tokens revogados (primeiro pedido autenticado)"""
+    from app.utils.token_blocklist import get_token_blocklist
+
+    get_token_blocklist().sync(force=True)
+
+def warm_up_hashing() -> None:
+    """Arranca os processos do pool de bcrypt em segundo plano (primeiro login)"""
+    from flask import current_app
+    from app.utils.hashing_pool import get_hashing_pool
+    from app.utils.security import DEFAULT_BCRYPT_ROUNDS
+
+    get_hashing_pool().warm_up(current_app.config.get('BCRYPT_ROUNDS', DEFAULT_BCRYPT_ROUNDS))
+
+WARMUP_STEPS: Tuple[Tuple[str, Callable[[], object]], ...] = (
+    ('schemas', prebuild_schemas),
+    ('database', warm_up_database),
+    ('revocation', warm_up_revocation),
+    ('hashing', warm_up_hashing),
+)
+
+def warm_up_worker(app) -> Dict[str, Optional[float]]:
+    """
+    Executa os passos de aquecimento no processo atual
+
+    Args:
+        app: Aplicação Flask
+
+    Returns:
+        Dict[str, Optional[float]]: Milissegundos de cada passo (None se falhou)
+    """
+    timings: Dict[str, Optional[float]] = {}
+    with app.app_context():
+        for name, step in WARMUP_STEPS:
+            started = time.perf_counter()
+            try:
+                step()
+                timings[name] = round((time.perf_counter() - started) * 1000, 1)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.warning(f"Aquecimento do worker: o passo '{name}' falhou: {str(e)}")
+                timings[name] = None
+        db.session.remove()
+    return timings
@@ -3,6 +3,7 @@ Configuração do Gunicorn para produção
 Otimizado para o plano gratuito do Render (512MB RAM)
 """
 import os
+import time
 import multiprocessing
 
 # Endereço de binding
@@ -56,6 +57,27 @@ def when_ready(server):
     """Executado quando o Gunicorn está pronto"""
     print(f"✅ Gunicorn pronto! Workers: {workers}, Threads: {threads}")
 
+def post_fork(server, worker):
+    """Executado no worker logo após o fork"""
+    worker.boot_started = time.perf_counter()
+    if server.cfg.preload_app:
+        # Ligações à BD abertas no master não podem ser partilhadas pelos workers
+        from app.utils.warmup import reset_engines_after_fork
+        reset_engines_after_fork(worker.app.wsgi())
+
+def post_worker_init(worker):
+    """Executado no worker antes de aceitar pedidos (aquecimento)"""
+    flask_app = worker.wsgi
+    timings = {}
+    if flask_app.config.get('WORKER_WARMUP', True):
+        from app.utils.warmup import warm_up_worker
+        timings = warm_up_worker(flask_app)
+    elapsed = (time.perf_counter() - worker.boot_started) * 1000
+    steps = ', '.join(
+        f"{name} {'falhou' if ms is None else f'{ms:.0f} ms'}" for name, ms in timings.items()
+    )
+    print(f"🔥 Worker {worker.pid} pronto em {elapsed:.0f} ms" + (f" ({steps})" if steps else ''))
+
 def worker_int(worker):
     """Executado quando um worker recebe SIGINT"""
     print(f"⚠️ Worker {worker.pid} interrompido")
@@ -0,0 +1,73 @@
+"""Ambiente de execução das migrações Alembic"""
+import os
+import sys
+from logging.config import fileConfig
+
+from alembic import context
+from flask import has_app_context
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from app import create_app, db
+import app.models  # noqa: F401 - regista os modelos no metadata
+from app.utils.migrations import include_object
+from config import Config
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get('configure_logger', True):
+    fileConfig(config.config_file_name)
+
+target_metadata = db.metadata
+
+class MigrationConfig(Config):
+    """Configuração usada pela CLI do Alembic (nunca executa create_all)"""
+    DB_AUTO_CREATE = False
+
+def _configure_and_run(connection):
+    """Executa as migrações numa conexão já aberta"""
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == 'sqlite',
+        compare_type=True,
+        include_object=include_object
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_offline():
+    """Gera o SQL das migrações sem ligação à base de dados"""
+    context.configure(
+        url=Config.SQLALCHEMY_DATABASE_URI,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={'paramstyle': 'named'},
+        include_object=include_object
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """Executa as migrações contra a base de dados configurada"""
+    connection = config.attributes.get('connection')
+    if connection is not None:
+        _configure_and_run(connection)
+        return
+
+    if has_app_context():
+        with db.engine.connect() as connection:
+            _configure_and_run(connection)
+        return
+
+    flask_app = create_app(MigrationConfig)
+    with flask_app.app_context():
+        with db.engine.connect() as connection:
+            _configure_and_run(connection)
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,36 @@
+"""Índice composto (user_id, created_at, id) para a listagem de tarefas
+
+Substitui o índice simples em user_id: a listagem ordenada e a paginação
+por cursor passam a ler o índice por ordem, sem ordenação em memória.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tasks_user_id_created_at_id',
+        'tasks',
+        ['user_id', 'created_at', 'id'],
+        unique=False
+    )
+    op.drop_index('ix_tasks_user_id', table_name='tasks')
+
+
+def downgrade() -> None:
+    op.create_index('ix_tasks_user_id', 'tasks', ['user_id'], unique=False)
+    op.drop_index('ix_tasks_user_id_created_at_id', table_name='tasks')
@@ -0,0 +1,43 @@
+"""Índices para filtros e ordenação da listagem de tarefas
+
+- (user_id, updated_at, id): ordenação e filtros por data de atualização
+- índice parcial (user_id, created_at, id) WHERE NOT completed: tarefas em aberto
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tasks_user_id_updated_at_id',
+        'tasks',
+        ['user_id', 'updated_at', 'id'],
+        unique=False
+    )
+    op.create_index(
+        'ix_tasks_user_id_open',
+        'tasks',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('completed = false'),
+        sqlite_where=sa.text('completed = 0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_id_open', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_updated_at_id', table_name='tasks')
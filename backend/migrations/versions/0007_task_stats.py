@@ -0,0 +1,57 @@
+"""Contadores agregados das tarefas (totais e por dia de criação)
+
+Os contadores são mantidos pelo TaskService na transação de cada escrita;
+esta migração preenche-os a partir das tarefas existentes.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_stats',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table(
+        'task_daily_stats',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    
+    op.execute(
+        "INSERT INTO task_stats (user_id, total, completed) "
+        "SELECT user_id, COUNT(*), SUM(CASE WHEN completed THEN 1 ELSE 0 END) "
+        "FROM tasks GROUP BY user_id"
+    )
+    op.execute(
+        "INSERT INTO task_daily_stats (user_id, day, total, completed) "
+        "SELECT user_id, date(created_at), COUNT(*), SUM(CASE WHEN completed THEN 1 ELSE 0 END) "
+        "FROM tasks WHERE created_at IS NOT NULL GROUP BY user_id, date(created_at)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_daily_stats')
+    op.drop_table('task_stats')
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Benchmark da importação em massa de tarefas
+Compara TaskService.create_task (uma tarefa por commit) com
+TaskService.import_tasks (INSERT executemany em lotes, uma transação)
+
+Uso:
+    python scripts/benchmark_import.py
+    python scripts/benchmark_import.py --rows 5000 --database-url postgresql://...
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+# Adicionar diretório pai ao path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from app import create_app, db
+from app.models.user import User
+from app.models.task import Task
+from app.schemas.task import TaskCreate
+from app.services.task_service import TaskService
+from config import Config
+
+
+def build_config(database_url):
+    """Cria a configuração do benchmark para o URL indicado"""
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DB_AUTO_CREATE = True
+        RATELIMIT_ENABLED = False
+    return BenchmarkConfig
+
+
+def measure(label, rows, func):
+    """Executa func e imprime o débito em linhas/segundo"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<32} {rows:>7} linhas  {elapsed:8.3f}s  {rows / elapsed:>10.0f} linhas/s")
+    return rows / elapsed
+
+
+def run_benchmark(rows, batch_size, database_url):
+    """Executa os dois caminhos de criação e compara o débito"""
+    app = create_app(build_config(database_url))
+
+    with app.app_context():
+        user = User(username='benchmark', email='benchmark@example.com', hashed_password='x')
+        db.session.add(user)
+        db.session.commit()
+
+        payload = [TaskCreate(title=f'Tarefa {i}', description='Importada no benchmark') for i in range(rows)]
+
+        print(f"📊 Benchmark de importação ({db.engine.dialect.name}, {rows} tarefas)")
+
+        def one_at_a_time():
+            for task_data in payload:
+                TaskService.create_task(task_data, user)
+
+        def batched():
+            TaskService.import_tasks(payload, user, batch_size=batch_size)
+
+        single = measure('create_task (uma a uma)', rows, one_at_a_time)
+        bulk = measure(f'import_tasks (lotes de {batch_size})', rows, batched)
+        print(f"   ⚡ Aceleração: {bulk / single:.1f}x")
+
+        Task.query.filter_by(user_id=user.id).delete()
+        db.session.delete(user)
+        db.session.commit()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark da importação em massa de tarefas')
+    parser.add_argument('--rows', type=int, default=2000, help='Número de tarefas por caminho')
+    parser.add_argument('--batch-size', type=int, default=500, help='Linhas por INSERT em lote')
+    parser.add_argument('--database-url', help='URL da base de dados (por omissão SQLite temporário)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        run_benchmark(args.rows, args.batch_size, args.database_url)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_benchmark(args.rows, args.batch_size, f"sqlite:///{os.path.join(tmp, 'benchmark.db')}")
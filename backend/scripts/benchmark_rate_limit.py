@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Benchmark do custo por verificação do rate limiting
+Compara o armazenamento em memória (por worker) com o SQLite WAL
+partilhado, com vários processos a contar na mesma chave
+
+Mostra microssegundos por verificação e confirma que, com o SQLite, os
+processos partilham o contador (o total contado é o de todos os pedidos).
+
+Uso:
+    python scripts/benchmark_rate_limit.py
+    python scripts/benchmark_rate_limit.py --checks 5000 --processes 4
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+import multiprocessing
+
+# Adicionar diretório pai ao path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+# Regista o esquema sqlite://
+from app.middleware.rate_limit_storage import SQLiteStorage  # noqa: F401
+
+LIMIT = parse('1000000 per hour')
+
+
+def run_checks(uri, checks):
+    """Executa verificações numa chave comum e devolve os segundos gastos"""
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    start = time.perf_counter()
+    for _ in range(checks):
+        limiter.hit(LIMIT, 'benchmark')
+    return time.perf_counter() - start
+
+
+def measure(label, uri, checks, processes):
+    """Mede o custo por verificação com N processos em simultâneo"""
+    with multiprocessing.get_context('spawn').Pool(processes) as pool:
+        timings = pool.starmap(run_checks, [(uri, checks)] * processes)
+
+    per_check = sum(timings) / (checks * processes) * 1e6
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    counted = LIMIT.amount - limiter.get_window_stats(LIMIT, 'benchmark').remaining
+    print(f"   {label:<28} {per_check:>8.1f} µs/verificação  contados: {counted}/{checks * processes}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark do custo por verificação do rate limiting')
+    parser.add_argument('--checks', type=int, default=2000, help='Verificações por processo')
+    parser.add_argument('--processes', type=int, default=2, help='Processos (workers) em simultâneo')
+    args = parser.parse_args()
+
+    print(f"📊 Rate limiting: {args.checks} verificações x {args.processes} processos")
+    measure('memory:// (por worker)', 'memory://', args.checks, args.processes)
+    with tempfile.TemporaryDirectory() as tmp:
+        measure('SQLite WAL (partilhado)', f"sqlite:///{os.path.join(tmp, 'ratelimit.db')}", args.checks, args.processes)
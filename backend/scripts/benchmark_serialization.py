@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Benchmark da leitura e serialização da listagem de tarefas
+Compara o caminho ORM (hidratação + Task.to_dict + jsonify) com o caminho
+sem ORM (SELECT de colunas + serializador pré-compilado)
+
+Mostra linhas/segundo e memória alocada por linha (tracemalloc).
+
+Uso:
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --rows 20000 --database-url postgresql://...
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+import tracemalloc
+
+# Adicionar diretório pai ao path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from flask import jsonify
+from app import create_app, db
+from app.models.user import User
+from app.models.task import Task
+from app.schemas.task import TaskCreate
+from app.services.task_service import TaskService
+from app.utils.serializers import encode_task_list
+from config import Config
+
+MESSAGE = 'Tarefas listadas com sucesso'
+
+
+def build_config(database_url):
+    """Cria a configuração do benchmark para o URL indicado"""
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        DB_AUTO_CREATE = True
+        RATELIMIT_ENABLED = False
+    return BenchmarkConfig
+
+
+def measure(label, rows, repeat, func):
+    """Executa func várias vezes e imprime débito e alocações por linha"""
+    func()  # aquecimento
+    db.session.expunge_all()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+        db.session.expunge_all()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.expunge_all()
+
+    rate = rows * repeat / elapsed
+    print(f"   {label:<34} {rate:>10.0f} linhas/s  {peak / rows:>8.0f} bytes/linha (pico)")
+    return rate, peak
+
+
+def run_benchmark(rows, repeat, database_url):
+    """Mede os dois caminhos e confirma que produzem os mesmos bytes"""
+    app = create_app(build_config(database_url))
+
+    with app.test_request_context():
+        user = User(username='benchmark', email='benchmark@example.com', hashed_password='x')
+        db.session.add(user)
+        db.session.commit()
+
+        TaskService.import_tasks(
+            (TaskCreate(title=f'Tarefa {i}', description='Descrição de exemplo ' * 5) for i in range(rows)),
+            user
+        )
+
+        def orm_path():
+            tasks = TaskService.get_user_tasks(user)
+            return jsonify({
+                'message': MESSAGE,
+                'tasks': [task.to_dict() for task in tasks],
+                'total': len(tasks)
+            }).get_data()
+
+        def rows_path():
+            return encode_task_list(TaskService.get_user_task_rows(user), MESSAGE)
+
+        print(f"📊 Benchmark de serialização ({db.engine.dialect.name}, {rows} tarefas x {repeat})")
+
+        if orm_path() != rows_path():
+            print("❌ Os dois caminhos produzem respostas diferentes")
+            sys.exit(1)
+
+        orm_rate, orm_peak = measure('ORM + to_dict + jsonify', rows, repeat, orm_path)
+        fast_rate, fast_peak = measure('Core + serializador', rows, repeat, rows_path)
+        print(f"   ⚡ Aceleração: {fast_rate / orm_rate:.1f}x  |  memória: {orm_peak / fast_peak:.1f}x menos")
+
+        Task.query.filter_by(user_id=user.id).delete()
+        db.session.delete(user)
+        db.session.commit()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark da serialização da listagem de tarefas')
+    parser.add_argument('--rows', type=int, default=5000, help='Número de tarefas')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetições por caminho')
+    parser.add_argument('--database-url', help='URL da base de dados (por omissão SQLite temporário)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        run_benchmark(args.rows, args.repeat, args.database_url)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run_benchmark(args.rows, args.repeat, f"sqlite:///{os.path.join(tmp, 'benchmark.db')}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Calibração do custo bcrypt (BCRYPT_ROUNDS) para este servidor
+Mede o tempo de hash em cada custo e recomenda o maior custo cujo tempo
+fica dentro do orçamento de latência do login
+
+Os hashes existentes com outro custo são refeitos automaticamente no login
+seguinte, pelo que basta atualizar BCRYPT_ROUNDS e reiniciar a aplicação.
+
+Uso:
+    python scripts/calibrate_bcrypt.py
+    python scripts/calibrate_bcrypt.py --target-ms 250 --min-rounds 10 --max-rounds 15
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+# Adicionar diretório pai ao path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from app.utils.security import get_password_hash
+
+SAMPLE_PASSWORD = 'calibracao-bcrypt-123'
+
+
+def measure_rounds(rounds, samples):
+    """Devolve a mediana (ms) do tempo de hash com o custo indicado"""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        get_password_hash(SAMPLE_PASSWORD, rounds)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms, min_rounds, max_rounds, samples):
+    """Mede os custos por ordem crescente e devolve o maior dentro do orçamento"""
+    print(f"🔐 Calibração bcrypt (orçamento: {target_ms:.0f} ms, {samples} amostras por custo)")
+
+    chosen = None
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed = measure_rounds(rounds, samples)
+        within = elapsed <= target_ms
+        print(f"   custo {rounds:>2}: {elapsed:>8.1f} ms {'✅' if within else '❌'}")
+        if not within:
+            # Cada custo a mais duplica o tempo: os seguintes também excedem
+            break
+        chosen = rounds
+
+    if chosen is None:
+        print(f"⚠️  Nem o custo mínimo ({min_rounds}) cabe no orçamento; a usar BCRYPT_ROUNDS={min_rounds}")
+        chosen = min_rounds
+
+    current = int(os.getenv('BCRYPT_ROUNDS', 12))
+    print(f"\n👉 Recomendado: BCRYPT_ROUNDS={chosen} (atual: {current})")
+    return chosen
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Calibração do custo bcrypt para este servidor')
+    parser.add_argument('--target-ms', type=float, default=250, help='Tempo máximo de um hash (ms)')
+    parser.add_argument('--min-rounds', type=int, default=10, help='Custo mínimo aceitável')
+    parser.add_argument('--max-rounds', type=int, default=16, help='Custo máximo a testar')
+    parser.add_argument('--samples', type=int, default=3, help='Amostras por custo')
+    args = parser.parse_args()
+
+    if not 4 <= args.min_rounds <= args.max_rounds <= 31:
+        parser.error('os custos bcrypt têm de estar entre 4 e 31 (min <= max)')
+
+    calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Script de compactação dos registos de eliminação de tarefas
+Remove tombstones mais antigos que o período de retenção da sincronização
+
+Uso:
+    python scripts/compact_tombstones.py
+    python scripts/compact_tombstones.py --days 60
+"""
+import os
+import sys
+import argparse
+from datetime import timedelta
+
+# Adicionar diretório pai ao path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from app import create_app
+from app.services.task_service import TaskService
+
+
+def compact(days=None):
+    """Remove os tombstones expirados"""
+    app = create_app()
+
+    with app.app_context():
+        retention = timedelta(days=days) if days is not None else None
+        label = f"{days} dias" if days is not None else f"{app.config['TOMBSTONE_RETENTION_DAYS']} dias"
+        print(f"🧹 A compactar registos de eliminação (retenção: {label})...")
+
+        try:
+            removed = TaskService.compact_tombstones(retention)
+            print(f"✅ Registos removidos: {removed}")
+        except Exception as e:
+            print(f"❌ Erro ao compactar registos: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compactar registos de eliminação de tarefas'
+    )
+    parser.add_argument(
+        '--days',
+        type=int,
+        help='Período de retenção em dias (por omissão TOMBSTONE_RETENTION_DAYS)'
+    )
+
+    args = parser.parse_args()
+    compact(args.days)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 """
 Script de inicialização da base de dados
-Cria tabelas e opcionalmente adiciona dados de teste
+Aplica as migrações Alembic e opcionalmente adiciona dados de teste
 
 Uso:
     python scripts/init_db.py
@@ -18,20 +18,27 @@ from app import create_app, db
 from app.models.user import User
 from app.models.task import Task
 from app.enums.task_status import TaskStatus
+from app.utils.migrations import upgrade_database
+from config import Config
 import argparse
 
 
+class InitDbConfig(Config):
+    """Configuração sem create_all: o esquema vem das migrações"""
+    DB_AUTO_CREATE = False
+
+
 def init_database(seed_data=False):
     """Inicializa a base de dados"""
-    app = create_app()
+    app = create_app(InitDbConfig)
     
     with app.app_context():
         print("🔧 A inicializar base de dados...")
         
         try:
-            # Criar todas as tabelas
-            db.create_all()
-            print("✅ Tabelas criadas com sucesso!")
+            # Aplicar migrações pendentes
+            upgrade_database()
+            print("✅ Migrações aplicadas com sucesso!")
             
             # Verificar se já existem dados
             user_count = User.query.count()
@@ -110,7 +117,7 @@ def seed_database():
 
 def drop_all_tables():
     """Remove todas as tabelas (CUIDADO!)"""
-    app = create_app()
+    app = create_app(InitDbConfig)
     
     with app.app_context():
         print("⚠️  A remover todas as tabelas...")
@@ -118,6 +125,8 @@ def drop_all_tables():
         
         if response.lower() == 'sim':
             db.drop_all()
+            db.session.execute(db.text('DROP TABLE IF EXISTS alembic_version'))
+            db.session.commit()
             print("✅ Todas as tabelas removidas!")
         else:
             print("❌ Operação cancelada")
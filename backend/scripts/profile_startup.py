@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Perfil do arranque da aplicação (cold start)
+Importa a aplicação e executa o create_app num processo novo, como um
+worker a acordar, com python -X importtime para medir cada módulo
+
+Mostra o tempo de arranque, os módulos mais lentos, o total por pacote e
+os subsistemas carregados só quando usados (passlib, flask_limiter, ...)
+que tenham sido importados no arranque.
+
+Uso:
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --top 30 --budget-ms 1500
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+
+# Diretório do backend (onde está o pacote app)
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importados só no primeiro uso; não devem aparecer no arranque
+LAZY_MODULES = (
+    'passlib',                      # primeiro hash/verificação de palavra-passe
+    'email_validator',              # primeiro registo (UserCreate)
+    'flask_limiter',                # só com RATELIMIT_ENABLED=true
+    'limits',
+    'concurrent.futures.process',   # pool de bcrypt, criado no primeiro login
+    'alembic',                      # só com DB_AUTO_CREATE=true
+)
+
+BOOT_CODE = '''
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (done - imported) * 1000,
+    "modules": sorted(sys.modules)
+}))
+'''
+
+
+def profile_boot(env=None, importtime=True):
+    """
+    Arranca a aplicação num processo novo
+
+    Returns:
+        dict: import_ms, create_app_ms, total_ms, modules e imports
+            (lista de (módulo, self_us, cumulative_us) se importtime)
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    result = subprocess.run(
+        command + ['-c', BOOT_CODE],
+        cwd=parent_dir,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'O arranque falhou:\n{result.stderr[-2000:]}')
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['total_ms'] = report['import_ms'] + report['create_app_ms']
+    report['imports'] = parse_importtime(result.stderr) if importtime else []
+    return report
+
+
+def parse_importtime(output):
+    """Lê as linhas "import time: self | cumulative | módulo" do -X importtime"""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        imports.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return imports
+
+
+def print_report(report, top):
+    """Mostra o resumo do arranque"""
+    print(f"🚀 Arranque: {report['total_ms']:.0f} ms "
+          f"(importação {report['import_ms']:.0f} ms + create_app {report['create_app_ms']:.0f} ms, "
+          f"{len(report['modules'])} módulos)")
+
+    imports = report['imports']
+    if imports:
+        print(f"\n📦 Módulos mais lentos (cumulativo, top {top}):")
+        for name, self_us, cumulative_us in sorted(imports, key=lambda item: -item[2])[:top]:
+            print(f"   {cumulative_us / 1000:>8.1f} ms  {self_us / 1000:>7.1f} ms próprio  {name}")
+
+        packages = defaultdict(int)
+        for name, self_us, _ in imports:
+            packages[name.split('.')[0]] += self_us
+        print(f"\n📚 Por pacote (tempo próprio, top {top}):")
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            print(f"   {self_us / 1000:>8.1f} ms  {package}")
+
+    loaded = [name for name in LAZY_MODULES if name in report['modules']]
+    if loaded:
+        print(f"\n⚠️  Subsistemas carregados no arranque (deviam ser só no primeiro uso): {', '.join(loaded)}")
+    else:
+        print("\n✅ Nenhum subsistema diferido foi carregado no arranque")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Perfil do tempo de arranque da aplicação')
+    parser.add_argument('--top', type=int, default=20, help='Número de módulos/pacotes a mostrar')
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('STARTUP_BUDGET_MS', 2500)),
+                        help='Orçamento do arranque (ms); termina com erro se for excedido')
+    args = parser.parse_args()
+
+    # O -X importtime acrescenta algum custo: o orçamento é verificado sem ele
+    boot = profile_boot(importtime=False)
+    report = profile_boot()
+    print_report(report, args.top)
+
+    print(f"\n⏱️  Arranque sem instrumentação: {boot['total_ms']:.0f} ms (orçamento: {args.budget_ms:.0f} ms)")
+    if boot['total_ms'] > args.budget_ms:
+        print("❌ Orçamento de arranque excedido")
+        sys.exit(1)
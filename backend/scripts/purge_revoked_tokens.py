@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+"""
+Script de limpeza da lista de tokens revogados
+Remove os tokens já expirados (rejeitados pelo JWT de qualquer forma)
+
+Uso:
+    python scripts/purge_revoked_tokens.py
+"""
+import os
+import sys
+
+# Adicionar diretório pai ao path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from app import create_app
+from app.services.auth_service import AuthService
+
+
+def purge():
+    """Remove os tokens revogados expirados"""
+    app = create_app()
+
+    with app.app_context():
+        print("🧹 A remover tokens revogados expirados...")
+
+        try:
+            removed = AuthService.purge_revoked_tokens()
+            print(f"✅ Registos removidos: {removed}")
+        except Exception as e:
+            print(f"❌ Erro ao remover tokens: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    purge()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Script de reconciliação das estatísticas das tarefas
+Recalcula os contadores (task_stats, task_daily_stats) a partir das tarefas
+
+Uso:
+    python scripts/reconcile_task_stats.py
+    python scripts/reconcile_task_stats.py --user-id 42
+"""
+import os
+import sys
+import argparse
+
+# Adicionar diretório pai ao path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from app import create_app
+from app.services.stats_service import StatsService
+
+
+def reconcile(user_id=None):
+    """Corrige os contadores que divergem das tarefas"""
+    app = create_app()
+
+    with app.app_context():
+        scope = f"utilizador {user_id}" if user_id is not None else "todos os utilizadores"
+        print(f"📊 A reconciliar estatísticas ({scope})...")
+
+        try:
+            drifted = StatsService.reconcile(user_id)
+            if drifted:
+                print(f"🔧 Contadores corrigidos: {len(drifted)} utilizador(es) {drifted}")
+            else:
+                print("✅ Contadores consistentes")
+        except Exception as e:
+            print(f"❌ Erro ao reconciliar estatísticas: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Reconciliar estatísticas das tarefas'
+    )
+    parser.add_argument(
+        '--user-id',
+        type=int,
+        help='Reconciliar apenas este utilizador'
+    )
+
+    args = parser.parse_args()
+    reconcile(args.user_id)
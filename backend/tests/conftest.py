@@ -13,6 +13,8 @@ class TestConfig(Config):
     JWT_SECRET_KEY = 'test-jwt-secret-key'
     SECRET_KEY = 'test-secret-key'
     WTF_CSRF_ENABLED = False
+    AUTH_HASH_POOL_SIZE = 0
+    BCRYPT_ROUNDS = 4
 
 @pytest.fixture
 def app():
@@ -56,7 +58,7 @@ def test_user(app):
         user = User(
             username='testuser',
             email='test@example.com',
-            hashed_password=get_password_hash('testpass123')
+            hashed_password=get_password_hash('testpass123', TestConfig.BCRYPT_ROUNDS)
         )
         db.session.add(user)
         db.session.commit()
@@ -85,7 +87,7 @@ def another_user(app):
         user = User(
             username='anotheruser',
             email='another@example.com',
-            hashed_password=get_password_hash('anotherpass123')
+            hashed_password=get_password_hash('anotherpass123', TestConfig.BCRYPT_ROUNDS)
         )
         db.session.add(user)
         db.session.commit()
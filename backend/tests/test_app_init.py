@@ -89,3 +89,33 @@ class TestAppInit:
             elif was_in_path and parent_dir not in sys.path:
                 sys.path.insert(0, parent_dir)
 
+
+BOOT_ENV = {
+    'DATABASE_URL': 'sqlite://',
+    'RATELIMIT_ENABLED': 'false',
+    'DB_AUTO_CREATE': 'false'
+}
+
+@pytest.mark.unit
+@pytest.mark.app
+class TestColdStart:
+    """Testes do tempo de arranque (worker a acordar)"""
+    
+    def test_lazy_subsystems_not_imported_at_boot(self):
+        """Testa que passlib, flask_limiter, email_validator, ... só carregam no primeiro uso"""
+        from scripts.profile_startup import LAZY_MODULES, profile_boot
+        
+        report = profile_boot(BOOT_ENV)
+        assert report['imports'], "Sem saída do -X importtime"
+        loaded = [name for name in LAZY_MODULES if name in report['modules']]
+        assert loaded == []
+    
+    def test_lazy_schemas_build_on_first_use(self):
+        """Testa que os schemas diferidos validam normalmente no primeiro uso"""
+        from app.schemas.base import Schema
+        from app.schemas.user import UserCreate
+        
+        assert Schema.model_config['defer_build'] is True
+        user = UserCreate(username='lazyuser', email='Lazy@Example.COM', password='password123')
+        assert user.email == 'Lazy@example.com'
+        assert UserCreate.__pydantic_complete__ is True
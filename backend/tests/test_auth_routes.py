@@ -95,6 +95,7 @@ class TestAuthRoutes:
         assert 'access_token' in json_data
         assert 'token_type' in json_data
         assert json_data['token_type'] == 'bearer'
+        assert 'refresh_token' in json_data
         assert 'user' in json_data
     
     def test_login_invalid_credentials(self, client):
@@ -119,4 +120,63 @@ class TestAuthRoutes:
         response = client.post('/api/auth/login', json=login_data)
         
         assert response.status_code == 400
-
+    
+    def _login(self, client):
+        client.post('/api/auth/register', json={
+            'username': 'testuser', 'email': 'test@example.com', 'password': 'testpass123'
+        })
+        return client.post('/api/auth/login', json={
+            'username': 'testuser', 'password': 'testpass123'
+        }).get_json()
+    
+    def test_refresh_rotates_tokens(self, client):
+        """Testa que o refresh emite um novo par e invalida o refresh token usado"""
+        tokens = self._login(client)
+        headers = {'Authorization': f"Bearer {tokens['refresh_token']}"}
+        
+        response = client.post('/api/auth/refresh', headers=headers)
+        
+        assert response.status_code == 200
+        new_tokens = response.get_json()
+        assert new_tokens['refresh_token'] != tokens['refresh_token']
+        assert client.get('/api/tasks', headers={
+            'Authorization': f"Bearer {new_tokens['access_token']}"
+        }).status_code == 200
+        
+        reused = client.post('/api/auth/refresh', headers=headers)
+        assert reused.status_code == 401
+    
+    def test_refresh_requires_refresh_token(self, client):
+        """Testa que um access token não serve para renovar"""
+        tokens = self._login(client)
+        
+        response = client.post('/api/auth/refresh', headers={
+            'Authorization': f"Bearer {tokens['access_token']}"
+        })
+        
+        assert response.status_code == 422
+    
+    def test_logout_revokes_tokens(self, client):
+        """Testa que o logout revoga o access token e o refresh token"""
+        tokens = self._login(client)
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        
+        response = client.post('/api/auth/logout', headers=headers, json={
+            'refresh_token': tokens['refresh_token']
+        })
+        
+        assert response.status_code == 200
+        assert client.get('/api/tasks', headers=headers).status_code == 401
+        assert client.post('/api/auth/refresh', headers={
+            'Authorization': f"Bearer {tokens['refresh_token']}"
+        }).status_code == 401
+    
+    def test_logout_rejects_foreign_refresh_token(self, client):
+        """Testa que o logout rejeita um refresh token inválido"""
+        tokens = self._login(client)
+        
+        response = client.post('/api/auth/logout', headers={
+            'Authorization': f"Bearer {tokens['access_token']}"
+        }, json={'refresh_token': 'invalido'})
+        
+        assert response.status_code == 400
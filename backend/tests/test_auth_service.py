@@ -11,6 +11,9 @@ from app.exceptions.custom_exceptions import (
 )
 from app import db
 from app.models.user import User
+from app.models.revoked_token import RevokedToken
+from datetime import datetime, timedelta
+from app.utils.security import get_password_hash, password_needs_update
 
 @pytest.mark.unit
 @pytest.mark.auth
@@ -106,6 +109,39 @@ class TestAuthService:
             
             assert 'Credenciais inválidas' in str(exc_info.value.message)
     
+    def test_authenticate_user_rehashes_outdated_cost(self, app, test_user):
+        """Testa que o login refaz o hash gerado com outro custo bcrypt"""
+        with app.app_context():
+            user = db.session.get(User, test_user.id)
+            user.hashed_password = get_password_hash('testpass123', 5)
+            db.session.commit()
+            
+            AuthService.authenticate_user(UserLogin(username='testuser', password='testpass123'))
+            
+            db.session.expire_all()
+            user = db.session.get(User, test_user.id)
+            assert user.hashed_password.startswith('$2b$04$')
+            assert not password_needs_update(user.hashed_password, app.config['BCRYPT_ROUNDS'])
+    
+    def test_authenticate_user_keeps_current_hash(self, app, test_user):
+        """Testa que um hash com o custo atual não é reescrito"""
+        with app.app_context():
+            original = db.session.get(User, test_user.id).hashed_password
+            
+            AuthService.authenticate_user(UserLogin(username='testuser', password='testpass123'))
+            
+            db.session.expire_all()
+            assert db.session.get(User, test_user.id).hashed_password == original
+    
+    def test_get_pwd_context(self):
+        """Testa que o contexto padrão é partilhado e verifica os hashes gerados"""
+        from app.utils import security
+        
+        context = security.get_pwd_context()
+        assert context is security.get_pwd_context()
+        assert context.verify('segredo123', get_password_hash('segredo123'))
+        assert not hasattr(security, 'pwd_context')
+    
     def test_get_user_by_id_success(self, app, test_user):
         """Testa obtenção de utilizador por ID"""
         with app.app_context():
@@ -136,4 +172,18 @@ class TestAuthService:
                     AuthService.register_user(user_data)
                 
                 assert 'Erro ao criar utilizador' in str(exc_info.value.message)
-
+    
+    def test_purge_revoked_tokens(self, app, test_user):
+        """Testa a remoção dos tokens revogados já expirados"""
+        with app.app_context():
+            now = datetime.utcnow()
+            db.session.add_all([
+                RevokedToken(jti='expirado', token_type='access', user_id=test_user.id,
+                             expires_at=now - timedelta(minutes=1)),
+                RevokedToken(jti='ativo', token_type='refresh', user_id=test_user.id,
+                             expires_at=now + timedelta(days=1))
+            ])
+            db.session.commit()
+            
+            assert AuthService.purge_revoked_tokens() == 1
+            assert [t.jti for t in RevokedToken.query.all()] == ['ativo']
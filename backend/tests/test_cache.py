@@ -0,0 +1,140 @@
+"""Testes para a cache de respostas da listagem de tarefas"""
+import os
+import time
+import pytest
+from unittest.mock import patch
+from app.utils.cache import (
+    MemoryCacheBackend, FileCacheBackend, NullCacheBackend, ResponseCache,
+    create_cache_backend, get_task_list_cache
+)
+
+@pytest.mark.unit
+class TestCacheBackends:
+    """Testes para os backends de cache"""
+    
+    def test_memory_backend_lru_eviction(self):
+        """Testa que a entrada menos usada sai quando o limite é atingido"""
+        backend = MemoryCacheBackend(max_entries=2, ttl=60)
+        backend.set('1', 'a', b'A')
+        backend.set('1', 'b', b'B')
+        backend.get('1', 'a')
+        backend.set('1', 'c', b'C')
+        
+        assert backend.get('1', 'a') == b'A'
+        assert backend.get('1', 'b') is None
+        assert backend.get('1', 'c') == b'C'
+    
+    def test_memory_backend_ttl(self):
+        """Testa expiração das entradas"""
+        backend = MemoryCacheBackend(max_entries=10, ttl=60)
+        with patch('app.utils.cache.time.monotonic', return_value=1000.0):
+            backend.set('1', 'a', b'A')
+        with patch('app.utils.cache.time.monotonic', return_value=1061.0):
+            assert backend.get('1', 'a') is None
+        assert len(backend) == 0
+    
+    def test_memory_backend_invalidate_namespace(self):
+        """Testa que a invalidação só afeta o namespace indicado"""
+        backend = MemoryCacheBackend()
+        backend.set('1', 'a', b'A')
+        backend.set('2', 'a', b'B')
+        backend.invalidate('1')
+        
+        assert backend.get('1', 'a') is None
+        assert backend.get('2', 'a') == b'B'
+    
+    def test_memory_backend_byte_budget(self):
+        """Testa expulsão pelo total em bytes e respostas grandes não guardadas"""
+        backend = MemoryCacheBackend(max_entries=100, ttl=60, max_bytes=10, max_entry_bytes=6)
+        backend.set('1', 'a', b'AAAA')
+        backend.set('1', 'b', b'BBBB')
+        backend.set('1', 'c', b'CCCC')
+        backend.set('1', 'big', b'X' * 7)
+        
+        assert backend.get('1', 'a') is None
+        assert backend.get('1', 'big') is None
+        assert (len(backend), backend.size_bytes) == (2, 8)
+        
+        backend.set('1', 'b', b'B' * 7)
+        assert backend.get('1', 'b') is None
+        assert backend.size_bytes == 4
+    
+    def test_file_backend_byte_budget(self, tmp_path):
+        """Testa que a limpeza remove as entradas mais antigas acima do limite"""
+        backend = FileCacheBackend(str(tmp_path), ttl=60, max_bytes=100, max_entry_bytes=50)
+        for index, key in enumerate('abcde'):
+            backend.set('1', key, b'X' * 30)
+            path = backend._path('1', key)
+            os.utime(path, (1000 + index, time.time() - 10 + index))
+        backend.set('1', 'big', b'X' * 51)
+        
+        assert backend.cleanup() == 90
+        assert [backend.get('1', key) is not None for key in 'abcde'] == [False, False, True, True, True]
+        assert backend.get('1', 'big') is None
+    
+    def test_file_backend_shared_between_instances(self, tmp_path):
+        """Testa que duas instâncias (processos) partilham as entradas"""
+        writer = FileCacheBackend(str(tmp_path), ttl=60)
+        reader = FileCacheBackend(str(tmp_path), ttl=60)
+        writer.set('1', 'a', b'A')
+        
+        assert reader.get('1', 'a') == b'A'
+        
+        reader.invalidate('1')
+        assert writer.get('1', 'a') is None
+    
+    def test_response_cache_counters(self):
+        """Testa contadores de hits, misses e invalidações"""
+        cache = ResponseCache(MemoryCacheBackend())
+        cache.get('1', 'a')
+        cache.set('1', 'a', b'A')
+        cache.get('1', 'a')
+        cache.invalidate('1')
+        
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['invalidations'] == 1
+        assert stats['hit_ratio'] == 0.5
+    
+    def test_create_cache_backend(self, tmp_path):
+        """Testa seleção do backend pela configuração"""
+        assert isinstance(create_cache_backend({'TASK_CACHE_BACKEND': 'none'}), NullCacheBackend)
+        assert isinstance(
+            create_cache_backend({'TASK_CACHE_BACKEND': 'file', 'TASK_CACHE_DIR': str(tmp_path)}),
+            FileCacheBackend
+        )
+        with pytest.raises(ValueError):
+            create_cache_backend({'TASK_CACHE_BACKEND': 'redis'})
+
+@pytest.mark.integration
+@pytest.mark.tasks
+class TestTaskListCache:
+    """Testes da cache na rota de listagem"""
+    
+    def test_list_tasks_served_from_cache(self, client, auth_headers, app):
+        """Testa que o segundo pedido igual não lê tarefas"""
+        client.post('/api/tasks', json={'title': 'Tarefa'}, headers=auth_headers)
+        first = client.get('/api/tasks', headers=auth_headers)
+        
+        with patch('app.routes.tasks.TaskService.get_user_task_rows') as get_user_task_rows:
+            second = client.get('/api/tasks', headers=auth_headers)
+            get_user_task_rows.assert_not_called()
+        
+        assert second.status_code == 200
+        assert second.get_data() == first.get_data()
+        assert second.headers['ETag'] == first.headers['ETag']
+        with app.app_context():
+            assert get_task_list_cache().stats()['hits'] == 1
+    
+    def test_list_tasks_cache_invalidated_by_writes(self, client, auth_headers):
+        """Testa que criar, atualizar e eliminar invalidam a cache"""
+        client.get('/api/tasks', headers=auth_headers)
+        task_id = client.post('/api/tasks', json={'title': 'Nova'}, headers=auth_headers).get_json()['task']['id']
+        assert client.get('/api/tasks', headers=auth_headers).get_json()['total'] == 1
+        
+        client.put(f'/api/tasks/{task_id}', json={'completed': True}, headers=auth_headers)
+        assert client.get('/api/tasks', headers=auth_headers).get_json()['tasks'][0]['completed'] is True
+        
+        client.delete(f'/api/tasks/{task_id}', headers=auth_headers)
+        assert client.get('/api/tasks', headers=auth_headers).get_json()['total'] == 0
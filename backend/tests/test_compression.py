@@ -0,0 +1,94 @@
+"""Testes para o middleware de compressão das respostas"""
+import gzip
+import json
+import zlib
+import pytest
+from unittest.mock import patch
+from app.middleware.compression import get_compression_metrics
+
+@pytest.fixture
+def many_tasks(client, auth_headers):
+    """Cria tarefas suficientes para a listagem passar o limiar de compressão"""
+    client.post('/api/tasks/import', json=[
+        {'title': f'Tarefa {i}', 'description': 'Descrição repetida ' * 5} for i in range(30)
+    ], headers=auth_headers)
+
+@pytest.mark.integration
+@pytest.mark.app
+class TestCompression:
+    """Testes da compressão gzip/brotli"""
+    
+    def test_gzip_large_response(self, client, auth_headers, many_tasks, app):
+        """Testa compressão gzip de uma listagem grande"""
+        plain = client.get('/api/tasks', headers=auth_headers)
+        response = client.get('/api/tasks', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        body = gzip.decompress(response.get_data())
+        assert body == plain.get_data()
+        assert len(response.get_data()) < len(body)
+        with app.app_context():
+            stats = get_compression_metrics().stats()
+        assert stats['bytes_saved'] > 0
+        assert stats['encodings'] == {'gzip': 1}
+    
+    def test_small_response_not_compressed(self, client, auth_headers):
+        """Testa que respostas abaixo do limiar não são comprimidas"""
+        response = client.get('/api/tasks', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+        
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['total'] == 0
+    
+    def test_no_accept_encoding(self, client, auth_headers, many_tasks):
+        """Testa que sem Accept-Encoding a resposta não é comprimida"""
+        response = client.get('/api/tasks', headers=auth_headers)
+        
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['total'] == 30
+    
+    def test_etag_per_encoding_and_not_modified(self, client, auth_headers, many_tasks):
+        """Testa ETag distinta para a variante gzip e 304 com essa ETag"""
+        headers = {**auth_headers, 'Accept-Encoding': 'gzip'}
+        plain_etag = client.get('/api/tasks', headers=auth_headers).headers['ETag']
+        gzip_etag = client.get('/api/tasks', headers=headers).headers['ETag']
+        
+        assert gzip_etag != plain_etag
+        assert gzip_etag.strip('"').endswith('-gzip')
+        
+        response = client.get('/api/tasks', headers={**headers, 'If-None-Match': gzip_etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == gzip_etag
+    
+    def test_streamed_export_compressed(self, client, auth_headers, many_tasks):
+        """Testa compressão de uma resposta em streaming"""
+        response = client.get('/api/tasks/export', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        lines = zlib.decompress(response.get_data(), 16 + zlib.MAX_WBITS).decode('utf-8').splitlines()
+        assert len(lines) == 30
+        assert json.loads(lines[0])['title'].startswith('Tarefa')
+    
+    def test_brotli_preferred_when_available(self, client, auth_headers, many_tasks):
+        """Testa negociação brotli quando o pacote está disponível"""
+        class FakeBrotli:
+            @staticmethod
+            def compress(data, quality):
+                return b'br:' + data[:10]
+        
+        with patch('app.middleware.compression.brotli', FakeBrotli):
+            response = client.get('/api/tasks', headers={**auth_headers, 'Accept-Encoding': 'gzip, br'})
+        
+        assert response.headers['Content-Encoding'] == 'br'
+        assert response.get_data().startswith(b'br:')
+    
+    def test_compression_disabled(self, app):
+        """Testa que COMPRESS_ENABLED=False não regista o middleware"""
+        from app import create_app
+        from tests.conftest import TestConfig
+        
+        class NoCompressionConfig(TestConfig):
+            COMPRESS_ENABLED = False
+        
+        assert 'compression_metrics' not in create_app(NoCompressionConfig).extensions
@@ -3,6 +3,7 @@ import pytest
 from app.exceptions.custom_exceptions import (
     ValidationException,
     DatabaseException,
+    ServiceUnavailableException,
     AppException
 )
 from app.enums.error_codes import ErrorCode
@@ -39,6 +40,13 @@ class TestCustomExceptions:
         assert exc.message == "Erro ao conectar"
         assert exc.details == {"error": "timeout"}
     
+    def test_service_unavailable_exception_default(self):
+        """Testa ServiceUnavailableException com valores padrão"""
+        exc = ServiceUnavailableException()
+        assert exc.error_code == ErrorCode.SERVICE_UNAVAILABLE
+        assert exc.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert exc.retry_after == 1
+    
     def test_app_exception_to_dict(self):
         """Testa conversão de exceção para dicionário"""
         exc = AppException(
@@ -2,8 +2,13 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from app.utils.decorators import get_current_user, require_auth
+from app.utils.token_blocklist import get_token_blocklist
+from app.utils.cache import FileCacheBackend
+from app.utils.principal import Principal, UserRecord, get_cached_user, setup_user_cache
 from app.models.user import User
+from app import db
 from flask_jwt_extended import create_access_token
+from sqlalchemy import event
 
 @pytest.mark.unit
 @pytest.mark.decorators
@@ -46,3 +51,97 @@ class TestDecorators:
                 data = response.get_json()
                 assert 'Utilizador não encontrado' in data['message']
 
+    
+    def test_require_auth_without_database_query(self, app, test_user):
+        """Testa que require_auth não vai à BD com a conta em cache"""
+        with app.app_context():
+            token = create_access_token(identity=test_user.id, additional_claims={'username': 'testuser'})
+            
+            @app.route('/test-require-auth-principal')
+            @require_auth
+            def test_route(current_user):
+                return {'id': current_user.id, 'username': current_user.username,
+                        'principal': isinstance(current_user, Principal)}
+            
+            # Carregamento inicial da lista de revogados (uma vez por worker)
+            get_token_blocklist().sync(force=True)
+            # Primeiro pedido: a conta é lida e fica em cache
+            with app.test_client() as client:
+                client.get('/test-require-auth-principal', headers={'Authorization': f'Bearer {token}'})
+            
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                with app.test_client() as client:
+                    response = client.get(
+                        '/test-require-auth-principal',
+                        headers={'Authorization': f'Bearer {token}'}
+                    )
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+            
+            assert response.get_json() == {'id': test_user.id, 'username': 'testuser', 'principal': True}
+            assert statements == []
+    
+    def test_user_cache_invalidated_on_change(self, app, test_user):
+        """Testa que a cache de utilizadores é invalidada ao alterar ou eliminar a conta"""
+        with app.app_context():
+            assert get_cached_user(test_user.id).email == 'test@example.com'
+            
+            user = db.session.get(User, test_user.id)
+            user.email = 'novo@example.com'
+            db.session.commit()
+            assert get_cached_user(test_user.id).email == 'novo@example.com'
+            
+            db.session.delete(user)
+            db.session.commit()
+            assert get_cached_user(test_user.id) is None
+    
+    def test_user_cache_invalidated_after_commit(self, app, test_user):
+        """Testa que a cache só é invalidada depois do commit (não no flush nem no rollback)"""
+        with app.app_context():
+            cache = app.extensions['user_cache']
+            get_cached_user(test_user.id)
+            
+            user = db.session.get(User, test_user.id)
+            user.email = 'revertido@example.com'
+            db.session.flush()
+            assert cache.get(str(test_user.id), 'user') is not None
+            db.session.rollback()
+            assert cache.get(str(test_user.id), 'user') is not None
+            
+            user.email = 'novo@example.com'
+            db.session.flush()
+            assert cache.get(str(test_user.id), 'user') is not None
+            db.session.commit()
+            assert cache.get(str(test_user.id), 'user') is None
+    
+    def test_require_auth_deleted_account(self, app, client, auth_headers):
+        """Testa que o token de uma conta eliminada deixa de ser aceite"""
+        assert client.get('/api/tasks', headers=auth_headers).status_code == 200
+        with app.app_context():
+            db.session.delete(User.query.filter_by(username='testuser').one())
+            db.session.commit()
+        
+        response = client.post('/api/tasks', json={'title': 'Órfã'}, headers=auth_headers)
+        
+        assert response.status_code == 404
+        assert response.get_json()['message'] == 'Utilizador não encontrado'
+    
+    def test_user_cache_shared_between_workers(self, app, test_user, tmp_path):
+        """Testa que com o backend file a invalidação chega aos outros workers"""
+        app.config.update(AUTH_USER_CACHE_BACKEND='file', TASK_CACHE_DIR=str(tmp_path))
+        with app.app_context():
+            setup_user_cache(app)
+            record = get_cached_user(test_user.id)
+            # Outro worker: outra instância sobre o mesmo diretório
+            other_worker = FileCacheBackend(str(tmp_path / 'users'), ttl=60)
+            assert UserRecord.decode(other_worker.get(str(test_user.id), 'user')) == record
+            
+            user = db.session.get(User, test_user.id)
+            user.email = 'novo@example.com'
+            db.session.commit()
+            
+            assert other_worker.get(str(test_user.id), 'user') is None
+            assert get_cached_user(test_user.id).email == 'novo@example.com'
@@ -81,3 +81,16 @@ class TestErrorHandler:
             assert 'Erro interno do servidor' in data['message']
             assert data['error_code'] is not None
 
+    
+    def test_http_exception_keeps_status(self, app):
+        """Testa que erros HTTP (ex: 405) não são convertidos em 500"""
+        register_error_handlers(app)
+        
+        @app.route('/test-405-error', methods=['POST'])
+        def test_405_error():
+            return {'message': 'ok'}
+        
+        with app.test_client() as client:
+            response = client.get('/test-405-error')
+            
+            assert response.status_code == 405
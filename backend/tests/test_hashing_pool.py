@@ -0,0 +1,112 @@
+"""Testes para o pool de hashing de palavras-passe"""
+import threading
+import pytest
+from unittest.mock import patch
+from app.utils.hashing_pool import HASHING_POOL_EXTENSION, HashingPool, get_hashing_pool, setup_hashing_pool
+from app.utils.security import get_password_hash, verify_password
+from app.exceptions.custom_exceptions import ServiceUnavailableException
+
+@pytest.mark.unit
+@pytest.mark.auth
+class TestHashingPool:
+    """Testes para o executor de bcrypt"""
+    
+    def test_inline_mode(self):
+        """Testa execução na própria thread com pool_size=0"""
+        pool = HashingPool(pool_size=0, queue_size=1)
+        hashed = pool.run(get_password_hash, 'segredo123')
+        
+        assert pool.run(verify_password, 'segredo123', hashed) is True
+        assert pool.stats()['completed'] == 2
+    
+    def test_process_pool(self):
+        """Testa hash e verificação num processo separado"""
+        pool = HashingPool(pool_size=1, queue_size=1, timeout=30)
+        try:
+            hashed = pool.run(get_password_hash, 'segredo123')
+            assert verify_password('segredo123', hashed)
+            assert pool.run(verify_password, 'errada', hashed) is False
+        finally:
+            pool.shutdown()
+    
+    def test_rejects_when_queue_full(self):
+        """Testa falha imediata quando todos os lugares estão ocupados"""
+        pool = HashingPool(pool_size=0, queue_size=0, retry_after=3)
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow():
+            started.set()
+            release.wait(5)
+        
+        worker = threading.Thread(target=pool.run, args=(slow,))
+        worker.start()
+        started.wait(5)
+        try:
+            with pytest.raises(ServiceUnavailableException) as exc_info:
+                pool.run(get_password_hash, 'segredo123')
+            assert exc_info.value.retry_after == 3
+            assert pool.stats()['rejected'] == 1
+        finally:
+            release.set()
+            worker.join()
+    
+    def test_login_returns_503_with_retry_after(self, client, app):
+        """Testa 503 + Retry-After no login quando o pool está sobrecarregado"""
+        client.post('/api/auth/register', json={
+            'username': 'burst', 'email': 'burst@example.com', 'password': 'Password123'
+        })
+        with app.app_context():
+            pool = get_hashing_pool()
+        
+        error = ServiceUnavailableException(retry_after=2)
+        with patch.object(pool, 'run', side_effect=error):
+            response = client.post('/api/auth/login', json={'username': 'burst', 'password': 'Password123'})
+        
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '2'
+        assert response.get_json()['error_code'] == 'SERVICE_UNAVAILABLE'
+    
+    def test_login_returns_503_inline_when_busy(self, client, app):
+        """Testa que o modo inline também limita os hashes em simultâneo"""
+        client.post('/api/auth/register', json={
+            'username': 'inline', 'email': 'inline@example.com', 'password': 'Password123'
+        })
+        pool = HashingPool(pool_size=0, queue_size=0, retry_after=2)
+        app.extensions[HASHING_POOL_EXTENSION] = pool
+        
+        # Um hash em curso noutra thread ocupa o único lugar do worker
+        pool._slots.acquire()
+        try:
+            response = client.post('/api/auth/login', json={'username': 'inline', 'password': 'Password123'})
+        finally:
+            pool._slots.release()
+        
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '2'
+        assert client.post('/api/auth/login', json={
+            'username': 'inline', 'password': 'Password123'
+        }).status_code == 200
+    
+    def test_setup_defaults_to_inline(self):
+        """Testa que, sem configuração, o bcrypt corre na thread do pedido"""
+        from flask import Flask
+        pool = setup_hashing_pool(Flask(__name__))
+        
+        assert pool.pool_size == 0
+        pool.warm_up(4)
+        assert pool._executor is None
+    
+    def test_warm_up_starts_processes(self):
+        """Testa que o aquecimento arranca os processos sem esperar por eles"""
+        pool = HashingPool(pool_size=1, queue_size=1, timeout=30)
+        try:
+            pool.warm_up(4)
+            assert pool._executor is not None
+            assert pool.run(verify_password, 'segredo123', get_password_hash('segredo123', 4)) is True
+        finally:
+            pool.shutdown()
+        
+        inline = HashingPool(pool_size=0, queue_size=1)
+        inline.warm_up(4)
+        assert inline._executor is None
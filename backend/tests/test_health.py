@@ -0,0 +1,126 @@
+"""Testes para as sondas de liveness e readiness"""
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+from app import create_app, db
+from app.utils.health import READINESS_PROBE_EXTENSION, ReadinessProbe, pool_saturation
+from app.utils.migrations import get_head_revision, stamp_database
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def statements(app):
+    """Lista das queries executadas na base de dados durante o teste"""
+    executed = []
+    
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', record)
+
+@pytest.mark.unit
+@pytest.mark.app
+class TestHealthProbes:
+    """Testes para /livez e /readyz"""
+    
+    def test_livez_does_no_io(self, client, statements):
+        """Testa que a liveness não executa queries"""
+        response = client.get('/livez')
+        
+        assert response.status_code == 200
+        assert response.get_json() == {'status': 'alive'}
+        assert statements == []
+    
+    def test_readyz_ready_when_migrated(self, app, client):
+        """Testa readiness com a BD na revisão mais recente"""
+        stamp_database()
+        
+        response = client.get('/readyz')
+        
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['status'] == 'ready'
+        assert data['database']['status'] == 'connected'
+        assert data['migrations'] == {'current': get_head_revision(), 'head': get_head_revision(), 'up_to_date': True}
+    
+    def test_readyz_not_ready_without_migrations(self, client):
+        """Testa 503 quando a BD não está versionada pelo Alembic"""
+        response = client.get('/readyz')
+        
+        data = response.get_json()
+        assert response.status_code == 503
+        assert data['status'] == 'not_ready'
+        assert data['database']['status'] == 'connected'
+        assert data['migrations']['up_to_date'] is False
+    
+    def test_readyz_caches_db_result(self, app, client, statements):
+        """Testa que pedidos seguidos reutilizam a verificação (uma query por TTL)"""
+        stamp_database()
+        statements.clear()
+        
+        for _ in range(5):
+            assert client.get('/readyz').status_code == 200
+        
+        assert len(statements) == 1
+        assert app.extensions[READINESS_PROBE_EXTENSION].stats() == {'probes': 1, 'cache_hits': 4}
+    
+    def test_probe_flood_runs_single_query(self):
+        """Testa que threads em simultâneo, sem resultado em cache, fazem uma só verificação"""
+        probe = ReadinessProbe(ttl=60)
+        calls = []
+        
+        def slow_probe():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'database': {'status': 'connected'}, 'migrations': None}
+        
+        results = []
+        with patch.object(probe, '_probe', side_effect=slow_probe):
+            threads = [threading.Thread(target=lambda: results.append(probe.check()[0])) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert len(calls) == 1
+        assert len(results) == 20 and all(result is not None for result in results)
+    
+    def test_probe_refreshes_after_ttl(self):
+        """Testa nova verificação após o TTL e nenhuma com refresh=False"""
+        probe = ReadinessProbe(ttl=0)
+        
+        with patch.object(probe, '_probe', return_value={'database': {'status': 'connected'}}) as mock_probe:
+            assert probe.check(refresh=False) == (None, None)
+            probe.check()
+            probe.check()
+            probe.check(refresh=False)
+        
+        assert mock_probe.call_count == 2
+    
+    def test_pool_saturation(self, tmp_path):
+        """Testa a ocupação do pool com todas as ligações em uso"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0)
+        try:
+            assert pool_saturation(engine.pool)['saturated'] is False
+            with engine.connect():
+                saturation = pool_saturation(engine.pool)
+            assert saturation == {'in_use': 1, 'capacity': 1, 'saturation': 1.0, 'saturated': True}
+        finally:
+            engine.dispose()
+    
+    def test_probes_exempt_from_rate_limit(self):
+        """Testa que as sondas não contam para o limite global"""
+        class LimitedConfig(TestConfig):
+            RATELIMIT_ENABLED = True
+            RATELIMIT_DEFAULT = '1 per minute'
+            RATELIMIT_STORAGE_URI = 'memory://'
+        
+        app = create_app(LimitedConfig)
+        client = app.test_client()
+        
+        assert [client.get('/livez').status_code for _ in range(3)] == [200, 200, 200]
+        assert [client.get('/readyz').status_code for _ in range(3)] == [503, 503, 503]
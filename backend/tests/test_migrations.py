@@ -0,0 +1,132 @@
+"""Testes para as migrações Alembic"""
+import pytest
+from sqlalchemy import inspect
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from app import create_app, db
+from app.utils.migrations import (
+    upgrade_database,
+    get_current_revision,
+    get_head_revision,
+    include_object
+)
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def file_app(tmp_path):
+    """Aplicação com base de dados SQLite em ficheiro e sem create_all"""
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'migrations.db'}"
+        DB_AUTO_CREATE = False
+    
+    app = create_app(FileConfig)
+    with app.app_context():
+        yield app
+        db.engine.dispose()
+
+@pytest.mark.integration
+@pytest.mark.app
+class TestMigrations:
+    """Testes para o esquema gerido pelo Alembic"""
+    
+    def test_boot_skips_create_all(self, file_app):
+        """Testa que o arranque não cria tabelas quando DB_AUTO_CREATE está desligado"""
+        assert inspect(db.engine).get_table_names() == []
+    
+    def test_upgrade_creates_composite_index(self, file_app):
+        """Testa que as migrações criam o índice composto da listagem"""
+        upgrade_database()
+        
+        indexes = {ix['name']: ix['column_names'] for ix in inspect(db.engine).get_indexes('tasks')}
+        assert indexes['ix_tasks_user_id_created_at_id'] == ['user_id', 'created_at', 'id']
+        assert 'ix_tasks_user_id' not in indexes
+    
+    def test_upgrade_matches_models(self, file_app):
+        """Testa que as migrações produzem o mesmo esquema que os modelos"""
+        upgrade_database()
+        
+        with db.engine.connect() as connection:
+            assert get_current_revision(connection) == get_head_revision()
+            context = MigrationContext.configure(
+                connection, opts={'include_object': include_object}
+            )
+            diff = compare_metadata(context, db.metadata)
+        
+        assert diff == []
+    
+    def test_upgrade_creates_search_index(self, file_app):
+        """Testa que a migração de pesquisa indexa tarefas já existentes"""
+        upgrade_database(revision='0003')
+        with db.engine.begin() as connection:
+            connection.execute(db.text(
+                "INSERT INTO users (id, username, email, hashed_password) VALUES (1, 'u', 'u@e.pt', 'x')"
+            ))
+            connection.execute(db.text(
+                "INSERT INTO tasks (title, completed, user_id) VALUES ('Tarefa antiga', 0, 1)"
+            ))
+        
+        upgrade_database()
+        
+        with db.engine.connect() as connection:
+            count = connection.execute(db.text(
+                "SELECT count(*) FROM tasks_fts WHERE tasks_fts MATCH 'antiga'"
+            )).scalar()
+        assert count == 1
+    
+    def test_upgrade_backfills_task_stats(self, file_app):
+        """Testa que a migração de estatísticas preenche os contadores"""
+        upgrade_database(revision='0006')
+        with db.engine.begin() as connection:
+            connection.execute(db.text(
+                "INSERT INTO users (id, username, email, hashed_password) VALUES (1, 'u', 'u@e.pt', 'x')"
+            ))
+            connection.execute(db.text(
+                "INSERT INTO tasks (title, completed, created_at, user_id) VALUES "
+                "('A', 1, '2024-01-01 10:00:00', 1), ('B', 0, '2024-01-01 11:00:00', 1), "
+                "('C', 0, '2024-01-02 09:00:00', 1)"
+            ))
+        
+        upgrade_database()
+        
+        with db.engine.connect() as connection:
+            totals = connection.execute(db.text(
+                "SELECT total, completed FROM task_stats WHERE user_id = 1"
+            )).one()
+            days = connection.execute(db.text(
+                "SELECT day, total, completed FROM task_daily_stats ORDER BY day"
+            )).all()
+        assert tuple(totals) == (3, 1)
+        assert [tuple(row) for row in days] == [('2024-01-01', 2, 1), ('2024-01-02', 1, 0)]
+    
+    def test_upgrade_legacy_database(self, file_app):
+        """Testa upgrade de base de dados criada com create_all antes das migrações"""
+        with db.engine.begin() as connection:
+            connection.execute(db.text(
+                'CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL, '
+                'email VARCHAR(120) NOT NULL, hashed_password VARCHAR(255) NOT NULL, created_at DATETIME)'
+            ))
+            connection.execute(db.text(
+                'CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, '
+                'description TEXT, completed BOOLEAN NOT NULL, created_at DATETIME, '
+                'updated_at DATETIME, user_id INTEGER NOT NULL REFERENCES users(id))'
+            ))
+            connection.execute(db.text('CREATE INDEX ix_tasks_user_id ON tasks (user_id)'))
+        
+        upgrade_database()
+        
+        indexes = [ix['name'] for ix in inspect(db.engine).get_indexes('tasks')]
+        assert 'ix_tasks_user_id_created_at_id' in indexes
+        with db.engine.connect() as connection:
+            assert get_current_revision(connection) == get_head_revision()
+    
+    def test_auto_create_stamps_head(self, tmp_path):
+        """Testa que create_all em desenvolvimento marca a revisão mais recente"""
+        class AutoCreateConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'auto.db'}"
+            DB_AUTO_CREATE = True
+        
+        app = create_app(AutoCreateConfig)
+        with app.app_context():
+            with db.engine.connect() as connection:
+                assert get_current_revision(connection) == get_head_revision()
+            db.engine.dispose()
@@ -0,0 +1,97 @@
+"""Testes para o armazenamento partilhado do rate limiting"""
+import threading
+import pytest
+from unittest.mock import patch
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+from app import create_app, db
+from app.middleware.rate_limit_storage import SQLiteStorage
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def storage_uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'ratelimit.db'}"
+
+@pytest.mark.unit
+@pytest.mark.middleware
+class TestSQLiteStorage:
+    """Testes para o backend SQLite (WAL) do rate limiting"""
+    
+    def test_registered_scheme(self, storage_uri):
+        """Testa que o esquema sqlite:// cria o backend partilhado"""
+        storage = storage_from_string(storage_uri)
+        
+        assert isinstance(storage, SQLiteStorage)
+        assert storage.check() is True
+    
+    def test_requires_file(self):
+        """Testa que uma base de dados em memória é rejeitada (não é partilhada)"""
+        with pytest.raises(ValueError):
+            SQLiteStorage('sqlite://')
+    
+    def test_incr_shared_between_instances(self, storage_uri):
+        """Testa que instâncias diferentes (workers) partilham os contadores"""
+        worker_a = SQLiteStorage(storage_uri)
+        worker_b = SQLiteStorage(storage_uri)
+        
+        worker_a.incr('chave', 60)
+        worker_b.incr('chave', 60)
+        
+        assert worker_a.get('chave') == 2
+        assert worker_b.get_expiry('chave') > 0
+    
+    def test_incr_is_atomic(self, storage_uri):
+        """Testa incrementos concorrentes (uma ligação por thread)"""
+        storage = SQLiteStorage(storage_uri)
+        
+        def hit():
+            for _ in range(50):
+                storage.incr('concorrente', 60)
+        
+        threads = [threading.Thread(target=hit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert storage.get('concorrente') == 400
+    
+    def test_expired_counter_restarts(self, storage_uri):
+        """Testa que um contador expirado recomeça do zero"""
+        storage = SQLiteStorage(storage_uri)
+        with patch('app.middleware.rate_limit_storage.time.time', return_value=1000.0):
+            storage.incr('janela', 10, amount=5)
+        with patch('app.middleware.rate_limit_storage.time.time', return_value=1011.0):
+            assert storage.get('janela') == 0
+            assert storage.incr('janela', 10) == 1
+    
+    def test_sliding_window_weights_previous_window(self, storage_uri):
+        """Testa que a janela anterior conta proporcionalmente ao tempo restante"""
+        limiter = SlidingWindowCounterRateLimiter(SQLiteStorage(storage_uri))
+        item = parse('10 per minute')
+        
+        with patch('app.middleware.rate_limit_storage.time.time', return_value=6000.0):
+            assert all(limiter.hit(item, 'ip') for _ in range(10))
+            assert limiter.hit(item, 'ip') is False
+        
+        # A meio da janela seguinte ainda contam 5 dos 10 pedidos anteriores
+        with patch('app.middleware.rate_limit_storage.time.time', return_value=6090.0):
+            assert sum(limiter.hit(item, 'ip') for _ in range(10)) == 5
+    
+    def test_limiter_uses_shared_storage(self, storage_uri):
+        """Testa o limite global da aplicação com o backend partilhado"""
+        class LimitedConfig(TestConfig):
+            RATELIMIT_ENABLED = True
+            RATELIMIT_DEFAULT = '3 per minute'
+            RATELIMIT_STORAGE_URI = storage_uri
+        
+        app = create_app(LimitedConfig)
+        with app.app_context():
+            db.create_all()
+            client = app.test_client()
+            statuses = [client.get('/health').status_code for _ in range(4)]
+            
+            assert statuses == [200, 200, 200, 429]
+            assert app.extensions['rate_limit_storage'].stats()['checks'] == 4
+            db.drop_all()
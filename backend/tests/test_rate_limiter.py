@@ -1,7 +1,14 @@
 """Testes para rate limiter"""
 import pytest
-from app.middleware.rate_limiter import setup_rate_limiter, rate_limit
 from flask import Flask
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.middleware.rate_limiter import (
+    ROUTE_RATE_LIMITER_EXTENSION, RouteRateLimiter, rate_limit, setup_rate_limiter
+)
+from app.middleware.rate_limit_storage import MemoryGCRAStore, gcra_step
+from app.utils.decorators import require_auth
+from tests.conftest import TestConfig
 
 @pytest.mark.unit
 @pytest.mark.middleware
@@ -54,3 +61,61 @@ class TestRateLimiter:
             assert response.status_code == 200
             assert response.get_json() is not None
 
+    
+    def test_gcra_step_burst_then_spacing(self):
+        """Testa o GCRA: rajada até ao limite e depois um pedido por intervalo"""
+        tat = None
+        results = []
+        for _ in range(4):
+            result, new_tat = gcra_step(tat, 1000.0, limit=3, period=60)
+            results.append(result)
+            tat = new_tat if new_tat is not None else tat
+        
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert results[3].retry_after == pytest.approx(20.0)
+        
+        result, _ = gcra_step(tat, 1020.0, limit=3, period=60)
+        assert result.allowed is True
+    
+    def test_login_rate_limited_with_headers(self, tmp_path):
+        """Testa 429 + Retry-After + RateLimit-* no login"""
+        class LimitedConfig(TestConfig):
+            RATELIMIT_ENABLED = True
+            RATELIMIT_DEFAULT = '1000 per hour'
+            RATELIMIT_STORAGE_URI = f"sqlite:///{tmp_path / 'ratelimit.db'}"
+            RATELIMIT_LOGIN = '2 per minute'
+        
+        app = create_app(LimitedConfig)
+        with app.app_context():
+            db.create_all()
+            client = app.test_client()
+            credentials = {'username': 'ninguem', 'password': 'errada123'}
+            responses = [client.post('/api/auth/login', json=credentials) for _ in range(3)]
+            db.drop_all()
+        
+        assert [r.status_code for r in responses] == [401, 401, 429]
+        assert responses[0].headers['RateLimit-Limit'] == '2'
+        assert responses[0].headers['RateLimit-Remaining'] == '1'
+        assert responses[0].headers['RateLimit-Policy'] == '2;w=60'
+        assert responses[2].headers['Retry-After'] == '30'
+        assert responses[2].get_json()['error_code'] == 'RATE_LIMIT_EXCEEDED'
+    
+    def test_rate_limit_per_user(self, app, test_user, another_user):
+        """Testa que o limite por utilizador não é partilhado entre contas"""
+        app.extensions[ROUTE_RATE_LIMITER_EXTENSION] = RouteRateLimiter(MemoryGCRAStore())
+        
+        @app.route('/test-rate-limit-user')
+        @require_auth
+        @rate_limit('1 per minute')
+        def test_route(current_user):
+            return {'id': current_user.id}
+        
+        with app.test_client() as client:
+            def get(user_id):
+                token = create_access_token(identity=user_id)
+                return client.get('/test-rate-limit-user', headers={'Authorization': f'Bearer {token}'})
+            
+            assert get(test_user.id).status_code == 200
+            assert get(another_user.id).status_code == 200
+            assert get(test_user.id).status_code == 429
@@ -0,0 +1,118 @@
+"""Testes para SearchService (pesquisa full-text via FTS5 no SQLite)"""
+import pytest
+from app import db
+from app.models.task import Task
+from app.schemas.task import TaskSearchQuery
+from app.services.search_service import SearchService
+from app.exceptions.custom_exceptions import ValidationException
+
+@pytest.mark.unit
+@pytest.mark.tasks
+class TestSearchService:
+    """Testes para o serviço de pesquisa"""
+    
+    def test_search_matches_title_and_description(self, app, test_user):
+        """Testa pesquisa em título e descrição"""
+        with app.app_context():
+            db.session.add_all([
+                Task(title='Comprar leite', user_id=test_user.id),
+                Task(title='Ligar ao banco', description='Pedir extrato do leite', user_id=test_user.id),
+                Task(title='Ir ao ginásio', user_id=test_user.id)
+            ])
+            db.session.commit()
+            
+            results, next_cursor = SearchService.search_tasks(test_user, TaskSearchQuery(q='leite'))
+            
+            titles = [task.title for task, _, _ in results]
+            assert titles == ['Comprar leite', 'Ligar ao banco']
+            assert next_cursor is None
+            assert '<mark>leite</mark>' in results[0][2]
+    
+    def test_search_snippet_escapes_html(self, app, test_user):
+        """Testa que o excerto escapa o HTML do texto da tarefa"""
+        with app.app_context():
+            db.session.add(Task(title='alpha <img src=x onerror=alert(1)> beta', user_id=test_user.id))
+            db.session.commit()
+            
+            results, _ = SearchService.search_tasks(test_user, TaskSearchQuery(q='alpha'))
+            
+            snippet = results[0][2]
+            assert snippet.startswith('<mark>alpha</mark>')
+            assert '&lt;img src=x onerror=alert(1)&gt;' in snippet
+            assert '<img' not in snippet
+    
+    def test_search_ignores_accents(self, app, test_user):
+        """Testa que a pesquisa ignora acentos"""
+        with app.app_context():
+            db.session.add(Task(title='Reunião semanal', user_id=test_user.id))
+            db.session.commit()
+            
+            results, _ = SearchService.search_tasks(test_user, TaskSearchQuery(q='reuniao'))
+            
+            assert len(results) == 1
+    
+    def test_search_only_user_tasks(self, app, test_user, another_user):
+        """Testa isolamento entre utilizadores"""
+        with app.app_context():
+            db.session.add_all([
+                Task(title='Relatório', user_id=test_user.id),
+                Task(title='Relatório', user_id=another_user.id)
+            ])
+            db.session.commit()
+            
+            results, _ = SearchService.search_tasks(test_user, TaskSearchQuery(q='relatório'))
+            
+            assert [task.user_id for task, _, _ in results] == [test_user.id]
+    
+    def test_search_reflects_updates_and_deletes(self, app, test_user):
+        """Testa que o índice acompanha alterações e eliminações"""
+        with app.app_context():
+            task = Task(title='Rascunho', user_id=test_user.id)
+            db.session.add(task)
+            db.session.commit()
+            
+            task.title = 'Versão final'
+            db.session.commit()
+            assert SearchService.search_tasks(test_user, TaskSearchQuery(q='rascunho'))[0] == []
+            assert len(SearchService.search_tasks(test_user, TaskSearchQuery(q='final'))[0]) == 1
+            
+            db.session.delete(task)
+            db.session.commit()
+            assert SearchService.search_tasks(test_user, TaskSearchQuery(q='final'))[0] == []
+    
+    def test_search_cursor_pagination(self, app, test_user):
+        """Testa paginação por cursor dos resultados"""
+        with app.app_context():
+            db.session.add_all([
+                Task(title=f'Projeto {i}', user_id=test_user.id) for i in range(5)
+            ])
+            db.session.commit()
+            
+            seen = []
+            cursor = None
+            while True:
+                results, cursor = SearchService.search_tasks(
+                    test_user, TaskSearchQuery(q='projeto', limit=2, cursor=cursor)
+                )
+                seen.extend(task.id for task, _, _ in results)
+                if cursor is None:
+                    break
+            
+            assert len(seen) == 5
+            assert len(set(seen)) == 5
+    
+    def test_search_operators_are_escaped(self, app, test_user):
+        """Testa que operadores FTS5 no texto não causam erros"""
+        with app.app_context():
+            db.session.add(Task(title='Tarefa normal', user_id=test_user.id))
+            db.session.commit()
+            
+            results, _ = SearchService.search_tasks(test_user, TaskSearchQuery(q='tarefa" OR NEAR(*'))
+            
+            assert results == []
+    
+    def test_search_without_terms(self, app, test_user):
+        """Testa pesquisa sem termos válidos"""
+        with app.app_context():
+            with pytest.raises(ValidationException):
+                SearchService.search_tasks(test_user, TaskSearchQuery(q='!!!'))
@@ -0,0 +1,100 @@
+"""Testes para a serialização rápida de linhas de tarefas"""
+import json
+import pytest
+from datetime import datetime
+from flask import jsonify
+from app import db
+from app.models.task import Task
+from app.services.task_service import TaskService
+from app.schemas.task import TaskListQuery
+from app.utils.serializers import (
+    compile_task_encoder, encode_task_list, encode_task_row_ndjson,
+    supports_fast_json, task_row_to_dict
+)
+
+@pytest.fixture
+def varied_tasks(app, test_user):
+    """Tarefas com acentos, aspas, barras, emoji e descrição nula"""
+    with app.app_context():
+        db.session.add_all([
+            Task(title='Ação "urgente" \\ já', description='Linha 1\nLinha 2 😀', completed=True,
+                 user_id=test_user.id, created_at=datetime(2024, 1, 1, 9, 30, 15, 123456)),
+            Task(title='</script>', description=None, user_id=test_user.id,
+                 created_at=datetime(2024, 1, 2))
+        ])
+        db.session.commit()
+
+@pytest.mark.unit
+@pytest.mark.tasks
+class TestSerializers:
+    """Testes de compatibilidade byte a byte com jsonify e json.dumps"""
+    
+    def test_task_list_matches_jsonify(self, app, test_user, varied_tasks):
+        """Testa que a listagem é igual à gerada com to_dict + jsonify"""
+        with app.test_request_context():
+            tasks = TaskService.get_user_tasks(test_user)
+            rows = TaskService.get_user_task_rows(test_user)
+            
+            expected = jsonify({
+                'message': 'Tarefas listadas com sucesso',
+                'tasks': [task.to_dict() for task in tasks],
+                'total': len(tasks)
+            }).get_data()
+            
+            assert supports_fast_json(app)
+            assert encode_task_list(rows, 'Tarefas listadas com sucesso') == expected
+            assert [task_row_to_dict(row) for row in rows] == [task.to_dict() for task in tasks]
+    
+    def test_task_list_with_cursor_matches_jsonify(self, app, test_user, varied_tasks):
+        """Testa a variante paginada (next_cursor nulo e preenchido)"""
+        with app.test_request_context():
+            rows = TaskService.get_user_task_rows(test_user)
+            for cursor in (None, 'abc_-123'):
+                expected = jsonify({
+                    'message': 'ok',
+                    'tasks': [task_row_to_dict(row) for row in rows],
+                    'total': len(rows),
+                    'next_cursor': cursor
+                }).get_data()
+                assert encode_task_list(rows, 'ok', next_cursor=cursor) == expected
+    
+    def test_ndjson_row_matches_json_dumps(self, app, test_user, varied_tasks):
+        """Testa que cada linha NDJSON é igual a json.dumps(to_dict, ensure_ascii=False)"""
+        with app.app_context():
+            tasks = TaskService.get_user_tasks(test_user)
+            rows = TaskService.get_user_task_rows(test_user)
+            
+            for task, row in zip(tasks, rows):
+                assert encode_task_row_ndjson(row) == json.dumps(task.to_dict(), ensure_ascii=False)
+    
+    def test_sparse_fields_match_jsonify_and_json_dumps(self, app, test_user, varied_tasks):
+        """Testa os codificadores compilados para um subconjunto de campos"""
+        with app.test_request_context():
+            query = TaskListQuery(fields='title,completed,updated_at')
+            fields = query.selected_fields
+            rows = TaskService.get_user_task_rows(test_user, query)
+            dicts = [task_row_to_dict(row, fields) for row in rows]
+            
+            assert fields == ('title', 'completed', 'updated_at')
+            assert all(len(row) == 3 for row in rows)
+            assert encode_task_list(rows, 'ok', fields=fields) == jsonify({
+                'message': 'ok', 'tasks': dicts, 'total': len(dicts)
+            }).get_data()
+            encode = compile_task_encoder(fields, ndjson=True)
+            assert [encode(row) for row in rows] == [json.dumps(d, ensure_ascii=False) for d in dicts]
+    
+    def test_fast_json_disabled_when_not_compact(self, app):
+        """Testa que a serialização rápida não é usada com JSON indentado"""
+        app.json.compact = False
+        assert not supports_fast_json(app)
+    
+    def test_list_route_falls_back_to_jsonify(self, app, client, auth_headers):
+        """Testa a rota de listagem com saída JSON não compacta"""
+        client.post('/api/tasks', json={'title': 'Tarefa'}, headers=auth_headers)
+        app.json.compact = False
+        
+        response = client.get('/api/tasks', headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert b'\n  "message"' in response.get_data()
+        assert response.get_json()['tasks'][0]['title'] == 'Tarefa'
@@ -0,0 +1,79 @@
+"""Testes para StatsService (contadores mantidos pelo TaskService)"""
+import pytest
+from datetime import datetime
+from app import db
+from app.models.task import Task
+from app.models.task_stats import TaskStats
+from app.schemas.task import TaskCreate, TaskUpdate, TaskBatchRequest
+from app.services.task_service import TaskService
+from app.services.stats_service import StatsService
+
+def _today():
+    return datetime.utcnow().date().isoformat()
+
+@pytest.mark.unit
+@pytest.mark.tasks
+class TestStatsService:
+    """Testes para o serviço de estatísticas"""
+    
+    def test_counters_follow_task_writes(self, app, test_user):
+        """Testa que criar, concluir e eliminar atualizam os contadores"""
+        with app.app_context():
+            first = TaskService.create_task(TaskCreate(title='Primeira'), test_user)
+            TaskService.create_task(TaskCreate(title='Segunda', completed=True), test_user)
+            TaskService.update_task(first.id, TaskUpdate(completed=True), test_user)
+            TaskService.update_task(first.id, TaskUpdate(completed=True), test_user)
+            TaskService.import_tasks([TaskCreate(title='Importada')], test_user)
+            TaskService.delete_task(first.id, test_user)
+            
+            stats = StatsService.get_stats(test_user)
+            
+            assert stats['source'] == 'counters'
+            assert (stats['total'], stats['completed'], stats['pending']) == (2, 1, 1)
+            assert stats['by_day'] == [{'day': _today(), 'total': 2, 'completed': 1, 'pending': 1}]
+    
+    def test_counters_follow_batch(self, app, test_user):
+        """Testa contadores num lote com criação, atualização e eliminação"""
+        with app.app_context():
+            kept = TaskService.create_task(TaskCreate(title='Mantida'), test_user)
+            removed = TaskService.create_task(TaskCreate(title='Removida', completed=True), test_user)
+            
+            TaskService.apply_batch(TaskBatchRequest(operations=[
+                {'op': 'create', 'data': {'title': 'Nova', 'completed': True}},
+                {'op': 'update', 'id': kept.id, 'data': {'completed': True}},
+                {'op': 'delete', 'id': removed.id}
+            ]), test_user)
+            
+            stats = StatsService.get_stats(test_user)
+            assert (stats['total'], stats['completed']) == (2, 2)
+    
+    def test_get_stats_group_by_fallback(self, app, test_user):
+        """Testa o cálculo com GROUP BY quando não há contadores"""
+        with app.app_context():
+            db.session.add_all([
+                Task(title='A', completed=True, user_id=test_user.id),
+                Task(title='B', user_id=test_user.id)
+            ])
+            db.session.commit()
+            
+            stats = StatsService.get_stats(test_user)
+            
+            assert stats['source'] == 'aggregate'
+            assert (stats['total'], stats['completed'], stats['pending']) == (2, 1, 1)
+            assert stats['by_day'][0]['day'] == _today()
+    
+    def test_reconcile_fixes_drift(self, app, test_user, another_user):
+        """Testa que a reconciliação corrige apenas contadores errados"""
+        with app.app_context():
+            TaskService.create_task(TaskCreate(title='Correta'), another_user)
+            TaskService.create_task(TaskCreate(title='Registada'), test_user)
+            db.session.add(Task(title='Fora do serviço', completed=True, user_id=test_user.id))
+            db.session.commit()
+            
+            assert StatsService.reconcile() == [test_user.id]
+            assert StatsService.reconcile() == []
+            
+            counters = db.session.get(TaskStats, test_user.id)
+            assert (counters.total, counters.completed) == (2, 1)
+            stats = StatsService.get_stats(test_user)
+            assert stats['by_day'] == [{'day': _today(), 'total': 2, 'completed': 1, 'pending': 1}]
@@ -1,6 +1,7 @@
 """Testes para rotas de tarefas"""
 import pytest
 import json
+import re
 from unittest.mock import patch
 
 @pytest.mark.integration
@@ -34,6 +35,414 @@ class TestTaskRoutes:
         assert json_data['total'] == 0
         assert len(json_data['tasks']) == 0
     
+    def test_list_tasks_paginated(self, client, auth_headers):
+        """Testa listagem paginada por cursor"""
+        for i in range(3):
+            client.post('/api/tasks', json={'title': f'Tarefa {i}'}, headers=auth_headers)
+        
+        first = client.get('/api/tasks?limit=2', headers=auth_headers).get_json()
+        assert len(first['tasks']) == 2
+        assert first['next_cursor'] is not None
+        
+        second = client.get(
+            f"/api/tasks?limit=2&cursor={first['next_cursor']}",
+            headers=auth_headers
+        ).get_json()
+        assert len(second['tasks']) == 1
+        assert second['next_cursor'] is None
+        
+        ids = [t['id'] for t in first['tasks'] + second['tasks']]
+        assert len(set(ids)) == 3
+    
+    def test_list_tasks_invalid_pagination(self, client, auth_headers):
+        """Testa parâmetros de paginação inválidos"""
+        response = client.get('/api/tasks?limit=0', headers=auth_headers)
+        assert response.status_code == 400
+        
+        response = client.get('/api/tasks?cursor=invalido', headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_list_tasks_filtered_and_sorted(self, client, auth_headers):
+        """Testa filtros e ordenação por query string"""
+        client.post('/api/tasks', json={'title': 'b', 'completed': True}, headers=auth_headers)
+        client.post('/api/tasks', json={'title': 'a'}, headers=auth_headers)
+        client.post('/api/tasks', json={'title': 'c'}, headers=auth_headers)
+        
+        response = client.get('/api/tasks?completed=false&sort=title&order=asc', headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert [t['title'] for t in response.get_json()['tasks']] == ['a', 'c']
+    
+    def test_list_tasks_invalid_sort(self, client, auth_headers):
+        """Testa ordenação inválida"""
+        response = client.get('/api/tasks?sort=password', headers=auth_headers)
+        
+        assert response.status_code == 400
+    
+    def test_search_tasks(self, client, auth_headers):
+        """Testa pesquisa full-text"""
+        client.post('/api/tasks', json={'title': 'Preparar apresentação'}, headers=auth_headers)
+        client.post('/api/tasks', json={'title': 'Outra coisa'}, headers=auth_headers)
+        
+        response = client.get('/api/tasks/search?q=apresentação', headers=auth_headers)
+        
+        assert response.status_code == 200
+        json_data = response.get_json()
+        assert json_data['total'] == 1
+        assert json_data['tasks'][0]['title'] == 'Preparar apresentação'
+        assert 'rank' in json_data['tasks'][0]
+        assert 'snippet' in json_data['tasks'][0]
+    
+    def test_search_tasks_missing_query(self, client, auth_headers):
+        """Testa pesquisa sem parâmetro q"""
+        response = client.get('/api/tasks/search', headers=auth_headers)
+        
+        assert response.status_code == 400
+    
+    def test_export_tasks_ndjson(self, client, auth_headers):
+        """Testa exportação em NDJSON por streaming"""
+        for i in range(3):
+            client.post('/api/tasks', json={'title': f'Tarefa {i}'}, headers=auth_headers)
+        
+        response = client.get('/api/tasks/export', headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'application/x-ndjson'
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)['title'] for line in lines] == ['Tarefa 2', 'Tarefa 1', 'Tarefa 0']
+    
+    def test_export_tasks_csv(self, client, auth_headers):
+        """Testa exportação em CSV com filtros"""
+        client.post('/api/tasks', json={'title': 'Aberta'}, headers=auth_headers)
+        client.post('/api/tasks', json={'title': 'Feita', 'completed': True}, headers=auth_headers)
+        
+        response = client.get('/api/tasks/export?format=csv&completed=true', headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert 'attachment' in response.headers['Content-Disposition']
+        lines = response.get_data(as_text=True).splitlines()
+        assert lines[0].startswith('id,title,description,completed')
+        assert len(lines) == 2
+        assert 'Feita' in lines[1]
+    
+    def test_export_tasks_invalid_format(self, client, auth_headers):
+        """Testa formato de exportação inválido"""
+        response = client.get('/api/tasks/export?format=xml', headers=auth_headers)
+        
+        assert response.status_code == 400
+    
+    def test_import_tasks_json_array(self, client, auth_headers):
+        """Testa importação em massa com array JSON e erros por item"""
+        items = [
+            {'title': 'Importada 1'},
+            {'title': ''},
+            {'title': 'Importada 2', 'completed': True},
+            'texto'
+        ]
+        
+        response = client.post('/api/tasks/import', json=items, headers=auth_headers)
+        
+        assert response.status_code == 201
+        json_data = response.get_json()
+        assert json_data['received'] == 4
+        assert json_data['imported'] == 2
+        assert json_data['failed'] == 2
+        assert [error['index'] for error in json_data['errors']] == [1, 3]
+        
+        tasks = client.get('/api/tasks', headers=auth_headers).get_json()['tasks']
+        assert sorted(t['title'] for t in tasks) == ['Importada 1', 'Importada 2']
+    
+    def test_import_tasks_ndjson(self, client, auth_headers):
+        """Testa importação em massa com NDJSON"""
+        body = '{"title": "Linha 1"}\n\n{"title": "Linha 2"}\n{invalido\n'
+        
+        response = client.post(
+            '/api/tasks/import',
+            data=body,
+            content_type='application/x-ndjson',
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 201
+        json_data = response.get_json()
+        assert json_data['imported'] == 2
+        assert json_data['failed'] == 1
+        assert json_data['errors'][0]['errors'][0]['type'] == 'json_invalid'
+    
+    def test_import_tasks_all_invalid(self, client, auth_headers):
+        """Testa importação sem nenhum item válido"""
+        response = client.post('/api/tasks/import', json=[{'title': ''}], headers=auth_headers)
+        
+        assert response.status_code == 400
+        assert response.get_json()['imported'] == 0
+    
+    def test_import_tasks_invalid_body(self, client, auth_headers):
+        """Testa importação com corpo que não é um array"""
+        response = client.post('/api/tasks/import', json={'title': 'x'}, headers=auth_headers)
+        assert response.status_code == 400
+        
+        response = client.post('/api/tasks/import', data='x', content_type='text/plain', headers=auth_headers)
+        assert response.status_code == 400
+        body = response.get_json()
+        assert body['error_code'] == 'VALIDATION_ERROR'
+        assert body['details'] == {'content_type': 'text/plain'}
+    
+    def test_batch_tasks(self, client, auth_headers):
+        """Testa lote com criação, atualização e eliminação"""
+        ids = [
+            client.post('/api/tasks', json={'title': f'Tarefa {i}'}, headers=auth_headers).get_json()['task']['id']
+            for i in range(3)
+        ]
+        
+        response = client.post('/api/tasks/batch', json={'operations': [
+            {'op': 'create', 'data': {'title': 'Nova'}},
+            {'op': 'update', 'id': ids[0], 'data': {'completed': True}},
+            {'op': 'update', 'id': ids[1], 'data': {'completed': True}},
+            {'op': 'update', 'id': ids[1], 'data': {'title': 'Renomeada'}},
+            {'op': 'delete', 'id': ids[2]}
+        ]}, headers=auth_headers)
+        
+        assert response.status_code == 200
+        json_data = response.get_json()
+        assert [t['title'] for t in json_data['created']] == ['Nova']
+        assert json_data['created'][0]['id'] is not None
+        assert [(t['id'], t['completed']) for t in json_data['updated']] == [(ids[0], True), (ids[1], True)]
+        assert json_data['updated'][1]['title'] == 'Renomeada'
+        assert json_data['deleted'] == [ids[2]]
+        assert client.get(f'/api/tasks/{ids[2]}', headers=auth_headers).status_code == 404
+    
+    def test_batch_tasks_statement_count(self, client, auth_headers, app):
+        """Testa que o lote não relê as tarefas (uma query por conjunto, sem N+1)"""
+        from sqlalchemy import event
+        from app import db
+        
+        ids = [
+            client.post('/api/tasks', json={'title': f'Tarefa {i}'}, headers=auth_headers).get_json()['task']['id']
+            for i in range(3)
+        ]
+        operations = [{'op': 'create', 'data': {'title': f'Nova {i}'}} for i in range(5)]
+        operations += [{'op': 'update', 'id': task_id, 'data': {'completed': True}} for task_id in ids[:2]]
+        operations.append({'op': 'delete', 'id': ids[2]})
+        
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            response = client.post('/api/tasks/batch', json={'operations': operations}, headers=auth_headers)
+        finally:
+            with app.app_context():
+                event.remove(db.engine, 'before_cursor_execute', listener)
+        
+        assert response.status_code == 200
+        json_data = response.get_json()
+        assert len(json_data['created']) == 5
+        assert all(t['created_at'] for t in json_data['created'] + json_data['updated'])
+        on_tasks = [sql.split()[0] for sql in statements if re.search(r'\btasks\b', sql)]
+        # Posse (SELECT), INSERT das 5 criações, UPDATE das 2 e DELETE
+        assert on_tasks == ['SELECT', 'INSERT', 'UPDATE', 'DELETE']
+    
+    def test_batch_tasks_is_atomic(self, client, auth_headers):
+        """Testa que um lote com tarefa inexistente não aplica nada"""
+        task_id = client.post('/api/tasks', json={'title': 'Original'}, headers=auth_headers).get_json()['task']['id']
+        
+        response = client.post('/api/tasks/batch', json={'operations': [
+            {'op': 'update', 'id': task_id, 'data': {'title': 'Alterada'}},
+            {'op': 'delete', 'id': 99999}
+        ]}, headers=auth_headers)
+        
+        assert response.status_code == 404
+        task = client.get(f'/api/tasks/{task_id}', headers=auth_headers).get_json()['task']
+        assert task['title'] == 'Original'
+    
+    def test_batch_tasks_invalid_operation(self, client, auth_headers):
+        """Testa lote com operação inválida"""
+        response = client.post('/api/tasks/batch', json={'operations': [
+            {'op': 'rename', 'id': 1}
+        ]}, headers=auth_headers)
+        assert response.status_code == 400
+        
+        response = client.post('/api/tasks/batch', json={'operations': [
+            {'op': 'update', 'id': 1, 'data': {'completed': True}},
+            {'op': 'delete', 'id': 1}
+        ]}, headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_list_tasks_etag_not_modified(self, client, auth_headers, app):
+        """Testa 304 na listagem sem ler tarefas quando nada mudou"""
+        client.post('/api/tasks', json={'title': 'Tarefa'}, headers=auth_headers)
+        
+        first = client.get('/api/tasks', headers=auth_headers)
+        etag = first.headers['ETag']
+        assert first.status_code == 200
+        assert first.headers['Cache-Control'] == 'private, no-cache'
+        
+        with patch('app.routes.tasks.TaskService.get_user_task_rows') as get_user_task_rows:
+            second = client.get('/api/tasks', headers={**auth_headers, 'If-None-Match': etag})
+            get_user_task_rows.assert_not_called()
+        
+        assert second.status_code == 304
+        assert second.headers['ETag'] == etag
+        assert second.get_data() == b''
+    
+    def test_list_tasks_etag_changes_after_write(self, client, auth_headers):
+        """Testa que qualquer escrita invalida a ETag"""
+        etag = client.get('/api/tasks', headers=auth_headers).headers['ETag']
+        
+        client.post('/api/tasks', json={'title': 'Nova'}, headers=auth_headers)
+        
+        response = client.get('/api/tasks', headers={**auth_headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+    
+    def test_list_tasks_etag_depends_on_query(self, client, auth_headers):
+        """Testa ETags distintas para parâmetros distintos"""
+        all_tasks = client.get('/api/tasks', headers=auth_headers).headers['ETag']
+        open_tasks = client.get('/api/tasks?completed=false', headers=auth_headers).headers['ETag']
+        
+        assert all_tasks != open_tasks
+    
+    def test_list_tasks_sparse_fields(self, client, auth_headers):
+        """Testa ?fields= na listagem (apenas os campos pedidos)"""
+        client.post('/api/tasks', json={'title': 'Tarefa', 'description': 'x' * 1000}, headers=auth_headers)
+        
+        response = client.get('/api/tasks?fields=id,title,completed', headers=auth_headers)
+        task = response.get_json()['tasks'][0]
+        
+        assert response.status_code == 200
+        assert set(task) == {'id', 'title', 'completed'}
+        assert b'xxxx' not in response.get_data()
+    
+    def test_list_tasks_sparse_fields_paged(self, client, auth_headers):
+        """Testa ?fields= com paginação por cursor sobre um campo não pedido"""
+        for i in range(3):
+            client.post('/api/tasks', json={'title': f'Tarefa {i}'}, headers=auth_headers)
+        
+        first = client.get('/api/tasks?fields=title&limit=2&sort=updated_at', headers=auth_headers).get_json()
+        second = client.get(
+            f"/api/tasks?fields=title&limit=2&sort=updated_at&cursor={first['next_cursor']}",
+            headers=auth_headers
+        ).get_json()
+        
+        assert [set(task) for task in first['tasks']] == [{'title'}, {'title'}]
+        assert len(first['tasks']) + len(second['tasks']) == 3
+        assert second['next_cursor'] is None
+    
+    def test_list_tasks_invalid_fields(self, client, auth_headers):
+        """Testa campo desconhecido em ?fields="""
+        response = client.get('/api/tasks?fields=id,hashed_password', headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_get_task_sparse_fields(self, client, auth_headers):
+        """Testa ?fields= na obtenção de uma tarefa"""
+        task_id = client.post('/api/tasks', json={'title': 'Tarefa'}, headers=auth_headers).get_json()['task']['id']
+        
+        response = client.get(f'/api/tasks/{task_id}?fields=title,created_at', headers=auth_headers)
+        task = response.get_json()['task']
+        
+        assert response.status_code == 200
+        assert set(task) == {'title', 'created_at'}
+    
+    def test_export_tasks_sparse_fields(self, client, auth_headers):
+        """Testa ?fields= no export NDJSON e CSV"""
+        client.post('/api/tasks', json={'title': 'Tarefa', 'description': 'Longa'}, headers=auth_headers)
+        
+        ndjson = client.get('/api/tasks/export?fields=id,title', headers=auth_headers)
+        line = json.loads(ndjson.get_data(as_text=True).splitlines()[0])
+        assert set(line) == {'id', 'title'}
+        
+        csv_body = client.get('/api/tasks/export?format=csv&fields=title,completed', headers=auth_headers)
+        assert csv_body.get_data(as_text=True).splitlines() == ['title,completed', 'Tarefa,False']
+    
+    def test_task_stats(self, client, auth_headers):
+        """Testa estatísticas por estado e por dia"""
+        client.post('/api/tasks', json={'title': 'Aberta'}, headers=auth_headers)
+        client.post('/api/tasks', json={'title': 'Feita', 'completed': True}, headers=auth_headers)
+        
+        response = client.get('/api/tasks/stats?days=7', headers=auth_headers)
+        stats = response.get_json()['stats']
+        
+        assert response.status_code == 200
+        assert (stats['total'], stats['completed'], stats['pending']) == (2, 1, 1)
+        assert len(stats['by_day']) == 1
+    
+    def test_task_stats_invalid_days(self, client, auth_headers):
+        """Testa validação do intervalo de dias"""
+        response = client.get('/api/tasks/stats?days=0', headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_task_changes_sync(self, client, auth_headers):
+        """Testa sincronização incremental com tarefas alteradas e eliminadas"""
+        first_id = client.post('/api/tasks', json={'title': 'Primeira'}, headers=auth_headers).get_json()['task']['id']
+        second_id = client.post('/api/tasks', json={'title': 'Segunda'}, headers=auth_headers).get_json()['task']['id']
+        
+        full = client.get('/api/tasks/changes', headers=auth_headers).get_json()
+        assert len(full['changed']) == 2
+        assert full['has_more'] is False
+        
+        client.put(f'/api/tasks/{first_id}', json={'completed': True}, headers=auth_headers)
+        client.delete(f'/api/tasks/{second_id}', headers=auth_headers)
+        
+        response = client.get(f"/api/tasks/changes?since={full['next_token']}", headers=auth_headers)
+        data = response.get_json()
+        assert response.status_code == 200
+        assert [task['id'] for task in data['changed']] == [first_id]
+        assert data['changed'][0]['completed'] is True
+        assert data['deleted'] == [second_id]
+        assert data['next_token']
+    
+    def test_task_changes_invalid_token(self, client, auth_headers):
+        """Testa token de sincronização inválido"""
+        response = client.get('/api/tasks/changes?since=invalido', headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_task_changes_expired_token(self, client, auth_headers):
+        """Testa 410 quando o token é anterior à retenção"""
+        from datetime import datetime
+        from app.utils.pagination import encode_sync_token
+        token = encode_sync_token(None, (datetime(2000, 1, 1), 0))
+        
+        response = client.get(f'/api/tasks/changes?since={token}', headers=auth_headers)
+        assert response.status_code == 410
+        assert response.get_json()['error_code'] == 'SYNC_TOKEN_EXPIRED'
+    
+    def test_get_task_etag_not_modified(self, client, auth_headers):
+        """Testa 304 na obtenção de uma tarefa"""
+        task_id = client.post('/api/tasks', json={'title': 'Tarefa'}, headers=auth_headers).get_json()['task']['id']
+        etag = client.get(f'/api/tasks/{task_id}', headers=auth_headers).headers['ETag']
+        
+        response = client.get(f'/api/tasks/{task_id}', headers={**auth_headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        
+        client.put(f'/api/tasks/{task_id}', json={'completed': True}, headers=auth_headers)
+        response = client.get(f'/api/tasks/{task_id}', headers={**auth_headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['task']['completed'] is True
+    
+    def test_get_task_etag_foreign_task(self, client, auth_headers, another_user, app):
+        """Testa que uma ETag válida não dá 304 para uma tarefa de outro utilizador"""
+        from app import db
+        from app.models.task import Task
+        from app.utils.http_cache import build_etag
+        
+        with app.app_context():
+            task = Task(title='Alheia', user_id=another_user.id)
+            db.session.add(task)
+            db.session.commit()
+            foreign_id = task.id
+        
+        own_id = client.post('/api/tasks', json={'title': 'Minha'}, headers=auth_headers).get_json()['task']['id']
+        own_etag = client.get(f'/api/tasks/{own_id}', headers=auth_headers).headers['ETag']
+        user_part, version_part = own_etag.strip('"').split('-')[:2]
+        etag = build_etag(int(user_part[1:]), int(version_part[1:]), f'/api/tasks/{foreign_id}', '')
+        
+        response = client.get(f'/api/tasks/{foreign_id}', headers={**auth_headers, 'If-None-Match': f'"{etag}"'})
+        assert response.status_code == client.get(f'/api/tasks/{foreign_id}', headers=auth_headers).status_code
+        assert response.status_code == 403
+        assert 'ETag' not in response.headers
+    
     def test_list_tasks_unauthorized(self, client):
         """Testa listagem sem autenticação"""
         response = client.get('/api/tasks')
@@ -210,7 +619,7 @@ class TestTaskRoutes:
     def test_list_tasks_exception(self, client, auth_headers, app):
         """Testa tratamento de exceção na listagem de tarefas"""
         with app.app_context():
-            with patch('app.routes.tasks.TaskService.get_user_tasks', side_effect=Exception("Error")):
+            with patch('app.routes.tasks.TaskService.get_user_task_rows', side_effect=Exception("Error")):
                 response = client.get('/api/tasks', headers=auth_headers)
                 assert response.status_code in [500, 400]
     
@@ -1,15 +1,23 @@
 """Testes para TaskService"""
 import pytest
+import re
 from unittest.mock import patch, MagicMock
 from app.services.task_service import TaskService
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.stats_service import StatsService
+from app.schemas.task import TaskCreate, TaskUpdate, TaskListQuery, TaskBatchRequest
 from app.exceptions.custom_exceptions import (
     ResourceNotFoundException,
     AuthorizationException,
-    DatabaseException
+    DatabaseException,
+    ValidationException,
+    SyncTokenExpiredException
 )
 from app import db
 from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+from app.utils.pagination import encode_sync_token
+from datetime import datetime, timedelta
+from sqlalchemy import event
 
 @pytest.mark.unit
 @pytest.mark.tasks
@@ -29,6 +37,221 @@ class TestTaskService:
             assert len(tasks) == 2
             assert all(task.user_id == test_user.id for task in tasks)
     
+    def test_get_user_tasks_page_keyset(self, app, test_user):
+        """Testa paginação por cursor sem repetir nem saltar tarefas"""
+        with app.app_context():
+            created_at = datetime(2024, 1, 1, 12, 0, 0)
+            tasks = [
+                Task(title=f'Tarefa {i}', user_id=test_user.id, created_at=created_at)
+                for i in range(5)
+            ]
+            db.session.add_all(tasks)
+            db.session.commit()
+            
+            seen = []
+            cursor = None
+            while True:
+                page, cursor = TaskService.get_user_tasks_page(
+                    test_user, TaskListQuery(limit=2, cursor=cursor)
+                )
+                seen.extend(task.id for task in page)
+                if cursor is None:
+                    break
+            
+            assert seen == sorted((task.id for task in tasks), reverse=True)
+    
+    def test_get_user_tasks_page_last_page(self, app, test_user):
+        """Testa que a última página não devolve cursor"""
+        with app.app_context():
+            db.session.add(Task(title='Única', user_id=test_user.id))
+            db.session.commit()
+            
+            page, next_cursor = TaskService.get_user_tasks_page(test_user, TaskListQuery(limit=1))
+            
+            assert len(page) == 1
+            assert next_cursor is None
+    
+    def test_get_user_tasks_page_invalid_cursor(self, app, test_user):
+        """Testa cursor inválido"""
+        with app.app_context():
+            with pytest.raises(ValidationException):
+                TaskService.get_user_tasks_page(
+                    test_user, TaskListQuery(cursor='nao-e-um-cursor')
+                )
+    
+    def test_get_user_tasks_page_cursor_other_sort(self, app, test_user):
+        """Testa que um cursor não pode ser reutilizado com outra ordenação"""
+        with app.app_context():
+            db.session.add_all([Task(title=f'T{i}', user_id=test_user.id) for i in range(2)])
+            db.session.commit()
+            
+            _, cursor = TaskService.get_user_tasks_page(test_user, TaskListQuery(limit=1))
+            
+            with pytest.raises(ValidationException):
+                TaskService.get_user_tasks_page(
+                    test_user, TaskListQuery(limit=1, cursor=cursor, sort='title')
+                )
+    
+    def test_get_user_tasks_filters(self, app, test_user):
+        """Testa filtros por estado e datas"""
+        with app.app_context():
+            db.session.add_all([
+                Task(title='Antiga', user_id=test_user.id, completed=True,
+                     created_at=datetime(2024, 1, 1)),
+                Task(title='Aberta', user_id=test_user.id, completed=False,
+                     created_at=datetime(2024, 6, 1)),
+                Task(title='Recente', user_id=test_user.id, completed=True,
+                     created_at=datetime(2024, 12, 1))
+            ])
+            db.session.commit()
+            
+            open_tasks = TaskService.get_user_tasks(test_user, TaskListQuery(completed=False))
+            assert [t.title for t in open_tasks] == ['Aberta']
+            
+            ranged = TaskService.get_user_tasks(test_user, TaskListQuery(
+                created_after=datetime(2024, 3, 1),
+                created_before=datetime(2024, 12, 1)
+            ))
+            assert [t.title for t in ranged] == ['Aberta']
+    
+    def test_get_user_tasks_page_sorted_by_title(self, app, test_user):
+        """Testa paginação com ordenação ascendente por título"""
+        with app.app_context():
+            db.session.add_all([
+                Task(title=title, user_id=test_user.id) for title in ['c', 'a', 'b']
+            ])
+            db.session.commit()
+            
+            query = TaskListQuery(limit=2, sort='title', order='asc')
+            first, cursor = TaskService.get_user_tasks_page(test_user, query)
+            second, cursor = TaskService.get_user_tasks_page(
+                test_user, query.model_copy(update={'cursor': cursor})
+            )
+            
+            assert [t.title for t in first + second] == ['a', 'b', 'c']
+            assert cursor is None
+    
+    def test_iter_user_tasks_batches(self, app, test_user):
+        """Testa iteração em lotes sem acumular tarefas na sessão"""
+        with app.app_context():
+            db.session.add_all([Task(title=f'T{i}', user_id=test_user.id) for i in range(7)])
+            db.session.commit()
+            db.session.expunge_all()
+            
+            titles = []
+            for task in TaskService.iter_user_tasks(test_user, TaskListQuery(), batch_size=3):
+                titles.append(task.title)
+            
+            assert len(titles) == 7
+            assert len(db.session.identity_map) == 0
+    
+    def test_tasks_version_bumped_by_writes(self, app, test_user):
+        """Testa que cada escrita incrementa a versão das tarefas"""
+        with app.app_context():
+            assert TaskService.get_tasks_version(test_user) == 0
+            
+            task = TaskService.create_task(TaskCreate(title='Nova'), test_user)
+            TaskService.update_task(task.id, TaskUpdate(completed=True), test_user)
+            TaskService.import_tasks([TaskCreate(title='Importada')], test_user)
+            TaskService.delete_task(task.id, test_user)
+            
+            assert TaskService.get_tasks_version(test_user) == 4
+    
+    def test_get_changes_full_then_incremental(self, app, test_user):
+        """Testa sincronização completa seguida de sincronização incremental"""
+        with app.app_context():
+            kept = TaskService.create_task(TaskCreate(title='Mantida'), test_user)
+            removed = TaskService.create_task(TaskCreate(title='Removida'), test_user)
+            
+            full = TaskService.get_changes(test_user, None, 200)
+            assert {task.id for task in full['changed']} == {kept.id, removed.id}
+            assert full['deleted'] == []
+            assert full['has_more'] is False
+            
+            TaskService.update_task(kept.id, TaskUpdate(completed=True), test_user)
+            TaskService.delete_task(removed.id, test_user)
+            
+            delta = TaskService.get_changes(test_user, full['next_token'], 200)
+            assert [task.id for task in delta['changed']] == [kept.id]
+            assert delta['deleted'] == [removed.id]
+            
+            # Dentro da janela de segurança as alterações voltam a ser entregues
+            again = TaskService.get_changes(test_user, delta['next_token'], 200)
+            assert [task.id for task in again['changed']] == [kept.id]
+            assert again['deleted'] == [removed.id]
+            
+            app.config['SYNC_SAFETY_WINDOW_SECONDS'] = 0
+            settled = TaskService.get_changes(test_user, delta['next_token'], 200)
+            empty = TaskService.get_changes(test_user, settled['next_token'], 200)
+            assert empty['changed'] == []
+            assert empty['deleted'] == []
+    
+    def test_get_changes_delayed_commit(self, app, test_user):
+        """Testa que uma transação iniciada antes da leitura e confirmada depois não se perde"""
+        with app.app_context():
+            recent = TaskService.create_task(TaskCreate(title='Recente'), test_user)
+            sync = TaskService.get_changes(test_user, None, 200)
+            assert [task.id for task in sync['changed']] == [recent.id]
+            
+            # Confirmadas depois da leitura, com datas do statement (anteriores a ela)
+            started = datetime.utcnow() - timedelta(seconds=5)
+            late = Task(title='Tardia', user_id=test_user.id, created_at=started, updated_at=started)
+            db.session.add_all([late, TaskTombstone(task_id=12345, user_id=test_user.id, deleted_at=started)])
+            db.session.commit()
+            
+            delta = TaskService.get_changes(test_user, sync['next_token'], 200)
+            assert late.id in [task.id for task in delta['changed']]
+            assert delta['deleted'] == [12345]
+    
+    def test_get_changes_pages_with_limit(self, app, test_user):
+        """Testa que has_more e o token percorrem as alterações sem repetições"""
+        with app.app_context():
+            updated_at = datetime(2024, 1, 1, 12, 0, 0)
+            db.session.add_all([
+                Task(title=f'Tarefa {i}', user_id=test_user.id, updated_at=updated_at)
+                for i in range(5)
+            ])
+            db.session.commit()
+            
+            seen = []
+            token = None
+            while True:
+                changes = TaskService.get_changes(test_user, token, 2)
+                seen.extend(task.id for task in changes['changed'])
+                token = changes['next_token']
+                if not changes['has_more']:
+                    break
+            
+            assert len(seen) == 5
+            assert len(set(seen)) == 5
+    
+    def test_get_changes_expired_token(self, app, test_user):
+        """Testa 410 para tokens anteriores à retenção das eliminações"""
+        with app.app_context():
+            old = datetime.utcnow() - timedelta(days=app.config['TOMBSTONE_RETENTION_DAYS'] + 1)
+            token = encode_sync_token(None, (old, 0))
+            
+            with pytest.raises(SyncTokenExpiredException):
+                TaskService.get_changes(test_user, token, 200)
+    
+    def test_get_changes_invalid_token(self, app, test_user):
+        """Testa token de sincronização inválido"""
+        with app.app_context():
+            with pytest.raises(ValidationException):
+                TaskService.get_changes(test_user, 'invalido', 200)
+    
+    def test_compact_tombstones(self, app, test_user):
+        """Testa remoção apenas dos registos de eliminação expirados"""
+        with app.app_context():
+            db.session.add_all([
+                TaskTombstone(task_id=1, user_id=test_user.id, deleted_at=datetime.utcnow() - timedelta(days=60)),
+                TaskTombstone(task_id=2, user_id=test_user.id)
+            ])
+            db.session.commit()
+            
+            assert TaskService.compact_tombstones() == 1
+            assert [row.task_id for row in TaskTombstone.query.all()] == [2]
+    
     def test_get_task_by_id_success(self, app, test_user, test_task):
         """Testa obtenção de tarefa específica"""
         with app.app_context():
@@ -73,6 +296,86 @@ class TestTaskService:
             assert task.user_id == test_user.id
             assert task.completed is False
     
+    def test_import_tasks_batches(self, app, test_user):
+        """Testa importação em lotes numa única transação"""
+        with app.app_context():
+            tasks_data = (TaskCreate(title=f'Importada {i}') for i in range(5))
+            
+            imported = TaskService.import_tasks(tasks_data, test_user, batch_size=2)
+            
+            assert imported == 5
+            assert Task.query.filter_by(user_id=test_user.id).count() == 5
+    
+    def test_import_tasks_database_exception(self, app, test_user):
+        """Testa DatabaseException e rollback na importação"""
+        with app.app_context():
+            with patch('app.db.session.commit', side_effect=Exception("DB Error")):
+                with pytest.raises(DatabaseException) as exc_info:
+                    TaskService.import_tasks([TaskCreate(title='x')], test_user)
+                
+                assert 'Erro ao importar tarefas' in str(exc_info.value.message)
+            assert Task.query.count() == 0
+    
+    def test_apply_batch_checks_ownership_once(self, app, test_user, another_user):
+        """Testa que o lote rejeita tarefas de outro utilizador sem aplicar nada"""
+        with app.app_context():
+            own = Task(title='Minha', user_id=test_user.id)
+            foreign = Task(title='Alheia', user_id=another_user.id)
+            db.session.add_all([own, foreign])
+            db.session.commit()
+            
+            batch = TaskBatchRequest(operations=[
+                {'op': 'delete', 'id': own.id},
+                {'op': 'delete', 'id': foreign.id}
+            ])
+            
+            with pytest.raises(AuthorizationException) as exc_info:
+                TaskService.apply_batch(batch, test_user)
+            
+            assert exc_info.value.details['task_ids'] == [foreign.id]
+            assert db.session.get(Task, own.id) is not None
+    
+    def test_apply_batch_groups_updates(self, app, test_user):
+        """Testa que atualizações iguais são aplicadas num único UPDATE"""
+        with app.app_context():
+            tasks = [Task(title=f'T{i}', user_id=test_user.id) for i in range(4)]
+            db.session.add_all(tasks)
+            db.session.commit()
+            
+            batch = TaskBatchRequest(operations=[
+                {'op': 'update', 'id': task.id, 'data': {'completed': True}} for task in tasks
+            ])
+            
+            statements = []
+            listener = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                result = TaskService.apply_batch(batch, test_user)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+            
+            assert all(task.completed for task in result['updated'])
+            assert len([sql for sql in statements if sql.startswith('UPDATE tasks')]) == 1
+    
+    def test_apply_batch_without_returning(self, app, test_user):
+        """Testa o lote numa base de dados sem RETURNING"""
+        with app.app_context():
+            task = Task(title='Existente', user_id=test_user.id)
+            db.session.add(task)
+            db.session.commit()
+            
+            batch = TaskBatchRequest(operations=[
+                {'op': 'create', 'data': {'title': 'Nova', 'completed': True}},
+                {'op': 'create', 'data': {'title': 'Outra'}},
+                {'op': 'update', 'id': task.id, 'data': {'completed': True}}
+            ])
+            with patch.object(TaskService, '_supports_returning', return_value=False):
+                result = TaskService.apply_batch(batch, test_user)
+            
+            assert [(row.title, row.completed) for row in result['created']] == [('Nova', True), ('Outra', False)]
+            assert [(row.id, row.completed) for row in result['updated']] == [(task.id, True)]
+            assert StatsService.get_stats(test_user)['completed'] == 2
+    
     def test_update_task_success(self, app, test_user, test_task):
         """Testa atualização de tarefa"""
         with app.app_context():
@@ -118,6 +421,7 @@ class TestTaskService:
             
             task = Task.query.get(task_id)
             assert task is None
+            assert TaskTombstone.query.filter_by(task_id=task_id).count() == 1
     
     def test_delete_task_unauthorized(self, app, test_user, another_user):
         """Testa eliminação de tarefa de outro utilizador"""
@@ -173,3 +477,108 @@ class TestTaskService:
                 
                 assert 'Erro ao eliminar tarefa' in str(exc_info.value.message)
 
+    
+    def _record_statements(self, action):
+        """Executa action e devolve o SQL enviado à BD"""
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            action()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        return statements
+    
+    @staticmethod
+    def _targets(statements):
+        """Verbo e tabela de cada statement (ex: 'UPDATE users')"""
+        targets = []
+        for sql in statements:
+            verb = sql.split()[0]
+            pattern = {'SELECT': r'\bFROM (\w+)', 'INSERT': r'\bINTO (\w+)', 'DELETE': r'\bFROM (\w+)'}.get(verb, r'^UPDATE (\w+)')
+            targets.append(f'{verb} {re.search(pattern, sql).group(1)}')
+        return targets
+    
+    def test_write_statements(self, app, test_user):
+        """Testa todos os statements de cada escrita (sem reler a tarefa)"""
+        with app.app_context():
+            result = {}
+            created = self._record_statements(
+                lambda: result.update(task=TaskService.create_task(TaskCreate(title='Nova'), test_user))
+            )
+            task_id = result['task'].id
+            renamed = self._record_statements(
+                lambda: TaskService.update_task(task_id, TaskUpdate(title='Renomeada'), test_user)
+            )
+            toggled = self._record_statements(
+                lambda: result.update(task=TaskService.update_task(task_id, TaskUpdate(completed=True), test_user))
+            )
+            deleted = self._record_statements(lambda: TaskService.delete_task(task_id, test_user))
+            
+            assert result['task'].completed is True
+            assert result['task'].updated_at is not None
+            counters = ['INSERT task_stats', 'INSERT task_daily_stats']
+            assert self._targets(created) == ['INSERT tasks'] + counters + ['UPDATE users']
+            assert self._targets(renamed) == ['UPDATE tasks', 'UPDATE users']
+            # SQLite: o estado anterior não vem no RETURNING (no PostgreSQL é um só UPDATE)
+            assert self._targets(toggled) == ['SELECT tasks', 'UPDATE tasks'] + counters + ['UPDATE users']
+            assert self._targets(deleted) == ['DELETE tasks'] + counters + ['INSERT task_tombstones', 'UPDATE users']
+            assert all('RETURNING' in sql for sql in renamed + toggled + deleted if re.match(r'(UPDATE|DELETE FROM) tasks\b', sql))
+    
+    def test_update_with_previous_statement_postgresql(self, app):
+        """Testa que no PostgreSQL o estado anterior vem do próprio UPDATE"""
+        from sqlalchemy.dialects import postgresql
+        
+        statement = TaskService._update_with_previous_statement(
+            (Task.id == 1, Task.user_id == 2), {'completed': True}
+        )
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        
+        assert sql.startswith('WITH previous AS')
+        assert 'FOR UPDATE' in sql.split('UPDATE tasks SET')[0]
+        assert 'FROM previous WHERE tasks.id = previous.id' in sql
+        assert 'previous.completed AS previous_completed' in sql.split('RETURNING')[1]
+    
+    def test_update_owned_task_postgresql_single_statement(self, app):
+        """Testa que no PostgreSQL a mudança de estado é um só statement"""
+        from sqlalchemy.dialects import postgresql
+        
+        task = Task(title='T', completed=True)
+        result = MagicMock()
+        result.one_or_none.return_value = (task, False)
+        with app.app_context():
+            with patch.object(TaskService, '_update_returns_previous', return_value=True), \
+                 patch('app.db.session.execute', return_value=result) as execute, \
+                 patch('app.db.session.scalar') as scalar:
+                updated, previous = TaskService._update_owned_task(
+                    (Task.id == 1, Task.user_id == 2), {'completed': True}, with_previous=True
+                )
+        
+        assert (updated, previous) == (task, False)
+        assert execute.call_count == 1 and not scalar.called
+        sql = str(execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith('WITH previous AS') and 'RETURNING' in sql
+    
+    def test_update_and_delete_missing_task(self, app, test_user):
+        """Testa 404 quando o UPDATE/DELETE não encontra a tarefa"""
+        with app.app_context():
+            with pytest.raises(ResourceNotFoundException):
+                TaskService.update_task(99999, TaskUpdate(completed=True), test_user)
+            with pytest.raises(ResourceNotFoundException):
+                TaskService.delete_task(99999, test_user)
+            
+            assert StatsService.get_stats(test_user)['source'] == 'aggregate'
+    
+    def test_writes_without_returning(self, app, test_user, another_user):
+        """Testa o caminho para bases de dados sem RETURNING"""
+        with app.app_context():
+            with patch.object(TaskService, '_supports_returning', return_value=False):
+                task = TaskService.create_task(TaskCreate(title='Nova'), test_user)
+                updated = TaskService.update_task(task.id, TaskUpdate(title='Alterada', completed=True), test_user)
+                with pytest.raises(AuthorizationException):
+                    TaskService.delete_task(task.id, another_user)
+                TaskService.delete_task(task.id, test_user)
+            
+            assert (updated.title, updated.completed) == ('Alterada', True)
+            assert db.session.get(Task, task.id) is None
+            assert StatsService.get_stats(test_user)['total'] == 0
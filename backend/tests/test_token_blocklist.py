@@ -0,0 +1,104 @@
+"""Testes para a lista de tokens revogados"""
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app import db
+from app.models.revoked_token import RevokedToken
+from app.utils.token_blocklist import BloomFilter, TokenBlocklist
+
+def _revoke(user_id, jti=None, expires_in=timedelta(hours=1)):
+    token = RevokedToken(
+        jti=jti or str(uuid.uuid4()),
+        token_type='access',
+        user_id=user_id,
+        expires_at=datetime.utcnow() + expires_in
+    )
+    db.session.add(token)
+    db.session.commit()
+    return token.jti
+
+@pytest.mark.unit
+@pytest.mark.auth
+class TestBloomFilter:
+    """Testes para o filtro de Bloom"""
+    
+    def test_no_false_negatives(self):
+        """Testa que todas as chaves adicionadas são encontradas"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [str(uuid.uuid4()) for _ in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        
+        assert all(key in bloom for key in keys)
+        assert bloom.count == 1000
+    
+    def test_false_positive_rate(self):
+        """Testa que a taxa de falsos positivos fica perto da configurada"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for _ in range(1000):
+            bloom.add(str(uuid.uuid4()))
+        
+        false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10000))
+        assert false_positives < 300
+
+@pytest.mark.unit
+@pytest.mark.auth
+class TestTokenBlocklist:
+    """Testes para a verificação de tokens revogados"""
+    
+    def test_not_revoked_without_query(self, app, test_user):
+        """Testa que um token não revogado é aceite sem consultar a BD"""
+        with app.app_context():
+            blocklist = TokenBlocklist()
+            blocklist.sync(force=True)
+            
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                assert blocklist.is_revoked(str(uuid.uuid4())) is False
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+            
+            assert statements == []
+            assert blocklist.stats()['bloom_negatives'] == 1
+    
+    def test_loads_revoked_tokens(self, app, test_user):
+        """Testa o carregamento inicial e a exclusão de tokens expirados"""
+        with app.app_context():
+            active = _revoke(test_user.id)
+            expired = _revoke(test_user.id, expires_in=timedelta(hours=-1))
+            
+            blocklist = TokenBlocklist()
+            
+            assert blocklist.is_revoked(active) is True
+            assert blocklist.is_revoked(expired) is False
+            assert blocklist.stats()['entries'] == 1
+    
+    def test_sync_sees_revocations_from_other_workers(self, app, test_user):
+        """Testa que as revogações feitas noutro worker chegam na sincronização"""
+        with app.app_context():
+            blocklist = TokenBlocklist(sync_interval=3600)
+            blocklist.sync(force=True)
+            
+            jti = _revoke(test_user.id)
+            assert blocklist.is_revoked(jti) is False
+            
+            blocklist.sync(force=True)
+            assert blocklist.is_revoked(jti) is True
+    
+    def test_exact_set_is_bounded(self, app, test_user):
+        """Testa que entradas fora do conjunto exato são confirmadas na BD"""
+        with app.app_context():
+            jtis = [_revoke(test_user.id) for _ in range(3)]
+            blocklist = TokenBlocklist(exact_size=2)
+            blocklist.sync(force=True)
+            for jti in jtis:
+                blocklist.add(jti)
+            
+            assert blocklist.stats()['exact_entries'] == 2
+            assert blocklist.is_revoked(jtis[0]) is True
+            assert blocklist.stats()['db_lookups'] == 1
+            assert blocklist.is_revoked(jtis[0]) is True
+            assert blocklist.stats()['exact_hits'] == 1
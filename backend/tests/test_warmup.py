@@ -0,0 +1,59 @@
+"""Testes para o aquecimento dos workers do Gunicorn"""
+import pytest
+from sqlalchemy import text
+from app import create_app, db
+from app.schemas.base import Schema
+from app.utils.warmup import (
+    WARMUP_STEPS, prebuild_schemas, reset_engines_after_fork, warm_up_worker
+)
+from tests.conftest import TestConfig
+
+@pytest.mark.unit
+@pytest.mark.app
+class TestWarmup:
+    """Testes para os hooks post_fork/post_worker_init"""
+    
+    def test_warm_up_worker_runs_all_steps(self, app):
+        """Testa que todos os passos correm e têm tempo medido"""
+        timings = warm_up_worker(app)
+        
+        assert list(timings) == [name for name, _ in WARMUP_STEPS]
+        assert all(ms is not None and ms >= 0 for ms in timings.values())
+        assert app.extensions['token_blocklist'].stats()['syncs'] >= 1
+    
+    def test_failed_step_does_not_stop_worker(self):
+        """Testa que uma falha (ex: tabelas em falta) fica no log e os outros passos correm"""
+        app = create_app(TestConfig)
+        
+        timings = warm_up_worker(app)
+        
+        assert timings['database'] is None
+        assert timings['schemas'] is not None
+        assert timings['hashing'] is not None
+    
+    def test_prebuild_schemas(self):
+        """Testa que os validadores diferidos ficam construídos"""
+        class WarmupProbe(Schema):
+            value: int
+        
+        assert WarmupProbe.__pydantic_complete__ is False
+        assert prebuild_schemas() >= 1
+        assert WarmupProbe.__pydantic_complete__ is True
+        assert prebuild_schemas() == 0
+    
+    def test_reset_engines_after_fork(self, tmp_path):
+        """Testa que o worker deixa de usar o pool herdado e abre ligações novas"""
+        class FileConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'warmup.db'}"
+        
+        app = create_app(FileConfig)
+        with app.app_context():
+            db.session.execute(text('SELECT 1'))
+            db.session.remove()
+            inherited = db.engine.pool
+        
+        reset_engines_after_fork(app)
+        
+        with app.app_context():
+            assert db.engine.pool is not inherited
+            assert db.session.execute(text('SELECT 1')).scalar() == 1
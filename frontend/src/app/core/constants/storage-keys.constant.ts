@@ -3,6 +3,7 @@
  */
 export class StorageKeys {
   static readonly ACCESS_TOKEN = 'access_token';
+  static readonly REFRESH_TOKEN = 'refresh_token';
   static readonly USER = 'user';
   static readonly THEME_MODE = 'theme_mode';
 }
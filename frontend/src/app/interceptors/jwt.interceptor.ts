@@ -1,6 +1,7 @@
 import { Injectable, inject } from '@angular/core';
-import { HttpInterceptor, HttpRequest, HttpHandler, HttpEvent } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { HttpInterceptor, HttpRequest, HttpHandler, HttpEvent, HttpErrorResponse } from '@angular/common/http';
+import { Observable, throwError } from 'rxjs';
+import { catchError, switchMap } from 'rxjs/operators';
 import { AuthService } from '../services/auth.service';
 
 @Injectable()
@@ -11,14 +12,36 @@ export class JwtInterceptor implements HttpInterceptor {
     const token = this.authService.getToken();
     
     if (token) {
-      request = request.clone({
-        setHeaders: {
-          Authorization: `Bearer ${token}`
-        }
-      });
+      request = this.withToken(request, token);
     }
     
-    return next.handle(request);
+    return next.handle(request).pipe(
+      catchError((error) => {
+        // Access token expirado: renova uma vez com o refresh token e repete o pedido
+        if (
+          error instanceof HttpErrorResponse &&
+          error.status === 401 &&
+          !request.url.includes('/auth/') &&
+          this.authService.getRefreshToken()
+        ) {
+          return this.authService.refreshTokens().pipe(
+            catchError((refreshError) => {
+              this.authService.logout();
+              return throwError(() => refreshError);
+            }),
+            switchMap((tokens) => next.handle(this.withToken(request, tokens.access_token)))
+          );
+        }
+        return throwError(() => error);
+      })
+    );
   }
-}
 
+  private withToken(request: HttpRequest<any>, token: string): HttpRequest<any> {
+    return request.clone({
+      setHeaders: {
+        Authorization: `Bearer ${token}`
+      }
+    });
+  }
+}
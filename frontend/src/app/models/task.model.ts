@@ -20,10 +20,24 @@ export interface TaskUpdate {
   completed?: boolean;
 }
 
+export interface TaskListParams {
+  completed?: boolean;
+  created_after?: string;
+  created_before?: string;
+  updated_after?: string;
+  updated_before?: string;
+  sort?: 'created_at' | 'updated_at' | 'title';
+  order?: 'asc' | 'desc';
+  limit?: number;
+  cursor?: string;
+  fields?: string;
+}
+
 export interface TaskResponse {
   message: string;
   task: Task;
   tasks?: Task[];
   total?: number;
+  next_cursor?: string | null;
 }
 
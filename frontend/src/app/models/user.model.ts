@@ -18,8 +18,15 @@ export interface UserLogin {
 
 export interface LoginResponse {
   access_token: string;
+  refresh_token: string;
   token_type: string;
   user: User;
   message?: string;
 }
 
+export interface TokenRefreshResponse {
+  access_token: string;
+  refresh_token: string;
+  token_type: string;
+  message?: string;
+}
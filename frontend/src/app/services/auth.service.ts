@@ -1,9 +1,12 @@
 import { Injectable } from '@angular/core';
 import { Router } from '@angular/router';
-import { BehaviorSubject, Observable } from 'rxjs';
+import { HttpBackend, HttpClient } from '@angular/common/http';
+import { BehaviorSubject, Observable, throwError } from 'rxjs';
+import { finalize, shareReplay, tap } from 'rxjs/operators';
 import { ApiService } from './api.service';
-import { User, UserCreate, UserLogin, LoginResponse } from '../models/user.model';
+import { User, UserCreate, UserLogin, LoginResponse, TokenRefreshResponse } from '../models/user.model';
 import { StorageKeys } from '../core/constants/storage-keys.constant';
+import { environment } from '../../environments/environment';
 
 /**
  * Serviço de autenticação
@@ -15,10 +18,17 @@ export class AuthService {
   private currentUserSubject = new BehaviorSubject<User | null>(this.getUserFromStorage());
   public currentUser$ = this.currentUserSubject.asObservable();
 
+  // Cliente sem interceptors: os pedidos de refresh/logout levam o seu próprio token
+  private rawHttp: HttpClient;
+  private refreshInFlight$: Observable<TokenRefreshResponse> | null = null;
+
   constructor(
     private apiService: ApiService,
-    private router: Router
-  ) {}
+    private router: Router,
+    httpBackend: HttpBackend
+  ) {
+    this.rawHttp = new HttpClient(httpBackend);
+  }
 
   /**
    * Obtém o utilizador do armazenamento local
@@ -47,15 +57,54 @@ export class AuthService {
    */
   setAuthData(response: LoginResponse): void {
     localStorage.setItem(StorageKeys.ACCESS_TOKEN, response.access_token);
+    localStorage.setItem(StorageKeys.REFRESH_TOKEN, response.refresh_token);
     localStorage.setItem(StorageKeys.USER, JSON.stringify(response.user));
     this.currentUserSubject.next(response.user);
   }
 
   /**
-   * Termina a sessão
+   * Renova o access token com o refresh token (rotação)
+   * Pedidos simultâneos partilham a mesma renovação
+   */
+  refreshTokens(): Observable<TokenRefreshResponse> {
+    const refreshToken = this.getRefreshToken();
+    if (!refreshToken) {
+      return throwError(() => new Error('Sem refresh token'));
+    }
+
+    if (!this.refreshInFlight$) {
+      this.refreshInFlight$ = this.rawHttp.post<TokenRefreshResponse>(
+        `${environment.apiUrl}/auth/refresh`,
+        {},
+        { headers: { Authorization: `Bearer ${refreshToken}` } }
+      ).pipe(
+        tap((response) => {
+          localStorage.setItem(StorageKeys.ACCESS_TOKEN, response.access_token);
+          localStorage.setItem(StorageKeys.REFRESH_TOKEN, response.refresh_token);
+        }),
+        finalize(() => this.refreshInFlight$ = null),
+        shareReplay(1)
+      );
+    }
+
+    return this.refreshInFlight$;
+  }
+
+  /**
+   * Termina a sessão (revoga os tokens no servidor)
    */
   logout(): void {
+    const token = this.getToken();
+    if (token) {
+      this.rawHttp.post(
+        `${environment.apiUrl}/auth/logout`,
+        { refresh_token: this.getRefreshToken() },
+        { headers: { Authorization: `Bearer ${token}` } }
+      ).subscribe({ error: () => {} });
+    }
+
     localStorage.removeItem(StorageKeys.ACCESS_TOKEN);
+    localStorage.removeItem(StorageKeys.REFRESH_TOKEN);
     localStorage.removeItem(StorageKeys.USER);
     this.currentUserSubject.next(null);
     this.router.navigate(['/login']);
@@ -81,5 +130,11 @@ export class AuthService {
   getToken(): string | null {
     return localStorage.getItem(StorageKeys.ACCESS_TOKEN);
   }
-}
 
+  /**
+   * Obtém o refresh token
+   */
+  getRefreshToken(): string | null {
+    return localStorage.getItem(StorageKeys.REFRESH_TOKEN);
+  }
+}
@@ -1,7 +1,7 @@
 import { Injectable } from '@angular/core';
 import { Observable } from 'rxjs';
 import { ApiService } from './api.service';
-import { Task, TaskCreate, TaskUpdate, TaskResponse } from '../models/task.model';
+import { Task, TaskCreate, TaskUpdate, TaskResponse, TaskListParams } from '../models/task.model';
 
 @Injectable({
   providedIn: 'root'
@@ -9,8 +9,18 @@ import { Task, TaskCreate, TaskUpdate, TaskResponse } from '../models/task.model
 export class TaskService {
   constructor(private apiService: ApiService) {}
 
-  getTasks(): Observable<TaskResponse> {
-    return this.apiService.get<TaskResponse>('/tasks');
+  /**
+   * Lista tarefas; filtros, ordenação e paginação são aplicados no servidor
+   */
+  getTasks(params?: TaskListParams): Observable<TaskResponse> {
+    const query = new URLSearchParams();
+    Object.entries(params ?? {}).forEach(([key, value]) => {
+      if (value !== undefined && value !== null) {
+        query.set(key, String(value));
+      }
+    });
+    const queryString = query.toString();
+    return this.apiService.get<TaskResponse>(queryString ? `/tasks?${queryString}` : '/tasks');
   }
 
   getTask(id: number): Observable<TaskResponse> {
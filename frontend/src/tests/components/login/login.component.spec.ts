@@ -24,6 +24,7 @@ describe('LoginComponent', () => {
 
   const mockLoginResponse: LoginResponse = {
     access_token: 'mock-token',
+    refresh_token: 'mock-refresh-token',
     token_type: 'Bearer',
     user: mockUser
   };
@@ -1,9 +1,10 @@
 import { TestBed } from '@angular/core/testing';
 import { Router } from '@angular/router';
-import { HttpClientTestingModule } from '@angular/common/http/testing';
+import { HttpClientTestingModule, HttpTestingController } from '@angular/common/http/testing';
 import { AuthService } from '../../app/services/auth.service';
 import { ApiService } from '../../app/services/api.service';
 import { StorageKeys } from '../../app/core/constants/storage-keys.constant';
+import { environment } from '../../environments/environment';
 import { User, LoginResponse } from '../../app/models/user.model';
 
 describe('AuthService', () => {
@@ -11,6 +12,7 @@ describe('AuthService', () => {
   let apiService: jasmine.SpyObj<ApiService>;
   let router: jasmine.SpyObj<Router>;
   let localStorageSpy: jasmine.Spy;
+  let httpMock: HttpTestingController;
 
   const mockUser: User = {
     id: 1,
@@ -21,6 +23,7 @@ describe('AuthService', () => {
 
   const mockLoginResponse: LoginResponse = {
     access_token: 'mock-token',
+    refresh_token: 'mock-refresh-token',
     token_type: 'Bearer',
     user: mockUser
   };
@@ -41,6 +44,7 @@ describe('AuthService', () => {
     service = TestBed.inject(AuthService);
     apiService = TestBed.inject(ApiService) as jasmine.SpyObj<ApiService>;
     router = TestBed.inject(Router) as jasmine.SpyObj<Router>;
+    httpMock = TestBed.inject(HttpTestingController);
 
     // Limpar localStorage antes de cada teste
     localStorage.clear();
@@ -111,6 +115,10 @@ describe('AuthService', () => {
         StorageKeys.ACCESS_TOKEN,
         mockLoginResponse.access_token
       );
+      expect(localStorage.setItem).toHaveBeenCalledWith(
+        StorageKeys.REFRESH_TOKEN,
+        mockLoginResponse.refresh_token
+      );
       expect(localStorage.setItem).toHaveBeenCalledWith(
         StorageKeys.USER,
         JSON.stringify(mockLoginResponse.user)
@@ -127,6 +135,7 @@ describe('AuthService', () => {
       service.logout();
 
       expect(localStorage.removeItem).toHaveBeenCalledWith(StorageKeys.ACCESS_TOKEN);
+      expect(localStorage.removeItem).toHaveBeenCalledWith(StorageKeys.REFRESH_TOKEN);
       expect(localStorage.removeItem).toHaveBeenCalledWith(StorageKeys.USER);
       expect(router.navigate).toHaveBeenCalledWith(['/login']);
 
@@ -134,6 +143,44 @@ describe('AuthService', () => {
         expect(user).toBeNull();
       });
     });
+
+    it('deve revogar os tokens no servidor quando há sessão', () => {
+      localStorageSpy.and.callFake((key: string) =>
+        key === StorageKeys.ACCESS_TOKEN ? 'mock-token' : 'mock-refresh-token'
+      );
+
+      service.logout();
+
+      const req = httpMock.expectOne(`${environment.apiUrl}/auth/logout`);
+      expect(req.request.headers.get('Authorization')).toBe('Bearer mock-token');
+      expect(req.request.body).toEqual({ refresh_token: 'mock-refresh-token' });
+      req.flush({ message: 'Sessão terminada com sucesso' });
+    });
+  });
+
+  describe('refreshTokens', () => {
+    it('deve renovar os tokens com o refresh token e guardá-los', () => {
+      localStorageSpy.and.returnValue('mock-refresh-token');
+
+      service.refreshTokens().subscribe((tokens) => {
+        expect(tokens.access_token).toBe('new-token');
+      });
+
+      const req = httpMock.expectOne(`${environment.apiUrl}/auth/refresh`);
+      expect(req.request.headers.get('Authorization')).toBe('Bearer mock-refresh-token');
+      req.flush({ access_token: 'new-token', refresh_token: 'new-refresh-token', token_type: 'bearer' });
+
+      expect(localStorage.setItem).toHaveBeenCalledWith(StorageKeys.ACCESS_TOKEN, 'new-token');
+      expect(localStorage.setItem).toHaveBeenCalledWith(StorageKeys.REFRESH_TOKEN, 'new-refresh-token');
+    });
+
+    it('deve falhar sem refresh token', (done) => {
+      localStorageSpy.and.returnValue(null);
+
+      service.refreshTokens().subscribe({
+        error: () => done()
+      });
+    });
   });
 
   describe('isAuthenticated', () => {
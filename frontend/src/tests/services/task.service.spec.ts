@@ -50,6 +50,14 @@ describe('TaskService', () => {
 
       expect(apiService.get).toHaveBeenCalledWith('/tasks');
     });
+
+    it('deve enviar filtros e ordenação como query string', () => {
+      apiService.get.and.returnValue(jasmine.createSpyObj('Observable', ['subscribe']));
+
+      service.getTasks({ completed: false, sort: 'title', order: 'asc' });
+
+      expect(apiService.get).toHaveBeenCalledWith('/tasks?completed=false&sort=title&order=asc');
+    });
   });
 
   describe('getTask', () => {